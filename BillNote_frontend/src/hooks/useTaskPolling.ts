@@ -1,43 +1,148 @@
-import { useEffect, useRef } from 'react'
+import { useEffect, useMemo, useRef } from 'react'
 import { useTaskStore } from '@/store/taskStore'
 import { get_task_status } from '@/services/note.ts'
 import toast from 'react-hot-toast'
 
+const TERMINAL_STATUSES = ['SUCCESS', 'FAILED', 'CANCELLED']
+const STATUS_ONLY_FIELDS = ['status', 'progress', 'message', 'dify', 'dify_indexing', 'dify_error']
+const apiBaseURL = (import.meta.env.VITE_API_BASE_URL || '/api').replace(/\/+$/, '')
+
+const isDifyIndexingCompleted = (payload: any) => {
+  const docs = payload?.data
+  if (!Array.isArray(docs) || docs.length === 0) return false
+  return docs.every(d => typeof d === 'object' && d && d.indexing_status === 'completed')
+}
+
+const getDifyIndexingError = (payload: any) => {
+  const docs = payload?.data
+  if (!Array.isArray(docs) || docs.length === 0) return null
+  for (const d of docs) {
+    if (!d || typeof d !== 'object') continue
+    const status = String((d as any).indexing_status || '').toLowerCase()
+    if (status !== 'error' && status !== 'failed') continue
+    const err = (d as any).error || (d as any).message || null
+    return err ? String(err) : `indexing_status=${status}`
+  }
+  return null
+}
+
 export const useTaskPolling = (interval = 3000) => {
   const tasks = useTaskStore(state => state.tasks)
   const updateTaskContent = useTaskStore(state => state.updateTaskContent)
 
   const tasksRef = useRef(tasks)
+  // 推送连接可用时，运行中的任务由 SSE 更新，轮询只负责 SUCCESS 之后的 Dify 索引跟踪
+  const streamOpenRef = useRef(false)
 
   // 每次 tasks 更新，把最新的 tasks 同步进去
   useEffect(() => {
     tasksRef.current = tasks
   }, [tasks])
 
+  // 拉取一次完整状态（成功时包含笔记结果）
+  const refreshTask = async (taskId: string) => {
+    const task = tasksRef.current.find(t => t.id === taskId)
+    if (!task) return
+    try {
+      // 已成功的任务只需刷新 Dify 相关字段，不再重复下载笔记结果
+      const res: any = await get_task_status(
+        task.id,
+        task.status === 'SUCCESS' ? { fields: STATUS_ONLY_FIELDS } : undefined
+      )
+      const status = res?.status
+      if (!status) return
+
+      const patch = {
+        status,
+        progress: res?.progress,
+        message: res?.message,
+        dify: res.dify,
+        dify_indexing: res.dify_indexing,
+        dify_error: res.dify_error || getDifyIndexingError(res.dify_indexing),
+      }
+
+      const latest = tasksRef.current.find(t => t.id === taskId)
+      if (status === 'SUCCESS' && latest?.status !== 'SUCCESS') {
+        const { markdown, transcript, audio_meta } = res.result || {}
+        toast.success('笔记生成成功')
+        updateTaskContent(task.id, {
+          ...patch,
+          markdown,
+          transcript,
+          audioMeta: audio_meta,
+        })
+        return
+      }
+
+      updateTaskContent(task.id, patch)
+    } catch (e) {
+      console.error('❌ 任务轮询失败：', e)
+      // toast.error(`生成失败 ${e.message || e}`)
+      updateTaskContent(task.id, { status: 'FAILED' })
+      // removeTask(task.id)
+    }
+  }
+
+  // 运行中的任务：一个 SSE 连接订阅全部任务的进度增量
+  const runningKey = useMemo(
+    () =>
+      tasks
+        .filter(task => !TERMINAL_STATUSES.includes(task.status))
+        .map(task => task.id)
+        .sort()
+        .join(','),
+    [tasks]
+  )
+
   useEffect(() => {
-    const timer = setInterval(async () => {
-      const isDifyIndexingCompleted = (payload: any) => {
-        const docs = payload?.data
-        if (!Array.isArray(docs) || docs.length === 0) return false
-        return docs.every(d => typeof d === 'object' && d && d.indexing_status === 'completed')
+    if (!runningKey || typeof EventSource === 'undefined') {
+      streamOpenRef.current = false
+      return
+    }
+
+    const source = new EventSource(`${apiBaseURL}/task_events?task_ids=${encodeURIComponent(runningKey)}`)
+    source.onopen = () => {
+      streamOpenRef.current = true
+    }
+    source.onerror = () => {
+      // 浏览器会自动重连；断开期间回退到轮询
+      streamOpenRef.current = false
+    }
+    source.addEventListener('task', (evt: MessageEvent) => {
+      let event: any
+      try {
+        event = JSON.parse(evt.data)
+      } catch {
+        return
       }
+      const taskId = String(event?.task_id || '')
+      const task = tasksRef.current.find(t => t.id === taskId)
+      if (!task) return
 
-      const getDifyIndexingError = (payload: any) => {
-        const docs = payload?.data
-        if (!Array.isArray(docs) || docs.length === 0) return null
-        for (const d of docs) {
-          if (!d || typeof d !== 'object') continue
-          const status = String((d as any).indexing_status || '').toLowerCase()
-          if (status !== 'error' && status !== 'failed') continue
-          const err = (d as any).error || (d as any).message || null
-          return err ? String(err) : `indexing_status=${status}`
-        }
-        return null
+      if (event.status === 'SUCCESS') {
+        // 结果体较大，只在完成时拉取一次
+        void refreshTask(taskId)
+        return
       }
 
+      const patch: Record<string, any> = {}
+      if ('status' in event && event.status) patch.status = event.status
+      if (typeof event.progress === 'number') patch.progress = event.progress
+      if ('message' in event) patch.message = event.message ?? undefined
+      if (Object.keys(patch).length > 0) updateTaskContent(taskId, patch)
+    })
+
+    return () => {
+      source.close()
+      streamOpenRef.current = false
+    }
+  }, [runningKey])
+
+  useEffect(() => {
+    const timer = setInterval(async () => {
       const pendingTasks = tasksRef.current.filter(task => {
         if (task.status === 'FAILED' || task.status === 'CANCELLED') return false
-        if (task.status !== 'SUCCESS') return true
+        if (task.status !== 'SUCCESS') return !streamOpenRef.current
         if (task.dify_error) return false
 
         // After SUCCESS, Dify upload info may be written a bit later (same task_id).
@@ -54,40 +159,8 @@ export const useTaskPolling = (interval = 3000) => {
       })
 
       for (const task of pendingTasks) {
-        try {
-          console.log('🔄 正在轮询任务：', task.id)
-          const res = await get_task_status(task.id)
-          const status = res?.status
-          if (!status) continue
-
-          const patch = {
-            status,
-            progress: res?.progress,
-            message: res?.message,
-            dify: res.dify,
-            dify_indexing: res.dify_indexing,
-            dify_error: res.dify_error || getDifyIndexingError(res.dify_indexing),
-          }
-
-          if (status === 'SUCCESS' && task.status !== 'SUCCESS') {
-            const { markdown, transcript, audio_meta } = res.result || {}
-            toast.success('笔记生成成功')
-            updateTaskContent(task.id, {
-              ...patch,
-              markdown,
-              transcript,
-              audioMeta: audio_meta,
-            })
-            continue
-          }
-
-          updateTaskContent(task.id, patch)
-        } catch (e) {
-          console.error('❌ 任务轮询失败：', e)
-          // toast.error(`生成失败 ${e.message || e}`)
-          updateTaskContent(task.id, { status: 'FAILED' })
-          // removeTask(task.id)
-        }
+        console.log('🔄 正在轮询任务：', task.id)
+        await refreshTask(task.id)
       }
     }, interval)
 
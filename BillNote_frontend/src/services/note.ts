@@ -48,10 +48,12 @@ export const delete_task = async ({ task_id, video_id, platform }) => {
   }
 }
 
-export const get_task_status = async (task_id: string, opts?: { silent?: boolean }) => {
+export const get_task_status = async (task_id: string, opts?: { silent?: boolean; fields?: string[] }) => {
   try {
     const silent = opts?.silent ?? true
     const config: RequestConfig = { silent }
+    // 只取需要的字段（例如成功后跟踪 Dify 索引时无需再拉取整份笔记结果）
+    if (opts?.fields?.length) config.params = { fields: opts.fields.join(',') }
     return await request.get('/task_status/' + task_id, config)
   } catch (e) {
     console.error('❌ 请求出错', e)
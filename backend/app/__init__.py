@@ -1,7 +1,10 @@
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
-from .routers import note, provider, model, config, rag, rag_history, sync
+from .routers import note, provider, model, config, rag, rag_history, sync, metrics
+from .services.prometheus_metrics import is_monitored_route, normalize_endpoint, observe_http_request
 
 
 class UTF8JSONResponse(JSONResponse):
@@ -24,5 +27,22 @@ def create_app(lifespan) -> FastAPI:
     app.include_router(rag.router, prefix="/api")
     app.include_router(rag_history.router, prefix="/api")
     app.include_router(sync.router, prefix="/api")
+    app.include_router(metrics.router)
+
+    @app.middleware("http")
+    async def _route_latency(request: Request, call_next):
+        path = request.url.path
+        if not is_monitored_route(path):
+            return await call_next(request)
+
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = getattr(request.scope.get("route"), "path", None) or normalize_endpoint(path)
+            observe_http_request(request.method, route, status, time.perf_counter() - start)
 
     return app
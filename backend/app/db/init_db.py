@@ -1,5 +1,7 @@
 from app.db.models.models import Model
+from app.db.models.note_jobs import NoteJobEntry
 from app.db.models.providers import Provider
+from app.db.models.task_metrics import TaskStageMetric
 from app.db.models.sync_items import SyncItem
 from app.db.models.video_tasks import VideoTask
 from app.db.engine import get_engine, Base
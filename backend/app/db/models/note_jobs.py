@@ -0,0 +1,22 @@
+from sqlalchemy import Column, DateTime, Integer, String, Text, func
+
+from app.db.engine import Base
+
+
+class NoteJobEntry(Base):
+    """
+    Durable record of a note generation job, used to resume unfinished jobs after a restart.
+    """
+    __tablename__ = "note_jobs"
+
+    task_id = Column(String, primary_key=True)
+    payload = Column(Text, nullable=False)  # JSON: request parameters needed to rebuild the job
+
+    # queued / running / done / failed / cancelled
+    status = Column(String, nullable=False, default="queued", index=True)
+    stage = Column(String, nullable=True)  # stage currently running (or last started)
+    checkpoint = Column(String, nullable=True)  # last stage that completed successfully
+    attempts = Column(Integer, nullable=False, default=0)  # times the job was recovered after a restart
+
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -0,0 +1,36 @@
+from sqlalchemy import BigInteger, Boolean, Column, DateTime, Float, Integer, String, func
+
+from app.db.engine import Base
+
+
+class TaskStageMetric(Base):
+    """
+    One row per executed pipeline stage of a note task (timing, resources, volume, LLM usage).
+    """
+    __tablename__ = "task_stage_metrics"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(String, nullable=False, index=True)
+    stage = Column(String, nullable=False, index=True)
+    ok = Column(Boolean, nullable=False, default=True)
+    cached = Column(Boolean, nullable=False, default=False)  # stage output came from a local checkpoint
+
+    wall_seconds = Column(Float, nullable=True)
+    cpu_seconds = Column(Float, nullable=True)
+    process_cpu_seconds = Column(Float, nullable=True)
+    peak_rss_bytes = Column(BigInteger, nullable=True)
+    cores_used = Column(Float, nullable=True)  # process CPU seconds / wall seconds
+    cpu_threads = Column(Float, nullable=True)  # time-averaged share of the transcription thread budget
+
+    bytes_downloaded = Column(BigInteger, nullable=True)
+    audio_seconds = Column(Float, nullable=True)
+    rtf = Column(Float, nullable=True)
+    skipped_seconds = Column(Float, nullable=True)  # non-speech audio skipped by the VAD pre-pass
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+
+    platform = Column(String, nullable=True)
+    provider_id = Column(String, nullable=True)
+    model_name = Column(String, nullable=True)
+
+    created_at = Column(DateTime, server_default=func.now())
@@ -0,0 +1,141 @@
+import json
+from typing import Any, Optional
+
+from app.db.engine import get_db
+from app.db.models.note_jobs import NoteJobEntry
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+UNFINISHED_STATUSES = ("queued", "running")
+
+
+# 写入任务记录（重试同一 task_id 时重置进度）
+def upsert_note_job(task_id: str, payload: dict[str, Any]) -> None:
+    db = next(get_db())
+    try:
+        entry = db.query(NoteJobEntry).filter_by(task_id=task_id).first()
+        data = json.dumps(payload, ensure_ascii=False)
+        if entry is None:
+            db.add(NoteJobEntry(task_id=task_id, payload=data, status="queued"))
+        else:
+            entry.payload = data
+            entry.status = "queued"
+            entry.stage = None
+            entry.checkpoint = None
+            entry.attempts = 0
+        db.commit()
+    except Exception as e:
+        logger.error(f"Failed to persist note job (task_id={task_id}): {e}")
+    finally:
+        db.close()
+
+
+def _update_note_job(task_id: str, **fields: Any) -> None:
+    db = next(get_db())
+    try:
+        entry = db.query(NoteJobEntry).filter_by(task_id=task_id).first()
+        if entry is None:
+            return
+        for key, value in fields.items():
+            setattr(entry, key, value)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Failed to update note job (task_id={task_id}): {e}")
+    finally:
+        db.close()
+
+
+# 记录阶段开始
+def mark_note_job_stage(task_id: str, stage: str) -> None:
+    _update_note_job(task_id, status="running", stage=stage)
+
+
+# 记录阶段完成（断点）
+def mark_note_job_checkpoint(task_id: str, stage: str) -> None:
+    _update_note_job(task_id, checkpoint=stage)
+
+
+# 标记任务结束：done / failed / cancelled
+def finish_note_job(task_id: str, status: str) -> None:
+    _update_note_job(task_id, status=status)
+
+
+# 恢复次数 +1，并重新置为排队
+def increment_note_job_attempts(task_id: str) -> int:
+    db = next(get_db())
+    try:
+        entry = db.query(NoteJobEntry).filter_by(task_id=task_id).first()
+        if entry is None:
+            return 0
+        entry.attempts = int(entry.attempts or 0) + 1
+        entry.status = "queued"
+        db.commit()
+        return int(entry.attempts)
+    except Exception as e:
+        logger.error(f"Failed to update note job attempts (task_id={task_id}): {e}")
+        return 0
+    finally:
+        db.close()
+
+
+# 查询未完成（排队中/执行中）的任务
+def list_unfinished_note_jobs() -> list[dict[str, Any]]:
+    db = next(get_db())
+    try:
+        entries = (
+            db.query(NoteJobEntry)
+            .filter(NoteJobEntry.status.in_(UNFINISHED_STATUSES))
+            .order_by(NoteJobEntry.created_at.asc())
+            .all()
+        )
+        jobs: list[dict[str, Any]] = []
+        for entry in entries:
+            try:
+                payload = json.loads(entry.payload or "{}")
+            except ValueError:
+                payload = {}
+            jobs.append({
+                "task_id": entry.task_id,
+                "payload": payload if isinstance(payload, dict) else {},
+                "status": entry.status,
+                "stage": entry.stage,
+                "checkpoint": entry.checkpoint,
+                "attempts": int(entry.attempts or 0),
+            })
+        return jobs
+    except Exception as e:
+        logger.error(f"Failed to list unfinished note jobs: {e}")
+        return []
+    finally:
+        db.close()
+
+
+# 查询单个任务记录
+def get_note_job(task_id: str) -> Optional[dict[str, Any]]:
+    db = next(get_db())
+    try:
+        entry = db.query(NoteJobEntry).filter_by(task_id=task_id).first()
+        if entry is None:
+            return None
+        return {
+            "task_id": entry.task_id,
+            "status": entry.status,
+            "stage": entry.stage,
+            "checkpoint": entry.checkpoint,
+            "attempts": int(entry.attempts or 0),
+        }
+    finally:
+        db.close()
+
+
+# 删除任务记录
+def delete_note_job(task_id: str) -> None:
+    db = next(get_db())
+    try:
+        db.query(NoteJobEntry).filter_by(task_id=task_id).delete()
+        db.commit()
+    except Exception as e:
+        logger.error(f"Failed to delete note job (task_id={task_id}): {e}")
+    finally:
+        db.close()
@@ -0,0 +1,118 @@
+from typing import Any, Optional
+
+from sqlalchemy import case, func
+
+from app.db.engine import get_db
+from app.db.models.task_metrics import TaskStageMetric
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_COLUMNS = (
+    "ok",
+    "cached",
+    "wall_seconds",
+    "cpu_seconds",
+    "process_cpu_seconds",
+    "peak_rss_bytes",
+    "cores_used",
+    "cpu_threads",
+    "bytes_downloaded",
+    "audio_seconds",
+    "rtf",
+    "skipped_seconds",
+    "prompt_tokens",
+    "completion_tokens",
+    "platform",
+    "provider_id",
+    "model_name",
+)
+
+
+def _to_dict(row: TaskStageMetric) -> dict[str, Any]:
+    data = {"task_id": row.task_id, "stage": row.stage}
+    for name in _COLUMNS:
+        data[name] = getattr(row, name)
+    data["created_at"] = row.created_at.isoformat() if row.created_at else None
+    return data
+
+
+# 写入一条阶段指标
+def insert_stage_metric(task_id: str, stage: str, metrics: dict[str, Any]) -> None:
+    db = next(get_db())
+    try:
+        row = TaskStageMetric(task_id=task_id, stage=stage)
+        for name in _COLUMNS:
+            if name in metrics and metrics[name] is not None:
+                setattr(row, name, metrics[name])
+        db.add(row)
+        db.commit()
+    except Exception as e:
+        logger.error(f"Failed to insert stage metric (task_id={task_id}, stage={stage}): {e}")
+    finally:
+        db.close()
+
+
+# 查询阶段指标明细（按时间倒序）
+def list_stage_metrics(task_id: Optional[str] = None, stage: Optional[str] = None, limit: int = 200) -> list[dict[str, Any]]:
+    db = next(get_db())
+    try:
+        query = db.query(TaskStageMetric)
+        if task_id:
+            query = query.filter(TaskStageMetric.task_id == task_id)
+        if stage:
+            query = query.filter(TaskStageMetric.stage == stage)
+        rows = query.order_by(TaskStageMetric.id.desc()).limit(max(1, min(int(limit), 5000))).all()
+        return [_to_dict(row) for row in rows]
+    except Exception as e:
+        logger.error(f"Failed to list stage metrics: {e}")
+        return []
+    finally:
+        db.close()
+
+
+# 按阶段聚合（仅统计未命中缓存的执行，便于评估 CPU / 带宽 / LLM 额度）
+def summarize_stage_metrics() -> list[dict[str, Any]]:
+    db = next(get_db())
+    try:
+        rows = (
+            db.query(
+                TaskStageMetric.stage,
+                func.count(TaskStageMetric.id),
+                func.sum(case((TaskStageMetric.ok.is_(True), 1), else_=0)),
+                func.avg(TaskStageMetric.wall_seconds),
+                func.max(TaskStageMetric.wall_seconds),
+                func.sum(TaskStageMetric.cpu_seconds),
+                func.max(TaskStageMetric.peak_rss_bytes),
+                func.sum(TaskStageMetric.bytes_downloaded),
+                func.sum(TaskStageMetric.audio_seconds),
+                func.avg(TaskStageMetric.rtf),
+                func.sum(TaskStageMetric.prompt_tokens),
+                func.sum(TaskStageMetric.completion_tokens),
+            )
+            .filter(TaskStageMetric.cached.is_(False))
+            .group_by(TaskStageMetric.stage)
+            .all()
+        )
+        return [
+            {
+                "stage": stage,
+                "runs": int(count or 0),
+                "succeeded": int(succeeded or 0),
+                "avg_wall_seconds": avg_wall,
+                "max_wall_seconds": max_wall,
+                "total_cpu_seconds": cpu,
+                "max_peak_rss_bytes": peak_rss,
+                "total_bytes_downloaded": int(downloaded or 0),
+                "total_audio_seconds": audio,
+                "avg_rtf": rtf,
+                "total_prompt_tokens": int(prompt or 0),
+                "total_completion_tokens": int(completion or 0),
+            }
+            for stage, count, succeeded, avg_wall, max_wall, cpu, peak_rss, downloaded, audio, rtf, prompt, completion in rows
+        ]
+    except Exception as e:
+        logger.error(f"Failed to summarize stage metrics: {e}")
+        return []
+    finally:
+        db.close()
@@ -1,4 +1,5 @@
 import enum
+import os
 
 from abc import ABC, abstractmethod
 from typing import Optional, Union
@@ -13,6 +14,17 @@ QUALITY_MAP = {
 }
 
 
+def downloaded_filepath(info: dict, output_dir: str) -> str:
+    '''
+    yt-dlp 实际写出的文件路径（原生容器，扩展名随格式而定）
+    '''
+    for item in info.get("requested_downloads") or []:
+        if item.get("filepath"):
+            return item["filepath"]
+    ext = info.get("ext", "m4a")  # 兜底用 m4a
+    return os.path.join(output_dir, f"{info.get('id')}.{ext}")
+
+
 class Downloader(ABC):
     def __init__(self):
         #TODO 需要修改为可配置
@@ -36,3 +48,14 @@ class Downloader(ABC):
     def download_video(self, video_url: str,
                        output_dir: Union[str, None] = None) -> str:
         pass
+
+    def download_combined(self, video_url: str, output_dir: Union[str, None] = None) -> AudioDownloadResult:
+        '''
+        同时需要音频和视频时调用：默认分别取音频（含元信息）和视频；
+        能一次下载音视频合并文件的平台覆盖此方法，音轨在本地流复制取出
+        :return: AudioDownloadResult，file_path 为音频、video_path 为视频
+        '''
+        audio = self.download(video_url, output_dir=output_dir, need_video=True)
+        if not audio.video_path:
+            audio.video_path = self.download_video(video_url, output_dir)
+        return audio
@@ -8,6 +8,7 @@ from typing import Optional
 from app.downloaders.base import Downloader
 from app.enmus.note_enums import DownloadQuality
 from app.models.audio_model import AudioDownloadResult
+from app.utils.audio_format import extract_audio
 from app.utils.video_helper import save_cover_to_static
 from app.utils.paths import backend_root, uploads_dir as get_uploads_dir
 
@@ -71,38 +72,17 @@ class LocalDownloader(Downloader, ABC):
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"提取封面失败: {output_path}") from e
 
-    def convert_to_mp3(self,input_path: str, output_path: str = None) -> str:
+    def extract_audio(self, input_path: str) -> str:
         """
-        将本地视频文件转为 MP3 音频文件
-        :param input_path: 输入文件路径（如 .mp4）
-        :param output_path: 输出文件路径（可选，默认同目录同名 .mp3）
-        :return: 生成的 mp3 文件路径
+        取出本地文件的音轨：能直接封装的编码（aac / mp3 / opus ...）流复制到原生容器，否则转为 mp3
         """
         if not os.path.exists(input_path):
             raise FileNotFoundError(f"输入文件不存在: {input_path}")
-
-        if output_path is None:
-            base, _ = os.path.splitext(input_path)
-            output_path = base + ".mp3"
         try:
-        # 调用 ffmpeg 转换
-            command = [
-                'ffmpeg',
-                '-i', input_path,
-                '-vn',  # 不要视频流
-                '-acodec', 'libmp3lame',  # 使用mp3编码
-                '-y',  # 覆盖输出文件
-                output_path
-            ]
-
-            subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-
-            if not os.path.exists(output_path):
-                raise RuntimeError(f"mp3 文件生成失败: {output_path}")
-
-            return output_path
+            return extract_audio(input_path)
         except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"mp3 文件生成失败: {output_path}") from e
+            raise RuntimeError(f"音频提取失败: {input_path}") from e
+
     def download_video(self, video_url: str, output_dir: str = None) -> str:
         """
         处理本地文件路径，返回视频文件路径
@@ -137,7 +117,8 @@ class LocalDownloader(Downloader, ABC):
 
         working_path = video_url
         try:
-            file_path = self.convert_to_mp3(working_path)
+            # 音轨流复制到原生容器，不再整段转码 mp3
+            file_path = self.extract_audio(working_path)
             cover_path = self.extract_cover(working_path)
         except RuntimeError:
             # Some Windows ffmpeg builds may fail to open non-ascii filenames.
@@ -145,7 +126,7 @@ class LocalDownloader(Downloader, ABC):
             if not self._needs_safe_path(video_url):
                 raise
             working_path = self._copy_to_safe_path(video_url)
-            file_path = self.convert_to_mp3(working_path)
+            file_path = self.extract_audio(working_path)
             cover_path = self.extract_cover(working_path)
         cover_url = save_cover_to_static(cover_path)
 
@@ -4,8 +4,9 @@ from typing import Union, Optional
 
 import yt_dlp
 
-from app.downloaders.base import Downloader, DownloadQuality
+from app.downloaders.base import Downloader, DownloadQuality, downloaded_filepath
 from app.models.notes_model import AudioDownloadResult
+from app.utils.audio_format import extract_audio
 from app.utils.path_helper import get_data_dir
 from app.utils.url_parser import extract_video_id
 
@@ -43,9 +44,7 @@ class YoutubeDownloader(Downloader, ABC):
             title = info.get("title")
             duration = info.get("duration", 0)
             cover_url = info.get("thumbnail")
-            ext = info.get("ext", "m4a")  # 兜底用 m4a
-            audio_path = os.path.join(output_dir, f"{video_id}.{ext}")
-        print('os.path.join(output_dir, f"{video_id}.{ext}")',os.path.join(output_dir, f"{video_id}.{ext}"))
+            audio_path = downloaded_filepath(info, output_dir)
 
         return AudioDownloadResult(
             file_path=audio_path,
@@ -58,6 +57,48 @@ class YoutubeDownloader(Downloader, ABC):
             video_path=None  # ❗音频下载不包含视频路径
         )
 
+    def download_combined(
+        self,
+        video_url: str,
+        output_dir: Union[str, None] = None,
+    ) -> AudioDownloadResult:
+        """
+        截图 / 视频理解需要视频时只下载一次：音视频合并为 mp4，再流复制取出音轨用于转写
+        """
+        if output_dir is None:
+            output_dir = get_data_dir()
+        if not output_dir:
+            output_dir = self.cache_data
+        os.makedirs(output_dir, exist_ok=True)
+
+        ydl_opts = {
+            'format': 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]',
+            'outtmpl': os.path.join(output_dir, "%(id)s.%(ext)s"),
+            'noplaylist': True,
+            'quiet': False,
+            'merge_output_format': 'mp4',
+        }
+
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(video_url, download=True)
+            video_id = info.get("id")
+            video_path = downloaded_filepath(info, output_dir)
+
+        if not os.path.exists(video_path):
+            raise FileNotFoundError(f"视频文件未找到: {video_path}")
+        audio_path = extract_audio(video_path, os.path.join(output_dir, f"{video_id}_audio"))
+
+        return AudioDownloadResult(
+            file_path=audio_path,
+            title=info.get("title"),
+            duration=info.get("duration", 0),
+            cover_url=info.get("thumbnail"),
+            platform="youtube",
+            video_id=video_id,
+            raw_info={'tags': info.get('tags')},  # 全部返回会报错
+            video_path=video_path
+        )
+
     def download_video(
         self,
         video_url: str,
@@ -13,5 +13,11 @@ class GPT(ABC):
         pass
     def create_messages(self, segments:list,**kwargs)->list:
         pass
+    def cache_identity(self) -> dict:
+        '''
+        提示词之外影响总结结果的配置（如长转写 map-reduce 的分块参数），用作总结缓存键的一部分
+        :return: 可 JSON 序列化的字典
+        '''
+        return {}
     def list_models(self):
         pass
\ No newline at end of file
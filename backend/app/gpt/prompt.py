@@ -66,4 +66,41 @@ SCREENSHOT='''
 8. **Screenshot placeholders**: If a section involves **visual demonstrations, code walkthroughs, UI interactions**, or any content where visuals aid understanding, insert a screenshot cue at the end of that section:
    - Format: `*Screenshot-[mm:ss]`
    - Only use it when truly helpful.
-'''
\ No newline at end of file
+'''
+MAP_CHUNK='''
+⚠️ 分段处理说明：
+这是一个长视频转录的第 {index}/{total} 部分（时间范围 {start} - {end}），只需整理本部分的内容。
+- 不要写开头引言、目录或全文总结，这些会在合并阶段统一生成。
+- 若有 `*Content-[mm:ss]` / `*Screenshot-[mm:ss]` 标记要求，请照常插入，时间必须来自本部分的分段。
+'''
+
+REDUCE_GROUP='''
+⚠️ 分组合并说明：
+这是长视频局部笔记的中间合并（第 {index}/{total} 组，时间范围 {start} - {end}），结果还会与其他组再次合并。
+- 不要写开头引言、目录或全文总结，这些会在最终合并时统一生成。
+'''
+
+REDUCE_PROMPT = '''
+你是一个专业的笔记助手。下面是同一个视频按时间顺序分段整理出的多份局部笔记，请将它们合并为一份完整、连贯的中文 Markdown 笔记。
+
+视频标题：
+{video_title}
+
+视频标签：
+{tags}
+
+合并要求：
+1. 按时间顺序组织内容，合并重复的标题与要点，保持结构清晰。
+2. **原样保留** 所有 `*Content-[mm:ss]` 与 `*Screenshot-[mm:ss]` 标记（包括其中的时间），不要修改、删除或新增时间。
+3. 不要遗漏局部笔记中的重要事实、示例、公式（LaTeX）与结论。
+4. 仅返回最终的 **Markdown 内容**，**不要**包裹在代码块中；编号标题使用 `## 1. 内容` 或 `1\\. **内容**` 的形式。
+
+局部笔记：
+
+---
+{partial_notes}
+---
+
+额外重要的任务如下(每一个都必须严格完成):
+
+'''
@@ -1,4 +1,4 @@
-from app.gpt.prompt import BASE_PROMPT
+from app.gpt.prompt import BASE_PROMPT, REDUCE_PROMPT
 
 note_formats = [
     {'label': '目录', 'value': 'toc'},
@@ -43,6 +43,25 @@ def generate_base_prompt(title, segment_text, tags, _format=None, style=None, ex
     return prompt
 
 
+# 生成合并（reduce）阶段的 Prompt：目录/AI 总结等全局格式只在这一步要求
+def generate_reduce_prompt(title, partial_notes, tags, _format=None, style=None, extras=None):
+    prompt = REDUCE_PROMPT.format(
+        video_title=title,
+        partial_notes=partial_notes,
+        tags=tags
+    )
+
+    if _format:
+        prompt += "\n" + "\n".join([get_format_function(f) for f in _format])
+
+    if style:
+        prompt += "\n" + get_style_format(style)
+
+    if extras:
+        prompt += f"\n{extras}"
+    return prompt
+
+
 # 获取格式函数
 def get_format_function(format_type):
     format_map = {
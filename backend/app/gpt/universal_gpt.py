@@ -1,11 +1,39 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from app.gpt.base import GPT
-from app.gpt.prompt_builder import generate_base_prompt
+from app.gpt.prompt_builder import generate_base_prompt, generate_reduce_prompt
 from app.models.gpt_model import GPTSource
-from app.gpt.prompt import BASE_PROMPT, AI_SUM, SCREENSHOT, LINK
-from app.gpt.utils import fix_markdown
+from app.gpt.prompt import BASE_PROMPT, AI_SUM, SCREENSHOT, LINK, MAP_CHUNK, REDUCE_GROUP, REDUCE_PROMPT
+from app.gpt.utils import estimate_tokens, fix_markdown
 from app.models.transcriber_model import TranscriptSegment
+from app.utils.logger import get_logger
 from datetime import timedelta
-from typing import List
+from typing import List, Tuple
+
+logger = get_logger(__name__)
+
+# 转写文本超过该 token 数时改用 map-reduce（分块并发总结 + 合并）；<=0 关闭
+MAP_REDUCE_CHUNK_TOKENS = int(os.getenv("GPT_MAP_REDUCE_CHUNK_TOKENS", "8000") or 0)
+# 每个供应商（按 base_url 区分）同时进行的分块请求上限，跨任务共享
+MAP_REDUCE_CONCURRENCY = max(1, int(os.getenv("GPT_MAP_REDUCE_CONCURRENCY", "4") or 1))
+
+# 只在分块阶段生效的格式；目录 / AI 总结在合并阶段统一生成
+_CHUNK_FORMATS = ("link", "screenshot")
+
+_provider_slots: dict[str, threading.BoundedSemaphore] = {}
+_provider_slots_lock = threading.Lock()
+
+
+def _provider_slot(key: str) -> threading.BoundedSemaphore:
+    with _provider_slots_lock:
+        slot = _provider_slots.get(key)
+        if slot is None:
+            slot = threading.BoundedSemaphore(MAP_REDUCE_CONCURRENCY)
+            _provider_slots[key] = slot
+        return slot
 
 
 class UniversalGPT(GPT):
@@ -15,6 +43,7 @@ class UniversalGPT(GPT):
         self.temperature = temperature
         self.screenshot = False
         self.link = False
+        self.last_usage: dict = {}
 
     def _format_time(self, seconds: float) -> str:
         return str(timedelta(seconds=int(seconds)))[2:]
@@ -63,10 +92,20 @@ class UniversalGPT(GPT):
     def list_models(self):
         return self.client.models.list()
 
+    def cache_identity(self) -> dict:
+        # 长转写走 map-reduce 时，结果还取决于分块大小与分块/合并提示词
+        return {
+            "map_reduce_chunk_tokens": MAP_REDUCE_CHUNK_TOKENS,
+            "map_reduce_prompts": hashlib.sha256((MAP_CHUNK + REDUCE_GROUP + REDUCE_PROMPT).encode("utf-8")).hexdigest(),
+        }
+
     def summarize(self, source: GPTSource) -> str:
         self.screenshot = source.screenshot
         self.link = source.link
         source.segment = self.ensure_segments_type(source.segment)
+        self.last_usage = {}
+        if self._needs_map_reduce(source.segment):
+            return self._map_reduce(source)
 
         messages = self.create_messages(
             source.segment,
@@ -82,4 +121,166 @@ class UniversalGPT(GPT):
             messages=messages,
             temperature=0.7
         )
+        self.last_usage = self._usage_of(response)
         return response.choices[0].message.content.strip()
+
+    # ---------------- map-reduce（长转写） ----------------
+
+    def _needs_map_reduce(self, segments: List[TranscriptSegment]) -> bool:
+        if MAP_REDUCE_CHUNK_TOKENS <= 0 or len(segments) < 2:
+            return False
+        return estimate_tokens(self._build_segment_text(segments)) > MAP_REDUCE_CHUNK_TOKENS
+
+    def _split_segments(self, segments: List[TranscriptSegment]) -> List[List[TranscriptSegment]]:
+        """
+        按时间顺序切分为连续的块，每块的分段文本不超过 token 预算（单个超长分段独占一块）
+        """
+        chunks: List[List[TranscriptSegment]] = []
+        current: List[TranscriptSegment] = []
+        current_tokens = 0
+        for seg in segments:
+            tokens = estimate_tokens(f"{self._format_time(seg.start)} - {seg.text.strip()}") + 1
+            if current and current_tokens + tokens > MAP_REDUCE_CHUNK_TOKENS:
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(seg)
+            current_tokens += tokens
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _complete(self, messages: list) -> tuple[str, dict]:
+        # 同一供应商的并发请求数受 GPT_MAP_REDUCE_CONCURRENCY 限制（跨任务共享）
+        with _provider_slot(str(getattr(self.client, "base_url", "") or self.model)):
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=0.7
+            )
+        return response.choices[0].message.content.strip(), self._usage_of(response)
+
+    def _map_reduce(self, source: GPTSource) -> str:
+        chunks = self._split_segments(source.segment)
+        total = len(chunks)
+        images = list(source.video_img_urls or [])
+        chunk_formats = [f for f in (source._format or []) if f in _CHUNK_FORMATS]
+        logger.info(f"转写较长，使用 map-reduce 总结：{total} 块，并发上限 {MAP_REDUCE_CONCURRENCY}")
+
+        def _chunk_messages(index: int, chunk: List[TranscriptSegment]) -> list:
+            # 拼图按时间顺序生成，按比例分配给对应的时间块
+            chunk_images = [img for i, img in enumerate(images) if i * total // len(images) == index] if images else []
+            extras = MAP_CHUNK.format(
+                index=index + 1,
+                total=total,
+                start=self._format_time(chunk[0].start),
+                end=self._format_time(chunk[-1].end),
+            )
+            if source.extras:
+                extras += f"\n{source.extras}"
+            return self.create_messages(
+                chunk,
+                title=source.title,
+                tags=source.tags,
+                video_img_urls=chunk_images,
+                _format=chunk_formats,
+                style=source.style,
+                extras=extras,
+            )
+
+        usage = {"prompt_tokens": 0, "completion_tokens": 0}
+
+        def _add_usage(part_usage: dict) -> None:
+            for key in usage:
+                usage[key] += int(part_usage.get(key, 0) or 0)
+
+        with ThreadPoolExecutor(max_workers=min(total, MAP_REDUCE_CONCURRENCY)) as pool:
+            results = list(pool.map(lambda item: self._complete(_chunk_messages(*item)), enumerate(chunks)))
+            for _, part_usage in results:
+                _add_usage(part_usage)
+
+            # (起点, 终点, 局部笔记)，按时间顺序
+            partials = [(chunk[0].start, chunk[-1].end, text) for chunk, (text, _) in zip(chunks, results)]
+
+            # 合并输入同样受 token 预算限制：放不下时先分组合并，逐层缩减直到一次合并放得下
+            levels = 0
+            while estimate_tokens(self._join_partials(partials)) > MAP_REDUCE_CHUNK_TOKENS:
+                groups = self._group_partials(partials)
+                if len(groups) == len(partials):
+                    break  # 单份局部笔记已超出预算，无法再通过分组缩减
+                levels += 1
+                logger.info(f"局部笔记超出合并预算，第 {levels} 轮分组合并：{len(partials)} 份 -> {len(groups)} 组")
+
+                def _reduce_group(item: Tuple[int, list]) -> Tuple[Tuple[float, float, str], dict]:
+                    index, group = item
+                    if len(group) == 1:
+                        return group[0], {}
+                    start, end = group[0][0], group[-1][1]
+                    extras = REDUCE_GROUP.format(
+                        index=index + 1,
+                        total=len(groups),
+                        start=self._format_time(start),
+                        end=self._format_time(end),
+                    )
+                    if source.extras:
+                        extras += f"\n{source.extras}"
+                    prompt = generate_reduce_prompt(
+                        title=source.title,
+                        partial_notes=self._join_partials(group),
+                        tags=source.tags,
+                        _format=chunk_formats,
+                        style=source.style,
+                        extras=extras,
+                    )
+                    text, group_usage = self._complete([{"role": "user", "content": [{"type": "text", "text": prompt}]}])
+                    return (start, end, text), group_usage
+
+                reduced = list(pool.map(_reduce_group, enumerate(groups)))
+                for _, group_usage in reduced:
+                    _add_usage(group_usage)
+                partials = [partial for partial, _ in reduced]
+
+        reduce_prompt = generate_reduce_prompt(
+            title=source.title,
+            partial_notes=self._join_partials(partials),
+            tags=source.tags,
+            _format=source._format,
+            style=source.style,
+            extras=source.extras,
+        )
+        markdown, reduce_usage = self._complete([{"role": "user", "content": [{"type": "text", "text": reduce_prompt}]}])
+        _add_usage(reduce_usage)
+        usage["map_chunks"] = total
+        usage["reduce_levels"] = levels + 1
+        self.last_usage = usage
+        return markdown
+
+    def _join_partials(self, partials: List[Tuple[float, float, str]]) -> str:
+        return "\n\n---\n\n".join(
+            f"### 第 {i + 1} 部分（{self._format_time(start)} - {self._format_time(end)}）\n\n{text}"
+            for i, (start, end, text) in enumerate(partials)
+        )
+
+    def _group_partials(self, partials: List[Tuple[float, float, str]]) -> List[List[Tuple[float, float, str]]]:
+        """
+        按时间顺序把相邻的局部笔记分组，每组合并输入不超过 token 预算（单份超长的独占一组）
+        """
+        groups: List[List[Tuple[float, float, str]]] = []
+        current: List[Tuple[float, float, str]] = []
+        for partial in partials:
+            if current and estimate_tokens(self._join_partials(current + [partial])) > MAP_REDUCE_CHUNK_TOKENS:
+                groups.append(current)
+                current = []
+            current.append(partial)
+        if current:
+            groups.append(current)
+        return groups
+
+    @staticmethod
+    def _usage_of(response) -> dict:
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return {}
+        return {
+            "prompt_tokens": int(getattr(usage, "prompt_tokens", 0) or 0),
+            "completion_tokens": int(getattr(usage, "completion_tokens", 0) or 0),
+        }
@@ -1,6 +1,8 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, List, Optional
 
+from app.enmus.note_enums import DownloadQuality
 from app.models.audio_model import AudioDownloadResult
 from app.models.transcriber_model import TranscriptResult
 
@@ -9,4 +11,44 @@ from app.models.transcriber_model import TranscriptResult
 class NoteResult:
     markdown: str                  # GPT 总结的 Markdown 内容
     transcript: TranscriptResult                # Whisper 转写结果
-    audio_meta: AudioDownloadResult  # 音频下载的元信息（title、duration、封面等）
\ No newline at end of file
+    audio_meta: AudioDownloadResult  # 音频下载的元信息（title、duration、封面等）
+
+
+@dataclass
+class NoteJob:
+    """
+    一次笔记生成任务在流水线各阶段之间传递的上下文：请求参数 + 各阶段产出。
+    """
+    task_id: str
+    video_url: str
+    platform: str
+    quality: DownloadQuality = DownloadQuality.medium
+    model_name: Optional[str] = None
+    provider_id: Optional[str] = None
+    link: bool = False
+    screenshot: bool = False
+    formats: List[str] = field(default_factory=list)
+    style: Optional[str] = None
+    extras: Optional[str] = None
+    output_path: Optional[str] = None
+    video_understanding: bool = False
+    video_interval: int = 0
+    grid_size: List[int] = field(default_factory=list)
+    created_at_ms: int = 0
+    request_meta: dict = field(default_factory=dict)
+    sync: dict = field(default_factory=dict)
+    whisper_model_size: Optional[str] = None  # 本任务使用的 Whisper 模型大小，空则用 WHISPER_MODEL_SIZE
+    no_cache: bool = False  # 跳过 LLM 总结缓存（结果仍会写回缓存）
+    resume: bool = False  # 服务重启后恢复的任务：优先复用各阶段的本地缓存（含 Markdown）
+    checkpoint: Optional[str] = None  # 最近一个成功完成的阶段
+    stage_stats: dict = field(default_factory=dict)  # 各阶段的业务计数（下载字节、音频时长、token 等）
+    cache_pins: List[str] = field(default_factory=list)  # 任务期间占用的共享媒体缓存条目，结束时释放
+
+    # ---- 阶段产出 ----
+    gpt: Any = None
+    video_path: Optional[Path] = None
+    video_img_urls: List[str] = field(default_factory=list)
+    audio_meta: Optional[AudioDownloadResult] = None
+    transcript: Optional[TranscriptResult] = None
+    markdown: Optional[str] = None
+    result: Optional[NoteResult] = None
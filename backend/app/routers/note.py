@@ -1,43 +1,69 @@
 # app/routers/note.py
+import asyncio
+import hashlib
 import json
 import os
 import re
 import shutil
 import socket
 import stat
+import threading
 import time
 import uuid
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Optional
 from urllib.parse import urlparse
 
-from fastapi import APIRouter, BackgroundTasks, File, HTTPException, Request, UploadFile
+from fastapi import APIRouter, File, HTTPException, Request, UploadFile
 from pydantic import BaseModel, validator, field_validator
 from dataclasses import asdict
 from ipaddress import ip_address
 
+from app.db.note_job_dao import (
+    delete_note_job,
+    finish_note_job,
+    increment_note_job_attempts,
+    list_unfinished_note_jobs,
+    mark_note_job_checkpoint,
+    mark_note_job_stage,
+    upsert_note_job,
+)
+from app.db.task_metrics_dao import insert_stage_metric, list_stage_metrics, summarize_stage_metrics
 from app.db.video_task_dao import delete_task_by_task_id, get_task_by_video
 from app.enmus.exception import NoteErrorEnum
 from app.enmus.note_enums import DownloadQuality
 from app.enmus.task_status_enums import TaskStatus
 from app.exceptions.note import NoteError
+from app.services.cpu_budget import cpu_budget
 from app.services.dify_client import DifyConfig, DifyError, DifyKnowledgeClient
 from app.services.dify_config_manager import DifyConfigManager
+from app.services.dify_indexing_monitor import dify_indexing_monitor, is_indexing_finished
 from app.services.library_sync import build_bundle_zip, compute_sync_id, ensure_local_sync_meta, make_source_key
 from app.services.minio_storage import MinioConfig, MinioConfigError, MinioStorage, bucket_name_for_profile
+from app.services.job_scheduler import job_scheduler
+from app.services.disk_cache import all_cache_stats
+from app.services.media_cache import release_pins
+from app.services.prometheus_metrics import observe_stage
+from app.services.stage_metrics import StageMeter
+from app.services.status_store import status_store
+from app.services.task_events import DELTA_FIELDS, status_delta, task_event_broker
 from app.services.note import NoteGenerator, logger
 from app.services.task_manager import task_manager
+from app.transcriber.whisper import MODEL_MAP
+from app.transcriber.whisper_pool import whisper_model_pool
 from app.services.rag_service import (
     build_rag_document_name,
     build_rag_document_text,
     build_rag_note_document_text,
 )
 from app.models.audio_model import AudioDownloadResult
+from app.models.notes_model import NoteJob, NoteResult
 from app.models.transcriber_model import TranscriptResult, TranscriptSegment
 from app.utils.response import ResponseWrapper as R
 from app.utils.url_parser import extract_video_id
 from app.validators.video_url_validator import is_supported_video_url
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 import httpx
 from app.utils.paths import note_output_dir, uploads_dir as get_uploads_dir
 
@@ -85,6 +111,8 @@ class VideoRequest(BaseModel):
     video_understanding: Optional[bool] = False
     video_interval: Optional[int] = 0
     grid_size: Optional[list] = []
+    no_cache: Optional[bool] = False  # 跳过总结缓存，强制重新生成
+    whisper_model_size: Optional[str] = None  # 如 tiny / base / large-v3，仅 fast-whisper 类转写器生效
 
     @field_validator("video_url")
     def validate_supported_url(cls, v):
@@ -103,6 +131,15 @@ class VideoRequest(BaseModel):
 
         return url
 
+    @field_validator("whisper_model_size")
+    def validate_whisper_model_size(cls, v):
+        size = str(v or "").strip()
+        if not size:
+            return None
+        if size not in MODEL_MAP:
+            raise ValueError(f"不支持的 Whisper 模型：{size}，可选：{', '.join(MODEL_MAP)}")
+        return size
+
 
 class ReingestRequest(BaseModel):
     task_id: str
@@ -165,11 +202,44 @@ def _atomic_merge_json_file(path: Path, patch: dict[str, Any]) -> None:
     tmp.replace(path)
 
 
+def _read_task_status(task_id: str) -> Optional[dict[str, Any]]:
+    """
+    Current status payload: in-memory store first, then the legacy flat status file.
+    """
+    status = status_store.get(task_id)
+    if status is not None:
+        return status
+    legacy = _legacy_status_path(task_id)
+    if legacy.exists():
+        try:
+            content = json.loads(legacy.read_text(encoding="utf-8"))
+            return content if isinstance(content, dict) else {}
+        except Exception:
+            return {}
+    return None
+
+
+def _merge_task_status(task_id: str, patch: dict[str, Any]) -> None:
+    """
+    Merge fields into the task status through the shared store (written through to disk).
+    """
+    legacy = _legacy_status_path(task_id)
+    if status_store.get(task_id) is None and legacy.exists():
+        _atomic_merge_json_file(legacy, patch)
+        return
+    previous, current = status_store.update(task_id, patch, flush=True)
+    task_event_broker.publish(task_id, status_delta(previous, current))
+
+
 def _delete_task_files(task_id: str) -> None:
     tid = (task_id or "").strip()
     if not tid:
         return
 
+    # Drop the in-memory status first so a pending debounced write cannot recreate the folder.
+    status_store.evict(tid)
+    dify_indexing_monitor.forget(tid)
+
     # New format: NOTE_OUTPUT_DIR/<task_id>/...
     task_dir = _task_dir(tid)
     if task_dir.exists() and task_dir.is_dir():
@@ -349,95 +419,149 @@ def save_note_to_file(task_id: str, note, extra: Optional[dict[str, Any]] = None
         json.dump(payload, f, ensure_ascii=False, indent=2)
 
 
-def run_note_task(task_id: str, video_url: str, platform: str, quality: DownloadQuality,
-                  link: bool = False, screenshot: bool = False, model_name: str = None, provider_id: str = None,
-                  _format: list = None, style: str = None, extras: str = None, video_understanding: bool = False,
-                  video_interval=0, grid_size=[]
-                  ):
-
+def build_note_job(task_id: str, video_url: str, platform: str, quality: DownloadQuality,
+                   link: bool = False, screenshot: bool = False, model_name: str = None, provider_id: str = None,
+                   _format: list = None, style: str = None, extras: str = None, video_understanding: bool = False,
+                   video_interval=0, grid_size=None, no_cache: bool = False,
+                   whisper_model_size: Optional[str] = None) -> NoteJob:
     if not model_name or not provider_id:
         raise HTTPException(status_code=400, detail="请选择模型和提供者")
 
+    request_meta = {
+        "video_url": str(video_url or ""),
+        "platform": str(platform or ""),
+        "quality": getattr(quality, "value", None) or str(quality or ""),
+        "link": bool(link),
+        "screenshot": bool(screenshot),
+        "model_name": str(model_name or ""),
+        "provider_id": str(provider_id or ""),
+        "format": list(_format or []),
+        "style": str(style or ""),
+        "extras": str(extras or ""),
+        "video_understanding": bool(video_understanding),
+        "video_interval": int(video_interval or 0),
+        "grid_size": list(grid_size or []),
+        "no_cache": bool(no_cache),
+        "whisper_model_size": str(whisper_model_size or ""),
+    }
+    return NoteJob(
+        task_id=task_id,
+        video_url=video_url,
+        platform=platform,
+        quality=quality,
+        model_name=model_name,
+        provider_id=provider_id,
+        link=bool(link),
+        screenshot=bool(screenshot),
+        formats=list(_format or []),
+        style=style,
+        extras=extras,
+        video_understanding=bool(video_understanding),
+        video_interval=int(video_interval or 0),
+        grid_size=list(grid_size or []),
+        no_cache=bool(no_cache),
+        whisper_model_size=whisper_model_size or None,
+        created_at_ms=int(time.time() * 1000),
+        request_meta=request_meta,
+    )
+
+
+def _note_download_stage(job: NoteJob) -> bool:
+    task_manager.ensure(job.task_id)
+
+    # Persist request meta early so UI can show model/style even after restart (or while still running).
     try:
-        task_manager.ensure(task_id)
-        created_at_ms = int(time.time() * 1000)
-
-        request_meta = {
-            "video_url": str(video_url or ""),
-            "platform": str(platform or ""),
-            "quality": getattr(quality, "value", None) or str(quality or ""),
-            "link": bool(link),
-            "screenshot": bool(screenshot),
-            "model_name": str(model_name or ""),
-            "provider_id": str(provider_id or ""),
-            "format": list(_format or []),
-            "style": str(style or ""),
-            "extras": str(extras or ""),
-            "video_understanding": bool(video_understanding),
-            "video_interval": int(video_interval or 0),
-            "grid_size": list(grid_size or []),
-        }
+        _task_dir(job.task_id).mkdir(parents=True, exist_ok=True)
+        _merge_task_status(job.task_id, {"request": job.request_meta})
+    except Exception:
+        pass
 
-        # Persist request meta early so UI can show model/style even after restart (or while still running).
-        try:
-            _task_dir(task_id).mkdir(parents=True, exist_ok=True)
-            _atomic_merge_json_file(_task_status_path(task_id), {"request": request_meta})
-        except Exception:
-            pass
+    return NoteGenerator().run_stage(job, "download")
 
-        generator = NoteGenerator()
-        note = generator.generate(
-            video_url=video_url,
-            platform=platform,
-            quality=quality,
-            task_id=task_id,
-            model_name=model_name,
-            provider_id=provider_id,
-            link=link,
-            _format=_format,
-            style=style,
-            extras=extras,
-            screenshot=screenshot,
-            video_understanding=video_understanding,
-            video_interval=video_interval,
-            grid_size=grid_size,
-        )
-        logger.info(f"Note generated: {task_id}")
-        if not note or not note.markdown:
-            logger.warning(f"任务 {task_id} 未生成结果，跳过保存/上传")
-            return
 
+def _note_transcribe_stage(job: NoteJob) -> bool:
+    return NoteGenerator().run_stage(job, "transcribe")
+
+
+def _note_summarize_stage(job: NoteJob) -> bool:
+    task_id = job.task_id
+    if not NoteGenerator().run_stage(job, "summarize"):
+        return False
+
+    note = job.result
+    logger.info(f"Note generated: {task_id}")
+    if not note or not note.markdown:
+        logger.warning(f"任务 {task_id} 未生成结果，跳过保存/上传")
+        return False
+
+    try:
         # Always save note results locally first.
         source_key = make_source_key(
-            platform=platform,
+            platform=job.platform,
             video_id=str(getattr(note.audio_meta, "video_id", "") or ""),
-            created_at_ms=created_at_ms,
+            created_at_ms=job.created_at_ms,
         )
-        sync_id = compute_sync_id(source_key)
+        job.sync = {
+            "created_at_ms": job.created_at_ms,
+            "source_key": source_key,
+            "sync_id": compute_sync_id(source_key),
+        }
         save_note_to_file(
             task_id,
             note,
             extra={
-                "sync": {
-                    "created_at_ms": created_at_ms,
-                    "source_key": source_key,
-                    "sync_id": sync_id,
-                },
-                "request": request_meta,
+                "sync": job.sync,
+                "request": job.request_meta,
             },
         )
         try:
             ensure_local_sync_meta(
                 note_dir=NOTE_OUTPUT_DIR,
                 task_id=task_id,
-                platform=platform,
+                platform=job.platform,
                 video_id=str(getattr(note.audio_meta, "video_id", "") or ""),
                 title=str(getattr(note.audio_meta, "title", "") or ""),
-                prefer_created_at_ms=created_at_ms,
+                prefer_created_at_ms=job.created_at_ms,
             )
         except Exception:
             pass
+    except Exception as exc:
+        logger.error(f"Saving note result failed (task_id={task_id}): {exc}", exc_info=True)
+        NoteGenerator()._update_status(task_id, TaskStatus.FAILED, message=f"保存笔记结果失败：{exc}")
+        return False
+    return True
+
+
+def _read_result_section(task_id: str, key: str) -> dict[str, Any]:
+    try:
+        payload = json.loads(_task_result_path(task_id).read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    section = payload.get(key) if isinstance(payload, dict) else None
+    return section if isinstance(section, dict) else {}
+
+
+def _uploaded_dify_doc(previous: dict[str, Any], kind: str, dataset_id: str) -> Optional[dict[str, Any]]:
+    """
+    Document created by an earlier, interrupted run of the ingest stage (reused instead of uploading a duplicate).
+    """
+    doc = previous.get(kind)
+    if isinstance(doc, dict) and doc.get("document_id") and doc.get("dataset_id") == dataset_id:
+        return doc
+    return None
 
+
+def _note_ingest_stage(job: NoteJob) -> bool:
+    task_id = job.task_id
+    note = job.result
+    platform = job.platform
+    video_url = job.video_url
+    request_meta = job.request_meta
+    created_at_ms = job.created_at_ms
+    source_key = job.sync.get("source_key")
+    sync_id = job.sync.get("sync_id")
+
+    try:
         auto_minio = str(os.getenv("AUTO_MINIO_BUNDLE_ON_GENERATE", "false") or "").strip().lower() in {
             "1",
             "true",
@@ -466,15 +590,22 @@ def run_note_task(task_id: str, video_url: str, platform: str, quality: Download
                 profile = DifyConfigManager().get_active_profile()
                 bucket = bucket_name_for_profile(profile, prefix=minio_cfg.bucket_prefix)
                 object_key = f"{minio_cfg.object_prefix}{sync_id}.zip"
-                bundle = build_bundle_zip(
-                    source_key=source_key,
-                    sync_id=sync_id,
-                    audio=asdict(note.audio_meta),
-                    note_markdown=note.markdown,
-                    transcript=asdict(note.transcript),
-                    extra_meta={"request": request_meta},
-                )
-                storage.put_bytes(bucket=bucket, object_key=object_key, data=bundle, content_type="application/zip")
+                uploaded = _read_result_section(task_id, "minio")
+                if uploaded.get("bucket") == bucket and uploaded.get("object_key") == object_key:
+                    logger.info(f"MinIO bundle already uploaded, skip (task_id={task_id})")
+                else:
+                    bundle = build_bundle_zip(
+                        source_key=source_key,
+                        sync_id=sync_id,
+                        audio=asdict(note.audio_meta),
+                        note_markdown=note.markdown,
+                        transcript=asdict(note.transcript),
+                        extra_meta={"request": request_meta},
+                    )
+                    storage.put_bytes(bucket=bucket, object_key=object_key, data=bundle, content_type="application/zip")
+                    _atomic_merge_json_file(
+                        _task_result_path(task_id), {"minio": {"bucket": bucket, "object_key": object_key}}
+                    )
             except MinioConfigError:
                 pass
             except Exception as exc:
@@ -483,52 +614,62 @@ def run_note_task(task_id: str, video_url: str, platform: str, quality: Download
         # Optional: upload transcript + note to Dify Knowledge Base for RAG (separate datasets).
         if auto_dify:
             dify_cfg = dify_cfg or DifyConfig.from_env()
+            transcript_dataset_id = (dify_cfg.transcript_dataset_id or dify_cfg.dataset_id).strip()
+            note_dataset_id = (dify_cfg.note_dataset_id or dify_cfg.dataset_id).strip()
+            # Documents already created by an interrupted run (recovered job) are kept, not uploaded again.
+            previous_dify = _read_result_section(task_id, "dify")
             dify_info: dict[str, Any] = {
                 "base_url": dify_cfg.base_url,
-                "transcript": None,
-                "note": None,
+                "transcript": _uploaded_dify_doc(previous_dify, "transcript", transcript_dataset_id),
+                "note": _uploaded_dify_doc(previous_dify, "note", note_dataset_id),
             }
+
+            def _persist_dify_info() -> None:
+                try:
+                    _task_dir(task_id).mkdir(parents=True, exist_ok=True)
+                    _atomic_merge_json_file(_task_result_path(task_id), {"dify": dify_info})
+                    _merge_task_status(task_id, {"dify": dify_info})
+                except Exception:
+                    pass
+
             # Persist early so UI can show "uploading" even if Dify calls take a while.
-            try:
-                _task_dir(task_id).mkdir(parents=True, exist_ok=True)
-                _atomic_merge_json_file(_task_result_path(task_id), {"dify": dify_info})
-                _atomic_merge_json_file(_task_status_path(task_id), {"dify": dify_info})
-            except Exception:
-                pass
+            _persist_dify_info()
 
             client = DifyKnowledgeClient(dify_cfg)
             try:
                 base_name = build_rag_document_name(note.audio_meta, platform, created_at_ms=created_at_ms)
-                transcript_dataset_id = (dify_cfg.transcript_dataset_id or dify_cfg.dataset_id).strip()
-                note_dataset_id = (dify_cfg.note_dataset_id or dify_cfg.dataset_id).strip()
 
                 dify_errors: dict[str, str] = {}
 
                 if transcript_dataset_id:
                     try:
-                        transcript_name = f"{base_name} (transcript)"
-                        transcript_text = build_rag_document_text(
-                            audio=note.audio_meta,
-                            transcript=note.transcript,
-                            platform=platform,
-                            source_url=video_url,
-                        )
-                        resp_transcript = client.create_document_by_text(
-                            dataset_id=transcript_dataset_id,
-                            name=transcript_name,
-                            text=transcript_text,
-                            doc_language="Chinese Simplified",
-                        )
-                        doc_transcript = resp_transcript.get("document") or {}
-                        dify_info["transcript"] = {
-                            "dataset_id": transcript_dataset_id,
-                            "document_id": doc_transcript.get("id"),
-                            "batch": resp_transcript.get("batch"),
-                        }
+                        uploaded = dify_info["transcript"]
+                        if uploaded is None:
+                            transcript_name = f"{base_name} (transcript)"
+                            transcript_text = build_rag_document_text(
+                                audio=note.audio_meta,
+                                transcript=note.transcript,
+                                platform=platform,
+                                source_url=video_url,
+                            )
+                            resp_transcript = client.create_document_by_text(
+                                dataset_id=transcript_dataset_id,
+                                name=transcript_name,
+                                text=transcript_text,
+                                doc_language="Chinese Simplified",
+                            )
+                            doc_transcript = resp_transcript.get("document") or {}
+                            uploaded = {
+                                "dataset_id": transcript_dataset_id,
+                                "document_id": doc_transcript.get("id"),
+                                "batch": resp_transcript.get("batch"),
+                            }
+                        dify_info["transcript"] = uploaded
                         # Backward-compatible primary fields (use transcript).
                         dify_info["dataset_id"] = transcript_dataset_id
-                        dify_info["document_id"] = doc_transcript.get("id")
-                        dify_info["batch"] = resp_transcript.get("batch")
+                        dify_info["document_id"] = uploaded.get("document_id")
+                        dify_info["batch"] = uploaded.get("batch")
+                        _persist_dify_info()
                     except DifyError as exc:
                         dify_errors["transcript"] = str(exc)
                 else:
@@ -536,25 +677,29 @@ def run_note_task(task_id: str, video_url: str, platform: str, quality: Download
 
                 if note_dataset_id:
                     try:
-                        note_name = f"{base_name} (note)"
-                        note_text = build_rag_note_document_text(
-                            audio=note.audio_meta,
-                            platform=platform,
-                            source_url=video_url,
-                            note_markdown=note.markdown,
-                        )
-                        resp_note = client.create_document_by_text(
-                            dataset_id=note_dataset_id,
-                            name=note_name,
-                            text=note_text,
-                            doc_language="Chinese Simplified",
-                        )
-                        doc_note = resp_note.get("document") or {}
-                        dify_info["note"] = {
-                            "dataset_id": note_dataset_id,
-                            "document_id": doc_note.get("id"),
-                            "batch": resp_note.get("batch"),
-                        }
+                        uploaded = dify_info["note"]
+                        if uploaded is None:
+                            note_name = f"{base_name} (note)"
+                            note_text = build_rag_note_document_text(
+                                audio=note.audio_meta,
+                                platform=platform,
+                                source_url=video_url,
+                                note_markdown=note.markdown,
+                            )
+                            resp_note = client.create_document_by_text(
+                                dataset_id=note_dataset_id,
+                                name=note_name,
+                                text=note_text,
+                                doc_language="Chinese Simplified",
+                            )
+                            doc_note = resp_note.get("document") or {}
+                            uploaded = {
+                                "dataset_id": note_dataset_id,
+                                "document_id": doc_note.get("id"),
+                                "batch": resp_note.get("batch"),
+                            }
+                        dify_info["note"] = uploaded
+                        _persist_dify_info()
                     except DifyError as exc:
                         dify_errors["note"] = str(exc)
                 else:
@@ -564,25 +709,214 @@ def run_note_task(task_id: str, video_url: str, platform: str, quality: Download
 
             _task_dir(task_id).mkdir(parents=True, exist_ok=True)
             result_path = _task_result_path(task_id)
-            status_path = _task_status_path(task_id)
             _atomic_merge_json_file(result_path, {"dify": dify_info})
-            _atomic_merge_json_file(status_path, {"dify": dify_info})
+            _merge_task_status(task_id, {"dify": dify_info})
+            dify_indexing_monitor.track(task_id, dify_info)
             if dify_errors:
-                _atomic_merge_json_file(status_path, {"dify_error": json.dumps(dify_errors, ensure_ascii=False)})
+                _merge_task_status(task_id, {"dify_error": json.dumps(dify_errors, ensure_ascii=False)})
                 logger.error(f"Dify upload partially failed (task_id={task_id}): {dify_errors}")
             else:
                 logger.info(f"Uploaded to Dify (task_id={task_id})")
     except DifyError as exc:
-        status_path = _task_status_path(task_id)
-        _atomic_merge_json_file(status_path, {"dify_error": str(exc)})
+        _merge_task_status(task_id, {"dify_error": str(exc)})
         logger.error(f"Dify upload failed (task_id={task_id}): {exc}")
     except Exception as exc:
-        status_path = _task_status_path(task_id)
-        _atomic_merge_json_file(status_path, {"dify_error": str(exc)})
+        _merge_task_status(task_id, {"dify_error": str(exc)})
         logger.error(f"Dify upload failed (task_id={task_id}): {exc}", exc_info=True)
-    finally:
-        task_manager.cleanup(task_id)
+    return True
+
+
+def _finish_note_job(job: NoteJob) -> None:
+    if job.checkpoint == NOTE_PIPELINE[-1][0]:
+        status = "done"
+    elif task_manager.is_cancelled(job.task_id):
+        status = "cancelled"
+    else:
+        status = "failed"
+    finish_note_job(job.task_id, status)
+    release_pins(job.cache_pins)
+    task_manager.cleanup(job.task_id)
+
+
+def _record_stage_metrics(job: NoteJob, stage: str, metrics: dict[str, Any]) -> None:
+    """
+    Persist one stage's metrics: status JSON (and result JSON once it exists) plus the task_stage_metrics table.
+    """
+    task_id = job.task_id
+    insert_stage_metric(
+        task_id,
+        stage,
+        {
+            **metrics,
+            "platform": job.platform,
+            "provider_id": job.provider_id,
+            "model_name": job.model_name,
+        },
+    )
+    try:
+        merged = dict((_read_task_status(task_id) or {}).get("metrics") or {})
+        merged[stage] = metrics
+        _merge_task_status(task_id, {"metrics": merged})
 
+        result_path = _task_result_path(task_id)
+        if result_path.exists():
+            _atomic_merge_json_file(result_path, {"metrics": merged})
+    except Exception as exc:
+        logger.warning(f"Writing stage metrics failed (task_id={task_id}, stage={stage}): {exc}")
+
+
+def _checkpointed(stage: str, handler):
+    """
+    Record stage start/completion in the durable job table so an interrupted job can be resumed,
+    and measure the stage (wall/CPU/peak RSS + the counters the stage left in job.stage_stats).
+    """
+    def _run(job: NoteJob) -> bool:
+        mark_note_job_stage(job.task_id, stage)
+        ok = False
+        meter = StageMeter(stage)
+        try:
+            with meter:
+                ok = handler(job)
+        finally:
+            observe_stage(stage, meter.wall_seconds, bool(ok))
+            _record_stage_metrics(job, stage, meter.result(ok=bool(ok), **job.stage_stats.get(stage, {})))
+        if ok:
+            job.checkpoint = stage
+            mark_note_job_checkpoint(job.task_id, stage)
+        return ok
+
+    return _run
+
+
+# Stage handlers in pipeline order; each runs on the matching JobScheduler worker pool.
+NOTE_PIPELINE = tuple(
+    (stage, _checkpointed(stage, handler))
+    for stage, handler in (
+        ("download", _note_download_stage),
+        ("transcribe", _note_transcribe_stage),
+        ("summarize", _note_summarize_stage),
+        ("ingest", _note_ingest_stage),
+    )
+)
+
+NOTE_JOB_MAX_RECOVERIES = max(0, int(os.getenv("NOTE_JOB_MAX_RECOVERIES", "3") or 3))
+
+
+def _job_payload(job: NoteJob) -> dict[str, Any]:
+    return {**job.request_meta, "created_at_ms": job.created_at_ms}
+
+
+def _job_from_payload(task_id: str, payload: dict[str, Any]) -> NoteJob:
+    try:
+        quality = DownloadQuality(payload.get("quality") or DownloadQuality.medium.value)
+    except ValueError:
+        quality = DownloadQuality.medium
+    job = build_note_job(
+        task_id,
+        payload.get("video_url") or "",
+        payload.get("platform") or "",
+        quality,
+        bool(payload.get("link")),
+        bool(payload.get("screenshot")),
+        payload.get("model_name") or None,
+        payload.get("provider_id") or None,
+        list(payload.get("format") or []),
+        payload.get("style") or None,
+        payload.get("extras") or None,
+        bool(payload.get("video_understanding")),
+        int(payload.get("video_interval") or 0),
+        list(payload.get("grid_size") or []),
+        bool(payload.get("no_cache")),
+        payload.get("whisper_model_size") or None,
+    )
+    # Keep the original creation time so sync ids stay stable across restarts.
+    created_at_ms = payload.get("created_at_ms")
+    if isinstance(created_at_ms, int) and created_at_ms > 0:
+        job.created_at_ms = created_at_ms
+    job.resume = True
+    return job
+
+
+def submit_note_job(job: NoteJob) -> Optional[int]:
+    upsert_note_job(job.task_id, _job_payload(job))
+    return job_scheduler.submit(job.task_id, job, NOTE_PIPELINE, on_finish=_finish_note_job)
+
+
+def _restore_checkpoint(job: NoteJob, checkpoint: Optional[str]) -> int:
+    """
+    Rebuild what the completed stages left on the job from the task directory, so a recovered job resumes
+    after its checkpoint instead of replaying the pipeline. Returns how many leading stages to skip.
+
+    The download stage also keeps in-memory artefacts (video file, frame grids, cache pins) that are not
+    persisted, so it is never skipped; it reuses {task_id}_audio.json and is cheap on a warm cache.
+    """
+    stages = [stage for stage, _ in NOTE_PIPELINE]
+    if checkpoint not in stages or checkpoint == "download":
+        return 0
+    task_id = job.task_id
+    try:
+        if checkpoint == "transcribe":
+            if job.screenshot or job.video_understanding:
+                # The summarize stage needs the video / frames produced by the download stage.
+                return 0
+            audio = json.loads(NoteGenerator._cache_file(task_id, "_audio.json").read_text(encoding="utf-8"))
+            transcript = json.loads(NoteGenerator._cache_file(task_id, "_transcript.json").read_text(encoding="utf-8"))
+            job.audio_meta = _parse_audio_meta({"audio_meta": audio})
+            job.transcript = _parse_transcript({"transcript": transcript})
+        else:
+            payload = json.loads(_task_result_path(task_id).read_text(encoding="utf-8"))
+            job.audio_meta = _parse_audio_meta(payload)
+            job.transcript = _parse_transcript(payload)
+            job.markdown = _extract_markdown(payload)
+            if not job.markdown:
+                raise ValueError("missing markdown in note result")
+            job.result = NoteResult(markdown=job.markdown, transcript=job.transcript, audio_meta=job.audio_meta)
+            job.sync = dict(payload.get("sync") or {})
+    except Exception as exc:
+        logger.warning(f"Cannot restore checkpoint, rerun from the start (task_id={task_id}, checkpoint={checkpoint}): {exc}")
+        return 0
+    job.checkpoint = checkpoint
+    return stages.index(checkpoint) + 1
+
+
+def recover_note_jobs() -> int:
+    """
+    Re-enqueue jobs that were queued or running when the process stopped.
+
+    Stages up to the recorded checkpoint are skipped when their outputs can be restored from the task directory
+    (see _restore_checkpoint); the remaining stages reuse their on-disk caches ({task_id}_audio.json /
+    _transcript.json / _markdown.md), so a recovered job only redoes the work that had not finished yet.
+    """
+    recovered = 0
+    for entry in list_unfinished_note_jobs():
+        task_id = entry["task_id"]
+        attempts = increment_note_job_attempts(task_id)
+        if attempts > NOTE_JOB_MAX_RECOVERIES:
+            logger.warning(f"Note job exceeded recovery limit, mark failed (task_id={task_id}, attempts={attempts})")
+            finish_note_job(task_id, "failed")
+            NoteGenerator()._update_status(task_id, TaskStatus.FAILED, message="服务多次重启后任务仍未完成，已放弃恢复")
+            continue
+        try:
+            job = _job_from_payload(task_id, entry["payload"])
+        except Exception as exc:
+            logger.error(f"Failed to rebuild note job (task_id={task_id}): {exc}")
+            finish_note_job(task_id, "failed")
+            NoteGenerator()._update_status(task_id, TaskStatus.FAILED, message=f"任务恢复失败：{exc}")
+            continue
+
+        checkpoint = entry.get("checkpoint")
+        remaining = NOTE_PIPELINE[_restore_checkpoint(job, checkpoint):]
+        if not remaining:
+            # Every stage finished before the restart; only the final bookkeeping was lost.
+            _finish_note_job(job)
+            logger.info(f"Recovered note job was already complete (task_id={task_id})")
+            continue
+        task_manager.ensure(task_id)
+        NoteGenerator()._update_status(task_id, TaskStatus.PENDING, message="服务重启，任务已恢复排队")
+        job_scheduler.submit(task_id, job, remaining, on_finish=_finish_note_job)
+        recovered += 1
+        logger.info(f"Recovered note job (task_id={task_id}, checkpoint={entry.get('checkpoint')}, attempts={attempts})")
+    return recovered
 
 
 @router.post('/delete_task')
@@ -593,16 +927,14 @@ def delete_task(data: RecordRequest):
             task_id = get_task_by_video(data.video_id, data.platform) or ""
 
         if task_id:
-            # Cooperative cancellation (background task checks this flag).
-            task_manager.cancel(task_id)
+            # Queued jobs are dropped right away; running ones are cancelled cooperatively.
+            if job_scheduler.cancel(task_id):
+                task_manager.cleanup(task_id)
+            else:
+                task_manager.cancel(task_id)
+            delete_note_job(task_id)
 
-            status_path = _pick_existing_path(_task_status_path(task_id), _legacy_status_path(task_id))
-            status = None
-            if status_path and status_path.exists():
-                try:
-                    status = json.loads(status_path.read_text(encoding="utf-8")).get("status")
-                except Exception:
-                    status = None
+            status = (_read_task_status(task_id) or {}).get("status")
 
             # Only override status while still running; keep SUCCESS/FAILED records intact.
             if status not in (TaskStatus.SUCCESS.value, TaskStatus.FAILED.value, TaskStatus.CANCELLED.value):
@@ -661,7 +993,7 @@ async def upload(file: UploadFile = File(...)):
 
 
 @router.post("/generate_note")
-def generate_note(data: VideoRequest, background_tasks: BackgroundTasks):
+def generate_note(data: VideoRequest):
     try:
 
         video_id = extract_video_id(data.video_url, data.platform)
@@ -686,17 +1018,23 @@ def generate_note(data: VideoRequest, background_tasks: BackgroundTasks):
                     "dify_indexing": None,
                     "transcribed_seconds": None,
                     "total_seconds": None,
+                    "metrics": None,
                 },
             )
             logger.info(f"重试模式，复用已有 task_id={task_id}")
         else:
             # 正常新建任务
             task_id = str(uuid.uuid4())
-
-        background_tasks.add_task(run_note_task, task_id, data.video_url, data.platform, data.quality, data.link,
-                                  data.screenshot, data.model_name, data.provider_id, data.format, data.style,
-                                  data.extras, data.video_understanding, data.video_interval, data.grid_size)
-        return R.success({"task_id": task_id})
+            NoteGenerator()._update_status(task_id, TaskStatus.PENDING, message="任务排队中")
+
+        job = build_note_job(task_id, data.video_url, data.platform, data.quality, data.link, data.screenshot,
+                             data.model_name, data.provider_id, data.format, data.style, data.extras,
+                             data.video_understanding, data.video_interval, data.grid_size, bool(data.no_cache),
+                             data.whisper_model_size)
+        queue_position = submit_note_job(job)
+        return R.success({"task_id": task_id, "queue_position": queue_position})
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -804,7 +1142,6 @@ def reingest_dify(data: ReingestRequest):
     if not result_path:
         return R.error("Note result file not found", code=404)
 
-    status_path = _pick_existing_path(_task_status_path(task_id), _legacy_status_path(task_id)) or _task_status_path(task_id)
     _task_dir(task_id).mkdir(parents=True, exist_ok=True)
 
     try:
@@ -812,12 +1149,7 @@ def reingest_dify(data: ReingestRequest):
     except Exception as exc:
         return R.error(f"Failed to read note result: {exc}", code=500)
 
-    status_content: dict[str, Any] = {}
-    if status_path and status_path.exists():
-        try:
-            status_content = json.loads(status_path.read_text(encoding="utf-8"))
-        except Exception:
-            status_content = {}
+    status_content: dict[str, Any] = _read_task_status(task_id) or {}
 
     try:
         audio = _parse_audio_meta(result_content)
@@ -955,8 +1287,8 @@ def reingest_dify(data: ReingestRequest):
         client.close()
 
     _atomic_merge_json_file(result_path, {"dify": dify_info})
-    _atomic_merge_json_file(
-        status_path,
+    _merge_task_status(
+        task_id,
         {
             "status": TaskStatus.SUCCESS.value,
             "progress": 100,
@@ -966,22 +1298,80 @@ def reingest_dify(data: ReingestRequest):
         },
     )
 
+    dify_indexing_monitor.track(task_id, dify_info)
+
     dify_error: Optional[str] = None
     if dify_errors:
         dify_error = json.dumps(dify_errors, ensure_ascii=False)
-        _atomic_merge_json_file(status_path, {"dify_error": dify_error})
+        _merge_task_status(task_id, {"dify_error": dify_error})
 
     return R.success({"task_id": task_id, "dify": dify_info, "dify_error": dify_error})
 
 
-@router.get("/task_status/{task_id}")
-def get_task_status(task_id: str):
-    status_path = _pick_existing_path(_task_status_path(task_id), _legacy_status_path(task_id))
-    result_path = _pick_existing_path(_task_result_path(task_id), _legacy_result_path(task_id))
+TASK_EVENTS_MAX_IDS = 500
+TASK_EVENTS_HEARTBEAT_SECONDS = 15.0
+
+
+def _task_status_snapshot(task_id: str) -> Optional[dict[str, Any]]:
+    content = _read_task_status(task_id)
+    if not content:
+        return None
+    return {key: content.get(key) for key in DELTA_FIELDS if key in content}
 
-    # 优先读状态文件
-    if status_path and status_path.exists():
-        status_content = json.loads(status_path.read_text(encoding="utf-8"))
+
+def _sse_event(task_id: str, delta: dict[str, Any]) -> str:
+    payload = json.dumps({"task_id": task_id, **delta}, ensure_ascii=False)
+    return f"event: task\ndata: {payload}\n\n"
+
+
+@router.get("/task_events")
+async def task_events(request: Request, task_ids: Optional[str] = None):
+    """
+    Server-Sent Events stream of task progress deltas (status / progress / message / transcribed_seconds).
+
+    One connection watches many tasks: pass `task_ids=a,b,c` (omit to watch every task). The current
+    state of each listed task is sent first, then only changed fields. Full results still come from
+    /task_status once a task reaches SUCCESS.
+    """
+    ids = [t.strip() for t in (task_ids or "").split(",") if t.strip()][:TASK_EVENTS_MAX_IDS]
+    # Subscribe before taking snapshots so no update falls between the two.
+    subscription = task_event_broker.subscribe(ids, asyncio.get_running_loop())
+
+    async def _stream():
+        try:
+            yield "retry: 3000\n\n"
+            for tid in ids:
+                snapshot = _task_status_snapshot(tid)
+                if snapshot:
+                    yield _sse_event(tid, snapshot)
+            while not await request.is_disconnected():
+                batch = await subscription.next_batch(TASK_EVENTS_HEARTBEAT_SECONDS)
+                if not batch:
+                    yield ": keep-alive\n\n"
+                    continue
+                for tid, delta in batch.items():
+                    yield _sse_event(tid, delta)
+        finally:
+            task_event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _task_status_data(
+    task_id: str,
+    status_content: Optional[dict[str, Any]],
+    result_path: Optional[Path],
+) -> tuple[Optional[dict[str, Any]], Optional[str]]:
+    """
+    Full task_status payload as (data, error message).
+    """
+
+    # 优先读状态（内存中的状态存储，未命中时读状态文件）
+    if status_content is not None:
 
         status = status_content.get("status")
         message = status_content.get("message", "")
@@ -996,60 +1386,24 @@ def get_task_status(task_id: str):
         if status == TaskStatus.SUCCESS.value:
             # 成功状态的话，继续读取最终笔记内容
             if result_path and result_path.exists():
-                result_content = json.loads(result_path.read_text(encoding="utf-8"))
+                result_content = _load_result_json(result_path)
                 request_effective = request_meta
                 if request_effective is None and isinstance(result_content, dict) and isinstance(result_content.get("request"), dict):
                     request_effective = result_content.get("request")
 
-                # If we have a Dify batch id, attach real-time indexing status.
+                # Indexing status comes from the background monitor's cache (terminal state is persisted).
                 dify_info = dify_info or result_content.get("dify")
-                dify_indexing = None
-                if isinstance(dify_info, dict):
-                    try:
-                        dify_cfg = DifyConfig.from_env()
-                        dify_client = DifyKnowledgeClient(dify_cfg)
-                        try:
-                            merged_data: list[Any] = []
-                            per_dataset: dict[str, Any] = {}
-
-                            for key in ("transcript", "note"):
-                                info = dify_info.get(key)
-                                if not isinstance(info, dict):
-                                    continue
-                                batch = info.get("batch")
-                                dataset_id = info.get("dataset_id")
-                                if not batch or not dataset_id:
-                                    continue
-                                payload = dify_client.get_batch_indexing_status(
-                                    batch=str(batch),
-                                    dataset_id=str(dataset_id),
-                                )
-                                per_dataset[key] = payload
-                                data_list = payload.get("data")
-                                if isinstance(data_list, list):
-                                    merged_data.extend(data_list)
-
-                            # Backward-compatible: if no per-dataset info, fall back to legacy fields.
-                            if not per_dataset and dify_info.get("batch"):
-                                payload = dify_client.get_batch_indexing_status(
-                                    batch=str(dify_info["batch"]),
-                                    dataset_id=str(dify_info.get("dataset_id") or ""),
-                                )
-                                per_dataset["primary"] = payload
-                                data_list = payload.get("data")
-                                if isinstance(data_list, list):
-                                    merged_data.extend(data_list)
-
-                            if per_dataset:
-                                dify_indexing = {**per_dataset, "data": merged_data}
-                                indexing_error = _extract_dify_indexing_error(dify_indexing)
-                                if indexing_error and not dify_error:
-                                    dify_error = indexing_error
-                        finally:
-                            dify_client.close()
-                    except Exception as exc:
-                        dify_error = dify_error or str(exc)
-                return R.success({
+                dify_indexing = status_content.get("dify_indexing")
+                if isinstance(dify_info, dict) and not is_indexing_finished(dify_indexing):
+                    cached, monitor_error = dify_indexing_monitor.lookup(task_id, dify_info)
+                    dify_indexing = cached or dify_indexing
+                    if monitor_error and not dify_error:
+                        dify_error = monitor_error
+                if dify_indexing:
+                    indexing_error = _extract_dify_indexing_error(dify_indexing)
+                    if indexing_error and not dify_error:
+                        dify_error = indexing_error
+                return {
                     "status": status,
                     "progress": progress,
                     "result": result_content,
@@ -1059,50 +1413,266 @@ def get_task_status(task_id: str):
                     "dify_error": dify_error,
                     "request": request_effective,
                     "task_id": task_id
-                })
+                }, None
             else:
                 # 理论上不会出现，保险处理
-                return R.success({
+                return {
                     "status": TaskStatus.PENDING.value,
                     "progress": progress,
                     "request": request_meta,
                     "message": "任务完成，但结果文件未找到",
                     "task_id": task_id
-                })
+                }, None
 
         if status == TaskStatus.FAILED.value:
-            return R.error(message or "任务失败", code=500)
+            return None, message or "任务失败"
 
         # 处理中状态
-        return R.success({
+        waiting_stage, waiting_position = job_scheduler.waiting_stage(task_id)
+        return {
             "status": status,
             "progress": progress,
             "request": request_meta,
             "message": message,
             "dify": dify_info,
             "dify_error": dify_error,
+            "queue_position": job_scheduler.queue_position(task_id),
+            "waiting_stage": waiting_stage,
+            "waiting_position": waiting_position,
             "task_id": task_id
-        })
+        }, None
 
     # 没有状态文件，但有结果
     if result_path and result_path.exists():
-        result_content = json.loads(result_path.read_text(encoding="utf-8"))
-        return R.success({
+        result_content = _load_result_json(result_path)
+        return {
             "status": TaskStatus.SUCCESS.value,
             "progress": 100,
             "result": result_content,
             "dify": result_content.get("dify"),
             "request": result_content.get("request") if isinstance(result_content.get("request"), dict) else None,
             "task_id": task_id
-        })
+        }, None
 
     # 什么都没有，默认PENDING
-    return R.success({
+    return {
         "status": TaskStatus.PENDING.value,
         "progress": 0,
         "message": "任务排队中",
+        "queue_position": job_scheduler.queue_position(task_id),
         "task_id": task_id
-    })
+    }, None
+
+
+_RESULT_CACHE_SIZE = 16
+_result_cache: "OrderedDict[str, tuple[tuple[int, int], dict[str, Any]]]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _load_result_json(path: Path) -> dict[str, Any]:
+    """
+    Parse a result file, reusing the parsed copy while its mtime/size are unchanged. Treat as read-only.
+    """
+    st = path.stat()
+    key = str(path)
+    signature = (st.st_mtime_ns, st.st_size)
+    with _result_cache_lock:
+        hit = _result_cache.get(key)
+        if hit is not None and hit[0] == signature:
+            _result_cache.move_to_end(key)
+            return hit[1]
+    content = json.loads(path.read_text(encoding="utf-8"))
+    with _result_cache_lock:
+        _result_cache[key] = (signature, content)
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+    return content
+
+
+# Shorthands for fields inside `result`.
+_RESULT_FIELD_ALIASES = {"markdown", "transcript", "audio_meta"}
+
+
+def _parse_fields(raw: Optional[str]) -> Optional[tuple[str, ...]]:
+    if not raw:
+        return None
+    names = []
+    for name in raw.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        names.append(f"result.{name}" if name in _RESULT_FIELD_ALIASES else name)
+    return tuple(dict.fromkeys(names)) or None
+
+
+def _project_task_status(
+    data: dict[str, Any],
+    fields: Optional[tuple[str, ...]],
+    segment_offset: int,
+    segment_limit: Optional[int],
+) -> dict[str, Any]:
+    """
+    Keep only requested fields (`status`, `result.markdown`, ...) and page transcript segments.
+    """
+    paging = segment_offset > 0 or segment_limit is not None
+    if fields is None and not paging:
+        return data
+
+    out: dict[str, Any] = {"task_id": data.get("task_id"), "status": data.get("status")}
+    result = data.get("result") if isinstance(data.get("result"), dict) else None
+    for name in fields or tuple(data.keys()):
+        if name.startswith("result."):
+            key = name[len("result."):]
+            if result is not None and key in result:
+                out.setdefault("result", {})[key] = result[key]
+        elif name == "result":
+            if result is not None:
+                out["result"] = dict(result)
+        elif name in data:
+            out[name] = data[name]
+
+    transcript = (out.get("result") or {}).get("transcript")
+    if paging and isinstance(transcript, dict):
+        segments = transcript.get("segments") or []
+        start = max(0, segment_offset)
+        end = start + segment_limit if segment_limit is not None else None
+        out["result"]["transcript"] = {
+            **transcript,
+            "segments": segments[start:end],
+            "segments_total": len(segments),
+            "segment_offset": start,
+        }
+    return out
+
+
+def _strong_etag(payload: Any) -> str:
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+
+# Finished tasks: (task status, result file, indexing cache version, projection) -> ETag of the last body,
+# so a repeated conditional GET is answered with 304 before the result file is read.
+_ETAG_MEMO_SIZE = 512
+_etag_memo: "OrderedDict[tuple, str]" = OrderedDict()
+
+
+def _finished_validator(
+    task_id: str,
+    status_content: Optional[dict[str, Any]],
+    result_path: Optional[Path],
+    projection: tuple,
+) -> Optional[tuple]:
+    if not status_content or status_content.get("status") != TaskStatus.SUCCESS.value or not result_path:
+        return None
+    try:
+        st = result_path.stat()
+    except OSError:
+        return None
+    status_hash = hashlib.sha256(
+        json.dumps(status_content, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return (
+        task_id,
+        status_hash,
+        st.st_mtime_ns,
+        st.st_size,
+        dify_indexing_monitor.version(task_id),
+        projection,
+    )
+
+
+@router.get("/task_status/{task_id}")
+def get_task_status(
+    task_id: str,
+    request: Request,
+    fields: Optional[str] = None,
+    segment_offset: int = 0,
+    segment_limit: Optional[int] = None,
+):
+    """
+    Task status (+ result when finished).
+
+    - `fields=status,progress` / `fields=markdown` / `fields=result.audio_meta`: return only those fields
+      (`task_id` and `status` are always included; markdown/transcript/audio_meta are result shorthands).
+    - `segment_offset` / `segment_limit`: page `result.transcript.segments`.
+    - Responses carry a strong ETag; send it back as If-None-Match to get 304 Not Modified.
+    """
+    status_content = _read_task_status(task_id)
+    result_path = _pick_existing_path(_task_result_path(task_id), _legacy_result_path(task_id))
+    selected = _parse_fields(fields)
+    projection = (selected, max(0, segment_offset), segment_limit)
+    if_none_match = request.headers.get("if-none-match")
+
+    validator = _finished_validator(task_id, status_content, result_path, projection)
+    if validator is not None and if_none_match:
+        with _result_cache_lock:
+            memo_etag = _etag_memo.get(validator)
+        if memo_etag and _etag_matches(if_none_match, memo_etag):
+            return Response(status_code=304, headers={"ETag": memo_etag, "Cache-Control": "no-cache"})
+
+    data, error = _task_status_data(task_id, status_content, result_path)
+    if error is not None:
+        return R.error(error, code=500)
+
+    body = _project_task_status(data, selected, max(0, segment_offset), segment_limit)
+    etag = _strong_etag(body)
+    if validator is not None:
+        with _result_cache_lock:
+            _etag_memo[validator] = etag
+            while len(_etag_memo) > _ETAG_MEMO_SIZE:
+                _etag_memo.popitem(last=False)
+
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    response = R.success(body)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@router.get("/task_queue")
+def get_task_queue():
+    return R.success(job_scheduler.snapshot())
+
+
+@router.get("/task_metrics")
+def get_task_metrics(task_id: Optional[str] = None, stage: Optional[str] = None, limit: int = 200):
+    """
+    Per-stage metrics rows (newest first), optionally filtered by task/stage.
+    """
+    return R.success(list_stage_metrics(task_id=(task_id or "").strip() or None, stage=stage, limit=limit))
+
+
+@router.get("/task_metrics/summary")
+def get_task_metrics_summary():
+    """
+    Aggregates per stage over non-cached runs (latency, CPU, bandwidth, audio, LLM tokens).
+    """
+    return R.success(summarize_stage_metrics())
+
+
+@router.get("/cache_stats")
+def get_cache_stats():
+    """
+    Size, entry count and hit ratio of every on-disk cache (media, transcript, ...).
+    """
+    return R.success(all_cache_stats())
+
+
+@router.get("/whisper_models")
+def get_whisper_models():
+    """
+    Selectable Whisper model sizes, the models currently loaded in the pool and the CPU thread shares.
+    """
+    return R.success({"available": list(MODEL_MAP), **whisper_model_pool.stats(), "cpu_budget": cpu_budget.snapshot()})
 
 
 @router.get("/image_proxy")
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _env_threads() -> int:
+    raw = (os.getenv("TRANSCRIBE_CPU_THREADS") or "").strip()
+    cores = os.cpu_count() or 1
+    if not raw:
+        return cores
+    try:
+        value = int(raw)
+    except ValueError:
+        logger.warning(f"Invalid TRANSCRIBE_CPU_THREADS={raw!r}, fallback to {cores}")
+        return cores
+    return value if value > 0 else cores
+
+
+class CpuLease:
+    """
+    One running transcription's claim on the thread budget. `threads` is re-read on every call,
+    so long-running work can shrink or grow its parallelism as other jobs start and finish.
+    """
+
+    def __init__(self, budget: "CpuThreadBudget", job_id: str) -> None:
+        self.budget = budget
+        self.job_id = job_id
+        self.started_at = time.monotonic()
+        self._thread_seconds = 0.0
+        self._mark = self.started_at
+        self._last_share = 0
+
+    @property
+    def threads(self) -> int:
+        return self.budget.share(self.job_id)
+
+    def _settle(self, now: float, share: int) -> None:
+        # Called with the budget lock held whenever the set of running jobs changes.
+        self._thread_seconds += self._last_share * (now - self._mark)
+        self._mark = now
+        self._last_share = share
+
+    def average_threads(self) -> Optional[float]:
+        with self.budget._lock:
+            now = time.monotonic()
+            total = self._thread_seconds + self._last_share * (now - self._mark)
+            elapsed = now - self.started_at
+        return round(total / elapsed, 2) if elapsed > 0 else float(self._last_share or 0)
+
+
+class CpuThreadBudget:
+    """
+    Global CPU thread budget for transcription: running jobs split the budget evenly
+    (the remainder goes to the earliest jobs) and shares are recomputed whenever a job starts or ends.
+    """
+
+    def __init__(self, total_threads: int) -> None:
+        self.total_threads = max(1, int(total_threads))
+        self._lock = threading.RLock()
+        self._leases: dict[str, CpuLease] = {}  # insertion order = start order
+
+    @contextmanager
+    def lease(self, job_id: str) -> Iterator[CpuLease]:
+        lease = CpuLease(self, job_id)
+        with self._lock:
+            self._leases[job_id] = lease
+            self._rebalance_locked()
+        token = _current_lease.set(lease)
+        try:
+            yield lease
+        finally:
+            _current_lease.reset(token)
+            with self._lock:
+                lease._settle(time.monotonic(), lease._last_share)
+                self._leases.pop(job_id, None)
+                self._rebalance_locked()
+
+    def share(self, job_id: Optional[str] = None) -> int:
+        with self._lock:
+            running = list(self._leases)
+            if job_id not in self._leases:
+                # A job that has not started yet would be one more participant.
+                return max(1, self.total_threads // (len(running) + 1))
+            base, extra = divmod(self.total_threads, len(running))
+            return max(1, base + (1 if running.index(job_id) < extra else 0))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "total_threads": self.total_threads,
+                "jobs": {job_id: self.share(job_id) for job_id in self._leases},
+            }
+
+    def _rebalance_locked(self) -> None:
+        now = time.monotonic()
+        for job_id, lease in self._leases.items():
+            lease._settle(now, self.share(job_id))
+
+
+_current_lease: ContextVar[Optional[CpuLease]] = ContextVar("cpu_lease", default=None)
+
+
+def current_lease() -> Optional[CpuLease]:
+    """
+    The lease of the transcription running in this thread/context, if any.
+    """
+    return _current_lease.get()
+
+
+def current_threads() -> int:
+    lease = current_lease()
+    return lease.threads if lease is not None else cpu_budget.share()
+
+
+cpu_budget = CpuThreadBudget(_env_threads())
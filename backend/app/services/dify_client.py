@@ -1,4 +1,5 @@
 import os
+import time
 import json as jsonlib
 from dataclasses import dataclass
 from typing import Any, Optional
@@ -6,6 +7,7 @@ from typing import Any, Optional
 import httpx
 
 from app.services.dify_config_manager import DifyConfigManager
+from app.services.prometheus_metrics import observe_dify_request
 
 
 class DifyError(RuntimeError):
@@ -114,11 +116,19 @@ class DifyHttpClient:
             "Content-Type": "application/json",
         }
 
+        start = time.perf_counter()
         try:
             resp = self._client.request(method, url, headers=headers, params=params, json=json)
         except httpx.RequestError as exc:
+            observe_dify_request(method, path, time.perf_counter() - start, error_kind=type(exc).__name__)
             raise DifyError(f"Dify request failed: {exc}") from exc
 
+        observe_dify_request(
+            method,
+            path,
+            time.perf_counter() - start,
+            error_kind=f"http_{resp.status_code}" if resp.status_code >= 400 else None,
+        )
         if resp.status_code >= 400:
             body = resp.content.decode("utf-8", errors="replace")
             raise DifyError(f"Dify API error {resp.status_code}: {body}")
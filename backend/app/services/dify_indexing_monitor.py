@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from app.services.dify_client import DifyConfig, DifyKnowledgeClient
+from app.services.status_store import status_store
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Dify document indexing states that will not change any more.
+TERMINAL_INDEXING_STATES = {"completed", "error", "failed", "paused", "stopped"}
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return max(0.1, float(raw))
+    except ValueError:
+        logger.warning(f"Invalid {name}={raw!r}, fallback to {default}")
+        return default
+
+
+def indexing_targets(dify_info: Any) -> list[tuple[str, str, str]]:
+    """
+    (key, dataset_id, batch) for every uploaded document batch recorded in a task's `dify` field.
+    """
+    if not isinstance(dify_info, dict):
+        return []
+    targets: list[tuple[str, str, str]] = []
+    for key in ("transcript", "note"):
+        info = dify_info.get(key)
+        if not isinstance(info, dict):
+            continue
+        batch = info.get("batch")
+        dataset_id = info.get("dataset_id")
+        if batch and dataset_id:
+            targets.append((key, str(dataset_id), str(batch)))
+    # Backward-compatible: legacy single-dataset records.
+    if not targets and dify_info.get("batch"):
+        targets.append(("primary", str(dify_info.get("dataset_id") or ""), str(dify_info["batch"])))
+    return targets
+
+
+def is_indexing_finished(payload: Any) -> bool:
+    docs = payload.get("data") if isinstance(payload, dict) else None
+    if not isinstance(docs, list) or not docs:
+        return False
+    return all(
+        isinstance(d, dict) and str(d.get("indexing_status") or "").lower() in TERMINAL_INDEXING_STATES
+        for d in docs
+    )
+
+
+@dataclass
+class _Tracked:
+    task_id: str
+    targets: list[tuple[str, str, str]]
+    interval: float
+    next_poll_at: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+    payload: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    finished: bool = False
+    version: int = 0  # bumped whenever payload/error changes (used for response validators)
+
+
+class DifyIndexingMonitor:
+    """
+    Background poller for outstanding Dify indexing batches.
+
+    Tasks are registered once their documents are uploaded; a single thread polls every due batch on
+    an exponential backoff schedule (one shared client per round) until all documents reach a terminal
+    state, then persists the final `dify_indexing` into the task status. Readers only touch the cache.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_interval: float = 2.0,
+        max_interval: float = 60.0,
+        backoff: float = 1.5,
+        max_age: float = 6 * 3600,
+    ) -> None:
+        self._initial_interval = initial_interval
+        self._max_interval = max(initial_interval, max_interval)
+        self._backoff = max(1.0, backoff)
+        self._max_age = max_age
+        self._cond = threading.Condition()
+        self._tracked: dict[str, _Tracked] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls) -> "DifyIndexingMonitor":
+        return cls(
+            initial_interval=_env_float("DIFY_INDEXING_POLL_INITIAL_SECONDS", 2.0),
+            max_interval=_env_float("DIFY_INDEXING_POLL_MAX_SECONDS", 60.0),
+            backoff=_env_float("DIFY_INDEXING_POLL_BACKOFF", 1.5),
+            max_age=_env_float("DIFY_INDEXING_MAX_TRACK_SECONDS", 6 * 3600),
+        )
+
+    # ---------------- public API ----------------
+
+    def track(self, task_id: str, dify_info: Any) -> None:
+        """
+        Start (or restart, when the batches changed) monitoring a task's uploaded batches.
+        """
+        tid = (task_id or "").strip()
+        targets = indexing_targets(dify_info)
+        if not tid or not targets:
+            return
+        with self._cond:
+            existing = self._tracked.get(tid)
+            if existing is not None and existing.targets == targets:
+                return
+            self._tracked[tid] = _Tracked(task_id=tid, targets=targets, interval=self._initial_interval)
+            self._prune_locked()
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def lookup(self, task_id: str, dify_info: Any) -> tuple[Optional[dict[str, Any]], Optional[str]]:
+        """
+        Cached (dify_indexing, error) for a task; starts tracking it when not known yet.
+        """
+        tid = (task_id or "").strip()
+        with self._cond:
+            entry = self._tracked.get(tid)
+            if entry is not None and entry.targets == indexing_targets(dify_info):
+                return entry.payload, entry.error
+        self.track(tid, dify_info)
+        return None, None
+
+    def version(self, task_id: str) -> int:
+        with self._cond:
+            entry = self._tracked.get((task_id or "").strip())
+            return entry.version if entry is not None else 0
+
+    def forget(self, task_id: str) -> None:
+        with self._cond:
+            self._tracked.pop((task_id or "").strip(), None)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._cond:
+            pending = [e for e in self._tracked.values() if not e.finished]
+            return {"tracked": len(self._tracked), "pending": len(pending)}
+
+    # ---------------- internals ----------------
+
+    def _prune_locked(self, keep_finished: int = 2000) -> None:
+        # Finished entries are persisted in the task status; keep only the most recent ones in memory.
+        finished = [tid for tid, e in self._tracked.items() if e.finished]
+        for tid in finished[: max(0, len(finished) - keep_finished)]:
+            self._tracked.pop(tid, None)
+
+    def _ensure_thread(self) -> None:
+        # Called with the condition held.
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name="dify-indexing-monitor", daemon=True)
+        self._thread.start()
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    pending = [e for e in self._tracked.values() if not e.finished]
+                    if not pending:
+                        self._cond.wait()
+                        continue
+                    now = time.monotonic()
+                    due = [e for e in pending if e.next_poll_at <= now]
+                    if due:
+                        break
+                    self._cond.wait(timeout=max(0.05, min(e.next_poll_at for e in pending) - now))
+            try:
+                self._poll_round(due)
+            except Exception as exc:
+                logger.error(f"Dify indexing poll round failed: {exc}", exc_info=True)
+
+    def _poll_round(self, due: list[_Tracked]) -> None:
+        client = DifyKnowledgeClient(DifyConfig.from_env())
+        try:
+            for entry in due:
+                self._poll_one(client, entry)
+        finally:
+            client.close()
+
+    def _poll_one(self, client: DifyKnowledgeClient, entry: _Tracked) -> None:
+        per_dataset: dict[str, Any] = {}
+        merged: list[Any] = []
+        error: Optional[str] = None
+        try:
+            for key, dataset_id, batch in entry.targets:
+                payload = client.get_batch_indexing_status(batch=batch, dataset_id=dataset_id or None)
+                per_dataset[key] = payload
+                docs = payload.get("data")
+                if isinstance(docs, list):
+                    merged.extend(docs)
+        except Exception as exc:
+            error = str(exc)
+
+        now = time.monotonic()
+        with self._cond:
+            if self._tracked.get(entry.task_id) is not entry:
+                return  # forgotten or re-tracked meanwhile
+            payload = {**per_dataset, "data": merged} if error is None else entry.payload
+            if payload != entry.payload or error != entry.error:
+                entry.version += 1
+            entry.payload = payload
+            entry.error = error
+            entry.finished = error is None and is_indexing_finished(entry.payload)
+            if not entry.finished and now - entry.started_at > self._max_age:
+                logger.warning(f"Stop tracking Dify indexing after max age (task_id={entry.task_id})")
+                entry.finished = True
+            entry.next_poll_at = now + entry.interval
+            entry.interval = min(self._max_interval, entry.interval * self._backoff)
+            finished = entry.finished
+            payload = entry.payload
+
+        if finished and payload is not None and status_store.get(entry.task_id) is not None:
+            # Persist the terminal state so later status reads (and restarts) need no Dify call at all.
+            status_store.update(entry.task_id, {"dify_indexing": payload}, flush=True)
+
+
+dify_indexing_monitor = DifyIndexingMonitor.from_env()
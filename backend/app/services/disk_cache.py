@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from app.utils.logger import get_logger
+from app.utils.path_helper import get_data_dir
+from app.utils.paths import resolve_path
+
+logger = get_logger(__name__)
+
+_META_FILE = "meta.json"
+_DATA_FILE = "data.json"
+
+# Every cache created in this process, for the stats endpoint.
+_registry: "OrderedDict[str, DiskLRUCache]" = OrderedDict()
+
+
+def cache_root() -> Path:
+    return resolve_path(os.getenv("CACHE_DIR"), default=os.path.join(get_data_dir(), "cache"))
+
+
+def _env_number(name: str, default: Optional[float]) -> Optional[float]:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        logger.warning(f"Invalid {name}={raw!r}, fallback to {default}")
+        return default
+    return value if value > 0 else None
+
+
+def canonical_key(*parts: Any) -> str:
+    return json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    digest: str
+    path: Path
+    size: int
+    created_at: float
+    last_access: float
+    meta: dict[str, Any] = field(default_factory=dict)
+    files: list[str] = field(default_factory=list)
+
+    def file(self, name: str) -> Path:
+        return self.path / name
+
+
+class DiskLRUCache:
+    """
+    Size-bounded, optionally TTL-bounded on-disk cache shared by all tasks of this process.
+
+    Each entry is a directory (files + meta.json) addressed by the sha256 of a canonical key. Recency is
+    kept in memory and mirrored to meta.json's mtime so LRU order survives restarts. `key_lock(key)`
+    gives single-flight semantics (concurrent requests for the same key wait for the first producer),
+    and pinned entries are never evicted while a task still needs their files.
+    """
+
+    def __init__(self, name: str, root: Path, *, max_bytes: Optional[int], ttl_seconds: Optional[float] = None) -> None:
+        self.name = name
+        self.root = root
+        self.max_bytes = int(max_bytes) if max_bytes else None
+        self.ttl_seconds = float(ttl_seconds) if ttl_seconds else None
+        self._lock = threading.RLock()
+        self._index: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._loaded = False
+        self._key_locks: dict[str, list] = {}  # digest -> [lock, waiters]
+        self._pins: dict[str, int] = {}
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _registry[name] = self
+
+    @classmethod
+    def from_env(
+        cls,
+        name: str,
+        env_prefix: str,
+        *,
+        default_max_mb: Optional[float],
+        default_ttl_seconds: Optional[float] = None,
+    ) -> "DiskLRUCache":
+        max_mb = _env_number(f"{env_prefix}_MAX_MB", default_max_mb)
+        ttl = _env_number(f"{env_prefix}_TTL_SECONDS", default_ttl_seconds)
+        return cls(
+            name,
+            cache_root() / name,
+            max_bytes=int(max_mb * 1024 * 1024) if max_mb else None,
+            ttl_seconds=ttl,
+        )
+
+    # ---------------- public API ----------------
+
+    @staticmethod
+    def digest(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    @contextmanager
+    def key_lock(self, key: str) -> Iterator[None]:
+        """
+        Serialize producers of the same key (check -> produce -> put) without blocking other keys.
+        """
+        digest = self.digest(key)
+        with self._lock:
+            slot = self._key_locks.setdefault(digest, [threading.Lock(), 0])
+            slot[1] += 1
+        try:
+            with slot[0]:
+                yield
+        finally:
+            with self._lock:
+                slot[1] -= 1
+                if slot[1] <= 0:
+                    self._key_locks.pop(digest, None)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        digest = self.digest(key)
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._index.get(digest)
+            if entry is not None and self._expired(entry) and digest not in self._pins:
+                self._remove_locked(entry)
+                entry = None
+            if entry is None or not entry.path.exists():
+                if entry is not None:
+                    self._remove_locked(entry)
+                self.misses += 1
+                return None
+            entry.last_access = time.time()
+            self._index.move_to_end(digest)
+            self.hits += 1
+        try:
+            os.utime(entry.path / _META_FILE, None)
+        except OSError:
+            pass
+        return entry
+
+    def put(
+        self,
+        key: str,
+        *,
+        files: Optional[dict[str, Any]] = None,
+        data: Any = None,
+        meta: Optional[dict[str, Any]] = None,
+        move: bool = False,
+    ) -> CacheEntry:
+        """
+        Store files (name -> source path, copied or moved) and/or a JSON document under `key`.
+        """
+        digest = self.digest(key)
+        final_dir = self._entry_dir(digest)
+        with self._lock:
+            # The first load clears leftover staging dirs; it must not run after ours is created.
+            self._ensure_loaded()
+        staging = self.root / ".staging" / uuid.uuid4().hex
+        staging.mkdir(parents=True, exist_ok=True)
+        names: list[str] = []
+        try:
+            for name, src in (files or {}).items():
+                target = staging / name
+                if move:
+                    shutil.move(str(src), str(target))
+                else:
+                    shutil.copy2(str(src), str(target))
+                names.append(name)
+            if data is not None:
+                (staging / _DATA_FILE).write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            now = time.time()
+            (staging / _META_FILE).write_text(
+                json.dumps(
+                    {"key": key, "created_at": now, "files": names, "meta": meta or {}},
+                    ensure_ascii=False,
+                ),
+                encoding="utf-8",
+            )
+            size = sum(p.stat().st_size for p in staging.iterdir() if p.is_file())
+
+            with self._lock:
+                self._ensure_loaded()
+                old = self._index.get(digest)
+                if old is not None:
+                    self._remove_locked(old, count_eviction=False)
+                elif final_dir.exists():
+                    shutil.rmtree(final_dir, ignore_errors=True)
+                final_dir.parent.mkdir(parents=True, exist_ok=True)
+                staging.replace(final_dir)
+                entry = CacheEntry(
+                    key=key,
+                    digest=digest,
+                    path=final_dir,
+                    size=size,
+                    created_at=now,
+                    last_access=now,
+                    meta=meta or {},
+                    files=names,
+                )
+                self._index[digest] = entry
+                self._total_bytes += size
+                self._evict_locked(keep=digest)
+                return entry
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def read_data(self, entry: CacheEntry) -> Any:
+        return json.loads((entry.path / _DATA_FILE).read_text(encoding="utf-8"))
+
+    def pin(self, key: str) -> None:
+        digest = self.digest(key)
+        with self._lock:
+            self._pins[digest] = self._pins.get(digest, 0) + 1
+
+    def unpin(self, key: str) -> None:
+        digest = self.digest(key)
+        with self._lock:
+            count = self._pins.get(digest, 0) - 1
+            if count > 0:
+                self._pins[digest] = count
+            else:
+                self._pins.pop(digest, None)
+            self._evict_locked()
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._index.get(self.digest(key))
+            if entry is not None:
+                self._remove_locked(entry, count_eviction=False)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            self._ensure_loaded()
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "pinned": len(self._pins),
+            }
+
+    # ---------------- internals ----------------
+
+    def _entry_dir(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def _expired(self, entry: CacheEntry) -> bool:
+        return self.ttl_seconds is not None and time.time() - entry.created_at > self.ttl_seconds
+
+    def _ensure_loaded(self) -> None:
+        # Called with the lock held: rebuild the index from disk once per process.
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.root.exists():
+            return
+        shutil.rmtree(self.root / ".staging", ignore_errors=True)
+        found: list[CacheEntry] = []
+        for meta_path in self.root.glob(f"*/*/{_META_FILE}"):
+            entry_dir = meta_path.parent
+            try:
+                info = json.loads(meta_path.read_text(encoding="utf-8"))
+                size = sum(p.stat().st_size for p in entry_dir.iterdir() if p.is_file())
+                found.append(
+                    CacheEntry(
+                        key=str(info.get("key") or ""),
+                        digest=entry_dir.name,
+                        path=entry_dir,
+                        size=size,
+                        created_at=float(info.get("created_at") or 0),
+                        last_access=meta_path.stat().st_mtime,
+                        meta=info.get("meta") or {},
+                        files=list(info.get("files") or []),
+                    )
+                )
+            except Exception as exc:
+                logger.warning(f"Drop unreadable cache entry {entry_dir}: {exc}")
+                shutil.rmtree(entry_dir, ignore_errors=True)
+        for entry in sorted(found, key=lambda e: e.last_access):
+            self._index[entry.digest] = entry
+            self._total_bytes += entry.size
+        self._evict_locked()
+        logger.info(f"Cache '{self.name}' loaded: {len(self._index)} entries, {self._total_bytes} bytes")
+
+    def _remove_locked(self, entry: CacheEntry, *, count_eviction: bool = True) -> None:
+        self._index.pop(entry.digest, None)
+        self._total_bytes = max(0, self._total_bytes - entry.size)
+        shutil.rmtree(entry.path, ignore_errors=True)
+        if count_eviction:
+            self.evictions += 1
+
+    def _evict_locked(self, keep: Optional[str] = None) -> None:
+        for entry in [e for e in self._index.values() if self._expired(e) and e.digest not in self._pins]:
+            self._remove_locked(entry)
+        if self.max_bytes is None:
+            return
+        while self._total_bytes > self.max_bytes:
+            victim = next(
+                (
+                    e
+                    for e in self._index.values()
+                    if e.digest != keep and e.digest not in self._pins and e.digest not in self._key_locks
+                ),
+                None,
+            )
+            if victim is None:
+                return
+            logger.info(f"Cache '{self.name}' evict {victim.key} ({victim.size} bytes)")
+            self._remove_locked(victim)
+
+
+def all_cache_stats() -> list[dict[str, Any]]:
+    return [cache.stats() for cache in _registry.values()]
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Callable, Optional, Sequence
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Pipeline stages that compete for machine resources (network / CPU / LLM quota / remote KB).
+STAGES = ("download", "transcribe", "summarize", "ingest")
+
+_DEFAULT_STAGE_LIMITS = {
+    "download": 2,
+    "transcribe": 1,
+    "summarize": 2,
+    "ingest": 2,
+}
+
+# A stage handler receives the job payload and returns False to stop the pipeline for that job.
+StageHandler = Callable[[Any], bool]
+
+
+def _env_int(name: str, default: int, *, minimum: int = 1) -> int:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return max(minimum, int(raw))
+    except ValueError:
+        logger.warning(f"Invalid {name}={raw!r}, fallback to {default}")
+        return default
+
+
+@dataclass
+class _Job:
+    task_id: str
+    payload: Any
+    handlers: list[tuple[str, StageHandler]]
+    on_finish: Optional[Callable[[Any], None]] = None
+    index: int = 0
+    state: str = "queued"  # queued / running / handoff
+    submitted_at: float = field(default_factory=monotonic)
+
+    @property
+    def stage(self) -> str:
+        return self.handlers[self.index][0]
+
+
+class JobScheduler:
+    """
+    Pipelined executor for note generation jobs.
+
+    Every stage (download / transcribe / summarize / ingest) owns a worker pool sized by its
+    concurrency limit. Jobs flow stage to stage through bounded hand-off queues, so job N+1 can
+    download while job N transcribes and job N-1 is being summarized. A worker that finishes a
+    stage blocks while the next stage's queue is full (back-pressure); the first stage's queue is
+    the unbounded admission queue.
+    """
+
+    def __init__(self, *, stage_limits: dict[str, int], handoff_size: int) -> None:
+        self._cond = threading.Condition()
+        self._stage_limits = {name: max(1, int(stage_limits.get(name) or 1)) for name in STAGES}
+        self._handoff_size = max(1, int(handoff_size))
+        self._queues: dict[str, deque[_Job]] = {name: deque() for name in STAGES}
+        self._active: dict[str, set[str]] = {name: set() for name in STAGES}
+        self._jobs: dict[str, _Job] = {}
+        self._workers: list[threading.Thread] = []
+
+    @classmethod
+    def from_env(cls) -> "JobScheduler":
+        stage_limits = {
+            name: _env_int(f"NOTE_STAGE_LIMIT_{name.upper()}", default)
+            for name, default in _DEFAULT_STAGE_LIMITS.items()
+        }
+        handoff_size = _env_int("NOTE_STAGE_QUEUE_SIZE", 2)
+        if (os.getenv("NOTE_MAX_CONCURRENT_JOBS") or "").strip():
+            # Superseded by the pipeline: jobs in flight are bounded by the stage pools and hand-off queues.
+            logger.warning("NOTE_MAX_CONCURRENT_JOBS is no longer used; tune NOTE_STAGE_LIMIT_* / NOTE_STAGE_QUEUE_SIZE")
+        return cls(stage_limits=stage_limits, handoff_size=handoff_size)
+
+    @property
+    def stage_limits(self) -> dict[str, int]:
+        return dict(self._stage_limits)
+
+    def _ensure_workers(self) -> None:
+        # Called with the condition held.
+        if self._workers:
+            return
+        for name in STAGES:
+            for idx in range(self._stage_limits[name]):
+                worker = threading.Thread(
+                    target=self._worker_loop,
+                    args=(name,),
+                    name=f"note-{name}-{idx}",
+                    daemon=True,
+                )
+                worker.start()
+                self._workers.append(worker)
+        logger.info(f"JobScheduler started: stage_limits={self._stage_limits}, handoff_size={self._handoff_size}")
+
+    # ---------------- public API ----------------
+
+    def submit(
+        self,
+        task_id: str,
+        payload: Any,
+        handlers: Sequence[tuple[str, StageHandler]],
+        *,
+        on_finish: Optional[Callable[[Any], None]] = None,
+    ) -> Optional[int]:
+        """
+        Enqueue a job whose stages run in order on the matching stage pools.
+
+        Returns the 1-based position in the first stage's queue (None when the task is already in flight).
+        """
+        tid = (task_id or "").strip()
+        if not tid:
+            raise ValueError("Missing task_id")
+        if not handlers:
+            raise ValueError("Missing stage handlers")
+        for name, _ in handlers:
+            if name not in self._stage_limits:
+                raise ValueError(f"Unknown stage: {name}")
+
+        with self._cond:
+            self._ensure_workers()
+            existing = self._jobs.get(tid)
+            if existing is not None:
+                logger.warning(f"Task already in pipeline, skip submit (task_id={tid}, stage={existing.stage})")
+                return self._position(existing)
+
+            job = _Job(task_id=tid, payload=payload, handlers=list(handlers), on_finish=on_finish)
+            self._jobs[tid] = job
+            self._queues[job.stage].append(job)
+            self._cond.notify_all()
+            return len(self._queues[job.stage])
+
+    def cancel(self, task_id: str) -> bool:
+        """
+        Drop a job that is waiting in a stage queue. Jobs inside a stage are cancelled cooperatively via task_manager.
+        """
+        tid = (task_id or "").strip()
+        with self._cond:
+            job = self._jobs.get(tid)
+            if job is None or job.state != "queued":
+                return False
+            try:
+                self._queues[job.stage].remove(job)
+            except ValueError:
+                return False
+            self._jobs.pop(tid, None)
+            self._cond.notify_all()
+
+        self._finish(job)
+        return True
+
+    def queue_position(self, task_id: str) -> Optional[int]:
+        """
+        1-based position in the admission queue (the job's first stage), None once it has started.
+        """
+        tid = (task_id or "").strip()
+        with self._cond:
+            job = self._jobs.get(tid)
+            if job is None or job.index != 0 or job.state != "queued":
+                return None
+            return self._position(job)
+
+    def waiting_stage(self, task_id: str) -> tuple[Optional[str], Optional[int]]:
+        """
+        Return (stage, 1-based position) while a job waits in any stage queue.
+        """
+        tid = (task_id or "").strip()
+        with self._cond:
+            job = self._jobs.get(tid)
+            if job is None or job.state != "queued":
+                return None, None
+            return job.stage, self._position(job)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "in_flight": len(self._jobs),
+                "handoff_size": self._handoff_size,
+                "queued": [job.task_id for job in self._queues[STAGES[0]]],
+                "stages": {
+                    name: {
+                        "workers": self._stage_limits[name],
+                        "active": len(self._active[name]),
+                        "queued": len(self._queues[name]),
+                    }
+                    for name in STAGES
+                },
+            }
+
+    # ---------------- internals ----------------
+
+    def _position(self, job: _Job) -> Optional[int]:
+        # Called with the condition held.
+        for idx, queued in enumerate(self._queues[job.stage]):
+            if queued is job:
+                return idx + 1
+        return None
+
+    def _worker_loop(self, stage: str) -> None:
+        queue = self._queues[stage]
+        while True:
+            with self._cond:
+                while not queue:
+                    self._cond.wait()
+                job = queue.popleft()
+                job.state = "running"
+                self._active[stage].add(job.task_id)
+                self._cond.notify_all()
+
+            if job.index == 0:
+                logger.info(f"Job started (task_id={job.task_id}, queued {monotonic() - job.submitted_at:.1f}s)")
+
+            handler = job.handlers[job.index][1]
+            try:
+                ok = bool(handler(job.payload))
+            except Exception as exc:
+                logger.error(f"Stage crashed (task_id={job.task_id}, stage={stage}): {exc}", exc_info=True)
+                ok = False
+
+            finished = not ok or job.index + 1 >= len(job.handlers)
+            with self._cond:
+                if not finished:
+                    next_stage = job.handlers[job.index + 1][0]
+                    job.state = "handoff"
+                    # Back-pressure: keep the worker busy until the next stage has room.
+                    while len(self._queues[next_stage]) >= self._handoff_size:
+                        self._cond.wait()
+                    job.index += 1
+                    job.state = "queued"
+                    self._queues[next_stage].append(job)
+                else:
+                    self._jobs.pop(job.task_id, None)
+                self._active[stage].discard(job.task_id)
+                self._cond.notify_all()
+
+            if finished:
+                self._finish(job)
+
+    @staticmethod
+    def _finish(job: _Job) -> None:
+        if job.on_finish is None:
+            return
+        try:
+            job.on_finish(job.payload)
+        except Exception as exc:
+            logger.error(f"Job finish hook failed (task_id={job.task_id}): {exc}", exc_info=True)
+
+
+job_scheduler = JobScheduler.from_env()
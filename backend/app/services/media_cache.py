@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+from app.models.audio_model import AudioDownloadResult
+from app.services.disk_cache import DiskLRUCache, canonical_key
+from app.utils.logger import get_logger
+from app.utils.url_parser import extract_video_id
+
+logger = get_logger(__name__)
+
+# Shared by every downloader in SUPPORT_PLATFORM_MAP. Local uploads are already on disk and are not cached.
+media_cache = DiskLRUCache.from_env("media", "MEDIA_CACHE", default_max_mb=20 * 1024)
+
+_UNCACHED_PLATFORMS = {"local"}
+
+
+def _quality_value(quality) -> str:
+    return str(getattr(quality, "value", quality) or "")
+
+
+def media_video_id(video_url: str, platform: str) -> Optional[str]:
+    """
+    Stable id of the remote media, or None when it cannot be derived (then nothing is cached).
+    """
+    if platform in _UNCACHED_PLATFORMS:
+        return None
+    try:
+        video_id = extract_video_id(str(video_url), platform)
+    except Exception:
+        return None
+    if not video_id:
+        return None
+    if platform == "bilibili":
+        # Multi-part videos share the BV id; the part number selects the media.
+        page = (parse_qs(urlparse(str(video_url)).query).get("p") or ["1"])[0]
+        if page.isdigit() and int(page) > 1:
+            video_id = f"{video_id}_p{int(page)}"
+    return video_id
+
+
+def media_cache_key(platform: str, video_id: str, quality: str) -> str:
+    return canonical_key("media", platform, video_id, quality)
+
+
+def _file_name(prefix: str, path: str) -> str:
+    ext = os.path.splitext(path)[1] or ""
+    return f"{prefix}{re.sub(r'[^0-9A-Za-z.]', '', ext)}"
+
+
+def fetch_audio(
+    download: Callable[[], AudioDownloadResult],
+    *,
+    video_url: str,
+    platform: str,
+    quality,
+    pins: Optional[list[str]] = None,
+) -> tuple[AudioDownloadResult, bool]:
+    """
+    Return (audio, cache_hit) for (platform, video_id, quality), downloading it at most once across tasks.
+
+    The downloaded files are moved into the cache; the returned result points at the cached copies.
+    Keys appended to `pins` stay protected from eviction until the caller unpins them.
+    """
+    video_id = media_video_id(video_url, platform)
+    if not video_id:
+        return download(), False
+
+    key = media_cache_key(platform, video_id, _quality_value(quality))
+    with media_cache.key_lock(key):
+        entry = media_cache.get(key)
+        if entry is not None:
+            try:
+                data = media_cache.read_data(entry)
+                data["file_path"] = str(entry.file(data.pop("_audio_file")))
+                video_file = data.pop("_video_file", None)
+                data["video_path"] = str(entry.file(video_file)) if video_file else None
+                if pins is not None:
+                    media_cache.pin(key)
+                    pins.append(key)
+                logger.info(f"媒体缓存命中 (platform={platform}, video_id={video_id})")
+                return AudioDownloadResult(**data), True
+            except Exception as exc:
+                logger.warning(f"媒体缓存条目损坏，重新下载：{exc}")
+                media_cache.invalidate(key)
+
+        audio = download()
+        if not audio.file_path or not os.path.exists(audio.file_path):
+            return audio, False
+
+        files = {_file_name("audio", audio.file_path): audio.file_path}
+        data = asdict(audio)
+        data["_audio_file"] = _file_name("audio", audio.file_path)
+        if audio.video_path and os.path.exists(audio.video_path) and audio.video_path != audio.file_path:
+            files[_file_name("video", audio.video_path)] = audio.video_path
+            data["_video_file"] = _file_name("video", audio.video_path)
+        data.pop("file_path", None)
+        data.pop("video_path", None)
+
+        try:
+            entry = media_cache.put(key, files=files, data=data, meta={"platform": platform, "video_id": video_id}, move=True)
+        except Exception as exc:
+            logger.warning(f"写入媒体缓存失败（不影响本次任务）：{exc}")
+            return audio, False
+
+        if pins is not None:
+            media_cache.pin(key)
+            pins.append(key)
+        audio.file_path = str(entry.file(data["_audio_file"]))
+        if data.get("_video_file"):
+            audio.video_path = str(entry.file(data["_video_file"]))
+        return audio, False
+
+
+def pin_cached_audio(
+    audio: AudioDownloadResult,
+    *,
+    video_url: str,
+    platform: str,
+    quality,
+    pins: Optional[list[str]] = None,
+) -> bool:
+    """
+    Pin the cache entry an earlier fetch_audio result (a task's _audio.json) points into, e.g. on retry/recovery.
+
+    Returns False when the audio is gone or no longer belongs to a live entry (evicted / replaced), so the
+    caller downloads again. Files outside the cache (local uploads, uncached downloads) need no pin.
+    """
+    if not audio.file_path or not os.path.exists(audio.file_path):
+        return False
+    audio_dir = Path(audio.file_path).resolve().parent
+    if not audio_dir.is_relative_to(media_cache.root.resolve()):
+        return True
+
+    video_id = media_video_id(video_url, platform)
+    if not video_id:
+        return False
+    key = media_cache_key(platform, video_id, _quality_value(quality))
+    with media_cache.key_lock(key):
+        entry = media_cache.get(key)
+        if entry is None or entry.path.resolve() != audio_dir:
+            return False
+        if pins is None:
+            return True
+        media_cache.pin(key)
+        # Eviction does not take the key lock: re-check now that the entry is protected.
+        if not os.path.exists(audio.file_path):
+            media_cache.unpin(key)
+            return False
+        pins.append(key)
+    return True
+
+
+def fetch_video(
+    download: Callable[[], str],
+    *,
+    video_url: str,
+    platform: str,
+    pins: Optional[list[str]] = None,
+) -> tuple[str, bool]:
+    """
+    Same as fetch_audio for the full video file used by screenshots / video understanding.
+    """
+    video_id = media_video_id(video_url, platform)
+    if not video_id:
+        return download(), False
+
+    key = media_cache_key(platform, video_id, "video")
+    with media_cache.key_lock(key):
+        entry = media_cache.get(key)
+        hit = entry is not None and bool(entry.files)
+        if not hit:
+            path = download()
+            if not path or not os.path.exists(path):
+                return path, False
+            name = _file_name("video", path)
+            try:
+                entry = media_cache.put(key, files={name: path}, meta={"platform": platform, "video_id": video_id}, move=True)
+            except Exception as exc:
+                logger.warning(f"写入媒体缓存失败（不影响本次任务）：{exc}")
+                return path, False
+        else:
+            logger.info(f"视频缓存命中 (platform={platform}, video_id={video_id})")
+        if pins is not None:
+            media_cache.pin(key)
+            pins.append(key)
+        return str(entry.file(entry.files[0])), hit
+
+
+def release_pins(pins: list[str]) -> None:
+    while pins:
+        media_cache.unpin(pins.pop())
@@ -7,6 +7,8 @@ import hashlib
 from dataclasses import dataclass
 from typing import Optional
 
+from app.services.prometheus_metrics import track_minio
+
 try:
     from minio import Minio  # type: ignore
     from minio.error import S3Error  # type: ignore
@@ -129,9 +131,12 @@ class MinioStorage:
         if not b:
             raise ValueError("Missing bucket")
         try:
-            if self._client.bucket_exists(b):
+            with track_minio("bucket_exists"):
+                exists = self._client.bucket_exists(b)
+            if exists:
                 return
-            self._client.make_bucket(b)
+            with track_minio("make_bucket"):
+                self._client.make_bucket(b)
         except S3Error as exc:
             raise RuntimeError(f"MinIO ensure_bucket failed: {exc}") from exc
 
@@ -155,14 +160,15 @@ class MinioStorage:
 
         try:
             stream = io.BytesIO(data)
-            self._client.put_object(
-                b,
-                k,
-                stream,
-                length=len(data),
-                content_type=content_type,
-                metadata=metadata,
-            )
+            with track_minio("put_object"):
+                self._client.put_object(
+                    b,
+                    k,
+                    stream,
+                    length=len(data),
+                    content_type=content_type,
+                    metadata=metadata,
+                )
         except S3Error as exc:
             raise RuntimeError(f"MinIO put_object failed: {exc}") from exc
 
@@ -176,8 +182,9 @@ class MinioStorage:
 
         resp = None
         try:
-            resp = self._client.get_object(b, k)
-            return resp.read()
+            with track_minio("get_object"):
+                resp = self._client.get_object(b, k)
+                return resp.read()
         except S3Error as exc:
             raise RuntimeError(f"MinIO get_object failed: {exc}") from exc
         finally:
@@ -194,7 +201,8 @@ class MinioStorage:
         if not b or not k:
             return None
         try:
-            st = self._client.stat_object(b, k)
+            with track_minio("stat_object"):
+                st = self._client.stat_object(b, k)
             meta = getattr(st, "metadata", None)
             meta_dict = meta if isinstance(meta, dict) else {}
             return {
@@ -219,6 +227,7 @@ class MinioStorage:
         if not k:
             raise ValueError("Missing object_key")
         try:
-            self._client.remove_object(b, k)
+            with track_minio("remove_object"):
+                self._client.remove_object(b, k)
         except S3Error as exc:
             raise RuntimeError(f"MinIO remove_object failed: {exc}") from exc
@@ -27,13 +27,23 @@ from app.gpt.gpt_factory import GPTFactory
 from app.models.audio_model import AudioDownloadResult
 from app.models.gpt_model import GPTSource
 from app.models.model_config import ModelConfig
-from app.models.notes_model import AudioDownloadResult, NoteResult
+from app.models.notes_model import AudioDownloadResult, NoteJob, NoteResult
 from app.models.transcriber_model import TranscriptResult, TranscriptSegment
 from app.services.constant import SUPPORT_PLATFORM_MAP
+from app.services.cpu_budget import cpu_budget
+from app.services.media_cache import fetch_audio, fetch_video, pin_cached_audio, release_pins
 from app.services.provider import ProviderService
+from app.services.summary_cache import cached_summary
+from app.services.transcript_cache import audio_sha256, cached_transcript
+from app.services.transcript_journal import TranscriptJournal
+from app.services.stage_metrics import file_size
+from app.services.status_store import status_store
+from app.services.task_events import status_delta, task_event_broker
 from app.services.task_manager import TaskCancelledError, task_manager
 from app.transcriber.base import Transcriber
 from app.transcriber.transcriber_provider import get_transcriber, _transcribers
+from app.transcriber.vad import collect_vad_stats
+from app.utils.audio_format import ensure_audio_format
 from app.utils.note_helper import replace_content_markers
 from app.utils.status_code import StatusCode
 from app.utils.video_helper import generate_screenshot
@@ -60,6 +70,9 @@ IMAGE_BASE_URL = os.getenv("IMAGE_BASE_URL", "/static/screenshots")
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# 笔记生成的阶段顺序（入库阶段由路由层追加）
+NOTE_STAGES = ("download", "transcribe", "summarize")
+
 
 def _probe_media_duration_seconds(path: str) -> Optional[float]:
     try:
@@ -94,6 +107,11 @@ class NoteGenerator:
         self.transcriber: Transcriber = self._init_transcriber()
         self.video_path: Optional[Path] = None
         self.video_img_urls=[]
+        self.media_cache_hits: int = 0  # 本次下载阶段命中共享媒体缓存的次数
+        self.transcript_cache_hit: bool = False  # 本次转写是否命中全局转写缓存
+        self.transcribe_cpu_threads: Optional[float] = None  # 本次转写平均分到的 CPU 线程数
+        self.transcribe_skipped_seconds: Optional[float] = None  # VAD 跳过的非语音时长
+        self.summary_cache_hit: bool = False  # 本次总结是否命中 LLM 结果缓存
         self.current_task_id: Optional[str] = None
         logger.info("NoteGenerator 初始化完成")
 
@@ -117,6 +135,7 @@ class NoteGenerator:
         video_understanding: bool = False,
         video_interval: int = 0,
         grid_size: Optional[List[int]] = None,
+        no_cache: bool = False,
     ) -> NoteResult | None:
         """
         主流程：按步骤依次下载、转写、GPT 总结、截图/链接处理、存库、返回 NoteResult。
@@ -136,106 +155,199 @@ class NoteGenerator:
         :param video_understanding: 是否需要视频拼图理解（生成缩略图）
         :param video_interval: 视频帧截取间隔（秒），仅在 video_understanding 为 True 时生效
         :param grid_size: 生成缩略图时的网格大小，如 [3, 3]
+        :param no_cache: 跳过总结缓存，强制重新调用 LLM（新结果仍会写回缓存）
         :return: NoteResult 对象，包含 markdown 文本、转写结果和音频元信息
         """
-        if grid_size is None:
-            grid_size = []
-
         task_id = str(task_id or "").strip()
         if not task_id:
             raise ValueError("task_id is required")
 
+        job = NoteJob(
+            task_id=task_id,
+            video_url=str(video_url),
+            platform=platform,
+            quality=quality,
+            model_name=model_name,
+            provider_id=provider_id,
+            link=link,
+            screenshot=screenshot,
+            formats=list(_format or []),
+            style=style,
+            extras=extras,
+            output_path=output_path,
+            video_understanding=video_understanding,
+            video_interval=video_interval,
+            grid_size=list(grid_size or []),
+            no_cache=bool(no_cache),
+        )
+        try:
+            for stage in NOTE_STAGES:
+                if not self.run_stage(job, stage):
+                    return None
+        finally:
+            release_pins(job.cache_pins)
+        return job.result
+
+    def run_stage(self, job: NoteJob, stage: str) -> bool:
+        """
+        执行单个阶段（download / transcribe / summarize），供流水线调度器在不同 worker 上分别调用。
+        失败或取消时写入对应状态并返回 False，后续阶段不再执行。
+
+        :param job: 任务上下文，阶段产出会写回其中
+        :param stage: 阶段名称，取值见 NOTE_STAGES
+        :return: 是否可以继续执行下一阶段
+        """
+        task_id = job.task_id
         self.current_task_id = task_id
-        task_dir = NOTE_OUTPUT_DIR / task_id
-        task_dir.mkdir(parents=True, exist_ok=True)
+        (NOTE_OUTPUT_DIR / task_id).mkdir(parents=True, exist_ok=True)
 
         try:
-            logger.info(f"开始生成笔记 (task_id={task_id})")
-            self._update_status(task_id, TaskStatus.PARSING)
-
-            # 获取下载器与 GPT 实例
-
-            downloader = self._get_downloader(platform)
-            gpt = self._get_gpt(model_name, provider_id)
-
-            # 缓存文件路径
-            audio_cache_file = task_dir / f"{task_id}_audio.json"
-            transcript_cache_file = task_dir / f"{task_id}_transcript.json"
-            markdown_cache_file = task_dir / f"{task_id}_markdown.md"
-            print(audio_cache_file)
-            # 1. 下载音频/视频
-            audio_meta = self._download_media(
-                downloader=downloader,
-                video_url=video_url,
-                quality=quality,
-                audio_cache_file=audio_cache_file,
-                status_phase=TaskStatus.DOWNLOADING,
-                platform=platform,
-                output_path=output_path,
-                screenshot=screenshot,
-                video_understanding=video_understanding,
-                video_interval=video_interval,
-                grid_size=grid_size,
-            )
-
             if task_manager.is_cancelled(task_id):
                 raise TaskCancelledError("Task cancelled")
 
-            # 2. 转写文字
-            transcript = self._transcribe_audio(
-                audio_file=audio_meta.file_path,
-                transcript_cache_file=transcript_cache_file,
-                status_phase=TaskStatus.TRANSCRIBING,
-                total_duration_seconds=audio_meta.duration,
-            )
+            if stage == "download":
+                self._run_download_stage(job)
+            elif stage == "transcribe":
+                self._run_transcribe_stage(job)
+            elif stage == "summarize":
+                self._run_summarize_stage(job)
+            else:
+                raise ValueError(f"Unknown stage: {stage}")
+            return True
 
-            if task_manager.is_cancelled(task_id):
-                raise TaskCancelledError("Task cancelled")
+        except TaskCancelledError as exc:
+            logger.info(f"任务已取消 (task_id={task_id})")
+            self._update_status(task_id, TaskStatus.CANCELLED, message=str(exc) or "任务已取消")
+            return False
+        except Exception as exc:
+            logger.error(f"生成笔记流程异常 (task_id={task_id}, stage={stage})：{exc}", exc_info=True)
+            self._update_status(task_id, TaskStatus.FAILED, message=str(exc))
+            return False
+
+    def _run_download_stage(self, job: NoteJob) -> None:
+        task_id = job.task_id
+        logger.info(f"开始生成笔记 (task_id={task_id})")
+        self._update_status(task_id, TaskStatus.PARSING)
+
+        # 获取下载器与 GPT 实例（提前校验供应商，避免下载完才发现配置错误）
+        downloader = self._get_downloader(job.platform)
+        job.gpt = self._get_gpt(job.model_name, job.provider_id)
+
+        # 1. 下载音频/视频
+        audio_cache_file = self._cache_file(task_id, "_audio.json")
+        cached = audio_cache_file.exists()
+        job.audio_meta = self._download_media(
+            downloader=downloader,
+            video_url=job.video_url,
+            quality=job.quality,
+            audio_cache_file=audio_cache_file,
+            status_phase=TaskStatus.DOWNLOADING,
+            platform=job.platform,
+            output_path=job.output_path,
+            screenshot=job.screenshot,
+            video_understanding=job.video_understanding,
+            video_interval=job.video_interval,
+            grid_size=job.grid_size,
+            cache_pins=job.cache_pins,
+        )
+        job.video_path = self.video_path
+        job.video_img_urls = list(self.video_img_urls or [])
+        cached = cached or self.media_cache_hits > 0
+        if job.video_path:
+            # 需要视频时音频一般是从视频里本地取出的，按视频大小计
+            bytes_downloaded = file_size(job.video_path)
+        else:
+            bytes_downloaded = file_size(job.audio_meta.file_path)
+        job.stage_stats["download"] = {
+            "cached": cached,
+            "bytes_downloaded": 0 if cached else bytes_downloaded,
+            "audio_seconds": job.audio_meta.duration,
+        }
 
-            # 3. GPT 总结
-            markdown = self._summarize_text(
-                audio_meta=audio_meta,
-                transcript=transcript,
-                gpt=gpt,
-                markdown_cache_file=markdown_cache_file,
-                link=link,
-                screenshot=screenshot,
-                formats=_format or [],
-                style=style,
-                extras=extras,
-                video_img_urls=self.video_img_urls,
+    def _run_transcribe_stage(self, job: NoteJob) -> None:
+        # 2. 转写文字
+        transcript_cache_file = self._cache_file(job.task_id, "_transcript.json")
+        cached = transcript_cache_file.exists()
+        transcriber = self._transcriber_for(job.whisper_model_size)
+        audio_file = job.audio_meta.file_path
+        if not cached:
+            # 下载保留原生容器；只有转写器声明了必须的格式时才转换一次（写入任务目录，不动共享媒体缓存）
+            audio_file = ensure_audio_format(
+                audio_file, transcriber.required_audio_format, output_dir=str(transcript_cache_file.parent)
             )
+        job.transcript = self._transcribe_audio(
+            audio_file=audio_file,
+            transcript_cache_file=transcript_cache_file,
+            status_phase=TaskStatus.TRANSCRIBING,
+            total_duration_seconds=job.audio_meta.duration,
+            transcriber=transcriber,
+            source_file=job.audio_meta.file_path,
+        )
+        segments = job.transcript.segments or []
+        audio_seconds = job.audio_meta.duration or (float(segments[-1].end) if segments else None)
+        job.stage_stats["transcribe"] = {
+            "cached": cached or self.transcript_cache_hit,
+            "cpu_threads": self.transcribe_cpu_threads,
+            "skipped_seconds": self.transcribe_skipped_seconds,
+            "audio_seconds": audio_seconds,
+            "segments": len(segments),
+        }
 
-            if task_manager.is_cancelled(task_id):
-                raise TaskCancelledError("Task cancelled")
+    def _run_summarize_stage(self, job: NoteJob) -> None:
+        task_id = job.task_id
+        if job.gpt is None:
+            job.gpt = self._get_gpt(job.model_name, job.provider_id)
+
+        # 3. GPT 总结
+        markdown_cache_file = self._cache_file(task_id, "_markdown.md")
+        cached = job.resume and markdown_cache_file.exists()
+        markdown = self._summarize_text(
+            audio_meta=job.audio_meta,
+            transcript=job.transcript,
+            gpt=job.gpt,
+            markdown_cache_file=markdown_cache_file,
+            reuse_cache=job.resume,
+            link=job.link,
+            screenshot=job.screenshot,
+            formats=job.formats,
+            style=job.style,
+            extras=job.extras,
+            video_img_urls=job.video_img_urls,
+            provider_id=job.provider_id,
+            model_name=job.model_name,
+            bypass_cache=job.no_cache,
+        )
 
-            # 4. 截图 & 链接替换
-            if _format:
-                markdown = self._post_process_markdown(
-                    markdown=markdown,
-                    video_path=self.video_path,
-                    formats=_format,
-                    audio_meta=audio_meta,
-                    platform=platform,
-                )
+        cached = cached or self.summary_cache_hit
+        usage = {} if cached else dict(getattr(job.gpt, "last_usage", None) or {})
+        job.stage_stats["summarize"] = {"cached": cached, **usage}
 
-            # 5. 保存记录到数据库
-            self._update_status(task_id, TaskStatus.SAVING)
-            self._save_metadata(video_id=audio_meta.video_id, platform=platform, task_id=task_id)
+        if task_manager.is_cancelled(task_id):
+            raise TaskCancelledError("Task cancelled")
 
-            # 6. 完成
-            self._update_status(task_id, TaskStatus.SUCCESS)
-            logger.info(f"笔记生成成功 (task_id={task_id})")
-            return NoteResult(markdown=markdown, transcript=transcript, audio_meta=audio_meta)
+        # 4. 截图 & 链接替换
+        if job.formats:
+            markdown = self._post_process_markdown(
+                markdown=markdown,
+                video_path=job.video_path,
+                formats=job.formats,
+                audio_meta=job.audio_meta,
+                platform=job.platform,
+            )
+        job.markdown = markdown
 
-        except TaskCancelledError as exc:
-            logger.info(f"任务已取消 (task_id={task_id})")
-            self._update_status(task_id, TaskStatus.CANCELLED, message=str(exc) or "任务已取消")
-            return None
-        except Exception as exc:
-            logger.error(f"生成笔记流程异常 (task_id={task_id})：{exc}", exc_info=True)
-            self._update_status(task_id, TaskStatus.FAILED, message=str(exc))
-            return None
+        # 5. 保存记录到数据库
+        self._update_status(task_id, TaskStatus.SAVING)
+        self._save_metadata(video_id=job.audio_meta.video_id, platform=job.platform, task_id=task_id)
+
+        # 6. 完成
+        self._update_status(task_id, TaskStatus.SUCCESS)
+        logger.info(f"笔记生成成功 (task_id={task_id})")
+        job.result = NoteResult(markdown=markdown, transcript=job.transcript, audio_meta=job.audio_meta)
+
+    @staticmethod
+    def _cache_file(task_id: str, suffix: str) -> Path:
+        return NOTE_OUTPUT_DIR / task_id / f"{task_id}{suffix}"
 
     @staticmethod
     def delete_note(video_id: str, platform: str) -> int:
@@ -262,6 +374,14 @@ class NoteGenerator:
         logger.info(f"使用转写器：{self.transcriber_type}")
         return get_transcriber(transcriber_type=self.transcriber_type)
 
+    def _transcriber_for(self, whisper_model_size: Optional[str]) -> Transcriber:
+        """
+        请求指定了 Whisper 模型大小时，从模型池取对应大小的转写器；其他转写器忽略该参数
+        """
+        if whisper_model_size and hasattr(self.transcriber, "for_model_size"):
+            return self.transcriber.for_model_size(whisper_model_size)
+        return self.transcriber
+
     def _get_gpt(self, model_name: Optional[str], provider_id: Optional[str]) -> GPT:
         """
         根据 provider_id 获取对应的 GPT 实例
@@ -325,61 +445,33 @@ class NoteGenerator:
         if not task_id:
             return
 
-        task_dir = NOTE_OUTPUT_DIR / str(task_id).strip()
-        task_dir.mkdir(parents=True, exist_ok=True)
-        status_file = task_dir / f"{task_id}.status.json"
-        print(f"写入状态文件: {status_file} 当前状态: {status}")
+        task_id = str(task_id).strip()
         normalized_status = status.value if isinstance(status, TaskStatus) else str(status)
-
-        existing: dict[str, Any] = {}
-        if status_file.exists():
-            try:
-                existing = json.loads(status_file.read_text(encoding="utf-8"))
-            except Exception:
-                existing = {}
+        existing = status_store.get(task_id) or {}
 
         computed_progress = int(progress) if isinstance(progress, (int, float)) else TaskStatus.progress(status)
-        if normalized_status in (TaskStatus.FAILED.value, TaskStatus.CANCELLED.value) and status_file.exists():
-            try:
-                existing_progress = existing.get("progress") if isinstance(existing, dict) else None
-                if isinstance(existing_progress, (int, float)):
-                    computed_progress = int(existing_progress)
-            except Exception:
-                pass
-
-        data = {
-            **(existing if isinstance(existing, dict) else {}),
+        if normalized_status in (TaskStatus.FAILED.value, TaskStatus.CANCELLED.value):
+            existing_progress = existing.get("progress")
+            if isinstance(existing_progress, (int, float)):
+                computed_progress = int(existing_progress)
+
+        patch: dict[str, Any] = {
             "status": normalized_status,
             "progress": max(0, min(100, int(computed_progress))),
         }
         if message:
-            data["message"] = message
-        else:
-            data.pop("message", None)
-
+            patch["message"] = message
         if extra and isinstance(extra, dict):
-            data.update(extra)
-
-        try:
-            # First create a temporary file
-            temp_file = status_file.with_suffix('.tmp')
-
-            # Write to temporary file
-            with temp_file.open('w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
-            # Atomic rename operation
-            temp_file.replace(status_file)
-
-            print(f"状态文件写入成功: {status_file}")
-        except Exception as e:
-            logger.error(f"写入状态文件失败 (task_id={task_id})：{e}")
-            # Try to write error to file directly as fallback
-            try:
-                with status_file.open('w', encoding='utf-8') as f:
-                    f.write(f"Error writing status: {str(e)}")
-            except:
-                logger.error(f"写入错误  {e}")
+            patch.update(extra)
+
+        # 状态切换（阶段边界）立即落盘；同一状态内的进度回调由 status_store 合并后延迟写入
+        previous, current = status_store.update(
+            task_id,
+            patch,
+            flush_on_change=("status",),
+            drop=() if "message" in patch else ("message",),
+        )
+        task_event_broker.publish(task_id, status_delta(previous, current))
 
     def _handle_exception(self, task_id, exc):
         logger.error(f"任务异常 (task_id={task_id})", exc_info=True)
@@ -404,10 +496,11 @@ class NoteGenerator:
         video_understanding: bool,
         video_interval: int,
         grid_size: List[int],
+        cache_pins: Optional[List[str]] = None,
     ) -> AudioDownloadResult | None:
         """
         1. 检查音频缓存；若不存在，则根据需要下载音频或视频（若需截图/可视化）。
-        2. 如果需要视频，则先下载视频并生成缩略图集，再下载音频。
+        2. 如果需要视频：支持合并下载的平台一次下载音视频并在本地取出音轨；否则先下载视频再下载音频。之后生成缩略图集。
         3. 返回 AudioDownloadResult
 
         :param downloader: Downloader 实例
@@ -421,6 +514,7 @@ class NoteGenerator:
         :param video_understanding: 是否需要生成缩略图
         :param video_interval: 视频截帧间隔
         :param grid_size: 缩略图网格尺寸
+        :param cache_pins: 收集本任务使用的共享媒体缓存条目，任务结束前不会被淘汰
         :return: AudioDownloadResult 对象
         """
         task_id = audio_cache_file.stem.split("_")[0]
@@ -430,59 +524,110 @@ class NoteGenerator:
 
 
 
-        # 判断是否需要下载视频
+        # 判断是否需要下载视频：需要时音视频由 download_combined 一并获取
         need_video = screenshot or video_understanding
-        if need_video:
-            try:
-                logger.info("开始下载视频")
-                if task_manager.is_cancelled(task_id):
-                    raise TaskCancelledError("Task cancelled")
-                video_path_str = downloader.download_video(video_url)
-                self.video_path = Path(video_path_str)
-                logger.info(f"视频下载完成：{self.video_path}")
-
-                # 若指定了 grid_size，则生成缩略图
-                if grid_size:
-                    self.video_img_urls=VideoReader(
-                        video_path=str(self.video_path),
-                        grid_size=tuple(grid_size),
-                        frame_interval=video_interval,
-                        unit_width=1280,
-                        unit_height=720,
-                        save_quality=90,
-                    ).run()
-                else:
-                    logger.info("未指定 grid_size，跳过缩略图生成")
-            except Exception as exc:
-                logger.error(f"视频下载失败：{exc}")
 
-                self._handle_exception(task_id, exc)
-                raise
+        audio = None
         # 已有缓存，尝试加载
         if audio_cache_file.exists():
             logger.info(f"检测到音频缓存 ({audio_cache_file})，直接读取")
             try:
                 data = json.loads(audio_cache_file.read_text(encoding="utf-8"))
-                return AudioDownloadResult(**data)
+                cached = AudioDownloadResult(**data)
+                # 音频在共享媒体缓存里：先占用条目，防止排队等待转写期间被 LRU 淘汰；
+                # 已被淘汰或无法占用时重新获取
+                if pin_cached_audio(
+                    cached, video_url=str(video_url), platform=platform, quality=quality, pins=cache_pins
+                ):
+                    audio = cached
+                else:
+                    logger.info(f"缓存中的音频文件已不存在，重新获取：{cached.file_path}")
             except Exception as e:
                 logger.warning(f"读取音频缓存失败，将重新下载：{e}")
-        # 下载音频
+
+        if audio is None:
+            # 下载音频
+            try:
+                logger.info("开始下载音视频" if need_video else "开始下载音频")
+                if task_manager.is_cancelled(task_id):
+                    raise TaskCancelledError("Task cancelled")
+                if need_video:
+                    download = lambda: downloader.download_combined(video_url, output_dir=output_path)
+                else:
+                    download = lambda: downloader.download(
+                        video_url=video_url,
+                        quality=quality,
+                        output_dir=output_path,
+                        need_video=need_video,
+                    )
+                audio, audio_hit = fetch_audio(
+                    download,
+                    video_url=str(video_url),
+                    platform=platform,
+                    quality=quality,
+                    pins=cache_pins,
+                )
+                self.media_cache_hits += int(audio_hit)
+                # 缓存 audio 元信息到本地 JSON
+                audio_cache_file.write_text(json.dumps(asdict(audio), ensure_ascii=False, indent=2), encoding="utf-8")
+                logger.info(f"音频下载并缓存成功 ({audio_cache_file})")
+            except Exception as exc:
+                logger.error(f"音频下载失败：{exc}")
+                self._handle_exception(task_id, exc)
+                raise
+
+        if need_video:
+            if audio.video_path and os.path.exists(audio.video_path):
+                self.video_path = Path(audio.video_path)
+                logger.info(f"视频已随音频一并获取：{self.video_path}")
+            else:
+                # 共享缓存里只有纯音频（之前的任务未要求视频），单独补下视频
+                self._fetch_video(task_id, downloader, video_url, platform, cache_pins)
+            self._build_thumbnails(task_id, video_interval, grid_size)
+        return audio
+
+    def _fetch_video(
+        self,
+        task_id: str,
+        downloader: Downloader,
+        video_url: Union[str, HttpUrl],
+        platform: str,
+        cache_pins: Optional[List[str]],
+    ) -> None:
         try:
-            logger.info("开始下载音频")
+            logger.info("开始下载视频")
             if task_manager.is_cancelled(task_id):
                 raise TaskCancelledError("Task cancelled")
-            audio = downloader.download(
-                video_url=video_url,
-                quality=quality,
-                output_dir=output_path,
-                need_video=need_video,
+            video_path_str, video_hit = fetch_video(
+                lambda: downloader.download_video(video_url),
+                video_url=str(video_url),
+                platform=platform,
+                pins=cache_pins,
             )
-            # 缓存 audio 元信息到本地 JSON
-            audio_cache_file.write_text(json.dumps(asdict(audio), ensure_ascii=False, indent=2), encoding="utf-8")
-            logger.info(f"音频下载并缓存成功 ({audio_cache_file})")
-            return audio
+            self.video_path = Path(video_path_str)
+            self.media_cache_hits += int(video_hit)
+            logger.info(f"视频下载完成：{self.video_path}")
         except Exception as exc:
-            logger.error(f"音频下载失败：{exc}")
+            logger.error(f"视频下载失败：{exc}")
+            self._handle_exception(task_id, exc)
+            raise
+
+    def _build_thumbnails(self, task_id: str, video_interval: int, grid_size: List[int]) -> None:
+        # 若指定了 grid_size，则生成缩略图
+        if not grid_size:
+            logger.info("未指定 grid_size，跳过缩略图生成")
+            return
+        try:
+            self.video_img_urls=VideoReader(
+                video_path=str(self.video_path),
+                grid_size=tuple(grid_size),
+                frame_interval=video_interval,
+                unit_width=1280,
+                unit_height=720,
+                save_quality=90,
+            ).run()
+        except Exception as exc:
+            logger.error(f"缩略图生成失败：{exc}")
             self._handle_exception(task_id, exc)
             raise
 
@@ -493,6 +638,8 @@ class NoteGenerator:
         transcript_cache_file: Path,
         status_phase: TaskStatus,
         total_duration_seconds: Optional[float] = None,
+        transcriber: Optional[Transcriber] = None,
+        source_file: Optional[str] = None,
     ) -> TranscriptResult | None:
         """
         1. 检查转写缓存；若存在则尝试加载，否则调用转写器生成并缓存。
@@ -501,9 +648,12 @@ class NoteGenerator:
         :param audio_file: 音频文件本地路径
         :param transcript_cache_file: 转写结果缓存路径
         :param status_phase: 对应的状态枚举，如 TaskStatus.TRANSCRIBING
+        :param transcriber: 本次使用的转写器（默认 self.transcriber）
+        :param source_file: audio_file 由下载文件转换而来时传入原始下载文件，缓存键按其内容计算
         :return: TranscriptResult 对象
         """
         task_id = transcript_cache_file.stem.split("_")[0]
+        transcriber = transcriber or self.transcriber
 
         if task_manager.is_cancelled(task_id):
             raise TaskCancelledError("Task cancelled")
@@ -576,13 +726,47 @@ class NoteGenerator:
                     },
                 )
 
-            transcript = self.transcriber.transcript(
-                file_path=audio_file,
-                total_duration=float(total_duration_seconds) if isinstance(total_duration_seconds, (int, float)) else None,
-                on_progress=_on_progress,
-                should_cancel=_should_cancel,
+            journal: Optional[TranscriptJournal] = None
+
+            def _run_transcriber() -> TranscriptResult:
+                nonlocal journal
+                kwargs = {}
+                if transcriber.supports_journal:
+                    # 逐段写入任务日志；重试同一 task_id 时从上次中断处继续
+                    journal = TranscriptJournal(
+                        self._cache_file(task_id, "_transcript.jsonl"),
+                        fingerprint={
+                            "audio_sha256": audio_sha256(source_file or audio_file),
+                            "transcriber": transcriber.cache_identity(),
+                        },
+                    )
+                    kwargs["journal"] = journal
+                # 占用 CPU 线程预算中的一份；并发转写越多，每个任务分到的线程越少
+                with cpu_budget.lease(task_id) as lease, collect_vad_stats() as vad_stats:
+                    try:
+                        result = transcriber.transcript(
+                            file_path=audio_file,
+                            total_duration=float(total_duration_seconds) if isinstance(total_duration_seconds, (int, float)) else None,
+                            on_progress=_on_progress,
+                            should_cancel=_should_cancel,
+                            **kwargs,
+                        )
+                    finally:
+                        if journal is not None:
+                            journal.close()
+                    self.transcribe_cpu_threads = lease.average_threads()
+                    self.transcribe_skipped_seconds = vad_stats.get("skipped_seconds")
+                    return result
+
+            transcript, self.transcript_cache_hit = cached_transcript(
+                _run_transcriber,
+                audio_file=audio_file,
+                transcriber=transcriber,
+                source_file=source_file,
             )
             transcript_cache_file.write_text(json.dumps(asdict(transcript), ensure_ascii=False, indent=2), encoding="utf-8")
+            if journal is not None:
+                journal.discard()
             self._update_status(task_id, status_phase, progress=stage_end)
             logger.info(f"转写并缓存成功 ({transcript_cache_file})")
             return transcript
@@ -605,6 +789,10 @@ class NoteGenerator:
         style: Optional[str],
         extras: Optional[str],
             video_img_urls: List[str],
+        reuse_cache: bool = False,
+        provider_id: Optional[str] = None,
+        model_name: Optional[str] = None,
+        bypass_cache: bool = False,
     ) -> str | None:
         """
         调用 GPT 对转写结果进行总结，生成 Markdown 文本并缓存。
@@ -618,6 +806,10 @@ class NoteGenerator:
         :param formats: 包含 'link' 或 'screenshot' 的列表
         :param style: GPT 输出风格
         :param extras: GPT 额外参数
+        :param reuse_cache: 是否复用已有的 Markdown 缓存（恢复中断任务时使用）
+        :param provider_id: 模型供应商 ID（总结缓存键的一部分）
+        :param model_name: GPT 模型名称（总结缓存键的一部分）
+        :param bypass_cache: 跳过全局总结缓存，强制调用 LLM
         :return: 生成的 Markdown 字符串
         """
         task_id = markdown_cache_file.stem.split("_")[0]
@@ -625,6 +817,16 @@ class NoteGenerator:
             raise TaskCancelledError("Task cancelled")
         self._update_status(task_id, TaskStatus.SUMMARIZING)
 
+        # 恢复任务：已总结过则直接复用，避免重复消耗 LLM 额度
+        if reuse_cache and markdown_cache_file.exists():
+            try:
+                cached = markdown_cache_file.read_text(encoding="utf-8")
+                if cached.strip():
+                    logger.info(f"检测到 Markdown 缓存 ({markdown_cache_file})，直接读取")
+                    return cached
+            except Exception as e:
+                logger.warning(f"读取 Markdown 缓存失败，将重新总结：{e}")
+
         source = GPTSource(
             title=audio_meta.title,
             segment=transcript.segments,
@@ -638,7 +840,14 @@ class NoteGenerator:
         )
 
         try:
-            markdown = gpt.summarize(source)
+            markdown, self.summary_cache_hit = cached_summary(
+                lambda: gpt.summarize(source),
+                gpt=gpt,
+                source=source,
+                provider_id=provider_id,
+                model_name=model_name,
+                bypass=bypass_cache,
+            )
             markdown_cache_file.write_text(markdown, encoding="utf-8")
             logger.info(f"GPT 总结并缓存成功 ({markdown_cache_file})")
             return markdown
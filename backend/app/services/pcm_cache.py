@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import numpy as np
+
+from app.services.disk_cache import DiskLRUCache, canonical_key
+from app.services.transcript_cache import audio_sha256
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+PCM_SAMPLE_RATE = 16000
+_PCM_FILE = "audio.f32"
+
+# 把音频解码一次为 16kHz 单声道 float32（Whisper 的原生输入），转写、分块、VAD 都直接读这份数据
+PCM_DECODE_ENABLED = os.getenv("WHISPER_PCM_DECODE", "true").strip().lower() not in ("0", "false", "no", "off")
+pcm_cache = DiskLRUCache.from_env("pcm", "PCM_CACHE", default_max_mb=4096)
+
+
+def _decode_to_file(src: str, dst: str) -> int:
+    """
+    用 PyAV 流式解码音频轨并重采样为 16kHz 单声道 float32，逐帧写入 dst，返回采样点数。
+    """
+    import av  # type: ignore
+
+    samples = 0
+    resampler = av.AudioResampler(format="flt", layout="mono", rate=PCM_SAMPLE_RATE)
+    with av.open(src) as container, open(dst, "wb") as out:
+        stream = next((s for s in container.streams if s.type == "audio"), None)
+        if stream is None:
+            raise ValueError(f"no audio stream in {src}")
+        for frame in container.decode(stream):
+            frame.pts = None
+            for resampled in resampler.resample(frame):
+                data = resampled.to_ndarray().reshape(-1).astype(np.float32, copy=False)
+                out.write(data.tobytes())
+                samples += data.size
+        for resampled in resampler.resample(None):
+            data = resampled.to_ndarray().reshape(-1).astype(np.float32, copy=False)
+            out.write(data.tobytes())
+            samples += data.size
+    return samples
+
+
+def _pcm_key(audio_file: str) -> Optional[str]:
+    if not PCM_DECODE_ENABLED:
+        return None
+    try:
+        return canonical_key("pcm", audio_sha256(audio_file), PCM_SAMPLE_RATE)
+    except Exception as exc:
+        logger.warning(f"无法读取音频，跳过 PCM 解码：{exc}")
+        return None
+
+
+def _ensure_pcm(key: str, audio_file: str) -> Optional[str]:
+    with pcm_cache.key_lock(key):
+        entry = pcm_cache.get(key)
+        if entry is None or _PCM_FILE not in entry.files:
+            fd, tmp = tempfile.mkstemp(suffix=".f32")
+            os.close(fd)
+            try:
+                samples = _decode_to_file(audio_file, tmp)
+                entry = pcm_cache.put(
+                    key,
+                    files={_PCM_FILE: tmp},
+                    meta={"samples": samples, "sample_rate": PCM_SAMPLE_RATE},
+                    move=True,
+                )
+                logger.info(f"音频已解码为 PCM ({samples / PCM_SAMPLE_RATE:.0f}s)：{os.path.basename(audio_file)}")
+            except Exception as exc:
+                logger.warning(f"PyAV 解码失败，回退为由转写器自行解码：{exc}")
+                return None
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        return str(entry.file(_PCM_FILE))
+
+
+@contextmanager
+def pcm_lease(audio_file: str) -> Iterator[Optional[str]]:
+    """
+    给出 audio_file 对应的 PCM 缓存文件路径（不存在则解码一次）；解码失败或已关闭时给出 None。
+
+    退出前该缓存项保持 pin 住，分块 worker 按路径重新打开 memmap 时不会被 LRU / TTL 清掉。
+    """
+    key = _pcm_key(audio_file)
+    if key is None:
+        yield None
+        return
+    pcm_cache.pin(key)
+    try:
+        yield _ensure_pcm(key, audio_file)
+    finally:
+        pcm_cache.unpin(key)
+
+
+def open_pcm(path: str) -> np.ndarray:
+    """
+    以只读内存映射打开 PCM 文件（不占用进程堆内存，多进程可共享页缓存）。
+    """
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(path, dtype=np.float32, mode="r")
+
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import re
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import GaugeMetricFamily
+
+from app.services.job_scheduler import job_scheduler
+
+# Buckets sized for the pipeline: downloads/transcriptions take seconds to tens of minutes.
+_STAGE_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200)
+_REQUEST_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# Route prefixes whose latency is exported (keep label cardinality small).
+MONITORED_ROUTE_PREFIXES = ("/api/task_status", "/api/rag/chat", "/api/sync/")
+
+STAGE_DURATION = Histogram(
+    "note_stage_duration_seconds",
+    "Wall time of one note pipeline stage",
+    ["stage", "outcome"],
+    buckets=_STAGE_BUCKETS,
+)
+
+DIFY_REQUEST_DURATION = Histogram(
+    "dify_request_duration_seconds",
+    "Latency of Dify API requests",
+    ["method", "endpoint"],
+    buckets=_REQUEST_BUCKETS,
+)
+DIFY_REQUEST_ERRORS = Counter(
+    "dify_request_errors_total",
+    "Failed Dify API requests",
+    ["method", "endpoint", "kind"],
+)
+
+MINIO_REQUEST_DURATION = Histogram(
+    "minio_request_duration_seconds",
+    "Latency of MinIO operations",
+    ["operation"],
+    buckets=_REQUEST_BUCKETS,
+)
+MINIO_REQUEST_ERRORS = Counter(
+    "minio_request_errors_total",
+    "Failed MinIO operations",
+    ["operation"],
+)
+
+WHISPER_MODEL_LOADED = Gauge(
+    "whisper_model_loaded",
+    "1 while a Whisper model is loaded in this process",
+    ["model_size", "device", "compute_type"],
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Latency of monitored HTTP routes (time until response headers)",
+    ["method", "route", "status"],
+    buckets=_REQUEST_BUCKETS,
+)
+
+
+class _NoteQueueCollector:
+    """
+    Read scheduler state at scrape time instead of mirroring every queue change into gauges.
+    """
+
+    def collect(self):
+        snapshot = job_scheduler.snapshot()
+        in_flight = GaugeMetricFamily("note_jobs_in_flight", "Note jobs accepted and not finished yet")
+        in_flight.add_metric([], snapshot.get("in_flight") or 0)
+        yield in_flight
+
+        queued = GaugeMetricFamily("note_stage_queue_depth", "Jobs waiting for a stage worker", labels=["stage"])
+        active = GaugeMetricFamily("note_stage_active", "Jobs currently running in a stage", labels=["stage"])
+        workers = GaugeMetricFamily("note_stage_workers", "Worker pool size of a stage", labels=["stage"])
+        for stage, info in (snapshot.get("stages") or {}).items():
+            queued.add_metric([stage], info.get("queued") or 0)
+            active.add_metric([stage], info.get("active") or 0)
+            workers.add_metric([stage], info.get("workers") or 0)
+        yield queued
+        yield active
+        yield workers
+
+
+REGISTRY.register(_NoteQueueCollector())
+
+
+_ID_SEGMENT_RE = re.compile(r"^(?:[0-9a-fA-F-]{16,}|\d+)$")
+
+
+def normalize_endpoint(path: str) -> str:
+    """
+    Collapse ids in a request path (/datasets/<uuid>/documents -> /datasets/{id}/documents).
+    """
+    parts = [p for p in (path or "").split("?")[0].split("/") if p]
+    return "/" + "/".join("{id}" if _ID_SEGMENT_RE.match(p) else p for p in parts)
+
+
+def observe_stage(stage: str, seconds: float, ok: bool) -> None:
+    STAGE_DURATION.labels(stage=stage, outcome="ok" if ok else "failed").observe(max(0.0, float(seconds)))
+
+
+def observe_dify_request(method: str, path: str, seconds: float, error_kind: str | None = None) -> None:
+    endpoint = normalize_endpoint(path)
+    DIFY_REQUEST_DURATION.labels(method=method.upper(), endpoint=endpoint).observe(max(0.0, float(seconds)))
+    if error_kind:
+        DIFY_REQUEST_ERRORS.labels(method=method.upper(), endpoint=endpoint, kind=error_kind).inc()
+
+
+_MINIO_NOT_FOUND_CODES = {"NoSuchKey", "NoSuchObject", "NoSuchBucket", "NotFound"}
+
+
+@contextmanager
+def track_minio(operation: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as exc:
+        # Missing objects are an expected answer (stat before upload), not a failure.
+        if str(getattr(exc, "code", "") or "") not in _MINIO_NOT_FOUND_CODES:
+            MINIO_REQUEST_ERRORS.labels(operation=operation).inc()
+        raise
+    finally:
+        MINIO_REQUEST_DURATION.labels(operation=operation).observe(time.perf_counter() - start)
+
+
+def set_whisper_model_loaded(model_size: str, device: str, compute_type: str, loaded: bool = True) -> None:
+    WHISPER_MODEL_LOADED.labels(
+        model_size=str(model_size), device=str(device), compute_type=str(compute_type)
+    ).set(1 if loaded else 0)
+
+
+def is_monitored_route(path: str) -> bool:
+    return any(path.startswith(prefix) for prefix in MONITORED_ROUTE_PREFIXES)
+
+
+def observe_http_request(method: str, route: str, status: int, seconds: float) -> None:
+    HTTP_REQUEST_DURATION.labels(method=method.upper(), route=route, status=str(status)).observe(max(0.0, float(seconds)))
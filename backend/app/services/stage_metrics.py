@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:  # optional, more accurate on Windows/macOS
+    import psutil  # type: ignore
+except Exception:  # pragma: no cover
+    psutil = None  # type: ignore
+
+try:
+    import resource  # type: ignore
+except Exception:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    Resident set size of this process, or None when it cannot be determined.
+    """
+    if psutil is not None:
+        try:
+            return int(psutil.Process().memory_info().rss)
+        except Exception:
+            pass
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except Exception:
+        pass
+    if resource is not None:
+        try:
+            # ru_maxrss is the lifetime peak: KiB on Linux, bytes on macOS.
+            peak = int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+            return peak if os.uname().sysname == "Darwin" else peak * 1024
+        except Exception:
+            pass
+    return None
+
+
+class StageMeter:
+    """
+    Measure one pipeline stage: wall time, CPU time and peak RSS while the stage runs.
+
+    CPU is reported twice: `cpu_seconds` is the worker thread's own CPU time, `process_cpu_seconds`
+    is the whole process delta (includes native threads such as CTranslate2, but also other jobs).
+    Peak RSS is sampled by a background thread, so it is process-wide.
+    """
+
+    def __init__(self, stage: str, *, sample_interval: float = 0.2) -> None:
+        self.stage = stage
+        self._sample_interval = max(0.05, float(sample_interval))
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._peak_rss: Optional[int] = None
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+        self._proc_cpu_start = 0.0
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.process_cpu_seconds = 0.0
+
+    def _sample(self) -> None:
+        rss = current_rss_bytes()
+        if rss is not None and (self._peak_rss is None or rss > self._peak_rss):
+            self._peak_rss = rss
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self._sample_interval):
+            self._sample()
+
+    def __enter__(self) -> "StageMeter":
+        self._sample()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        self._proc_cpu_start = time.process_time()
+        self._sampler = threading.Thread(target=self._sample_loop, name=f"meter-{self.stage}", daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.wall_seconds = time.perf_counter() - self._wall_start
+        self.cpu_seconds = time.thread_time() - self._cpu_start
+        self.process_cpu_seconds = time.process_time() - self._proc_cpu_start
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join(timeout=1)
+        self._sample()
+
+    def result(self, **counters: Any) -> dict[str, Any]:
+        """
+        Timing/resource numbers merged with stage specific counters (bytes, audio seconds, tokens...).
+        """
+        data: dict[str, Any] = {
+            "stage": self.stage,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "cpu_seconds": round(self.cpu_seconds, 3),
+            "process_cpu_seconds": round(self.process_cpu_seconds, 3),
+            "peak_rss_bytes": self._peak_rss,
+            # Average busy cores of the whole process during the stage (process CPU / wall).
+            "cores_used": round(self.process_cpu_seconds / self.wall_seconds, 2) if self.wall_seconds > 0 else None,
+        }
+        data.update({k: v for k, v in counters.items() if v is not None})
+
+        audio_seconds = data.get("audio_seconds")
+        if (
+            self.stage == "transcribe"
+            and not data.get("cached")
+            and isinstance(audio_seconds, (int, float))
+            and audio_seconds > 0
+        ):
+            # Real-time factor: processing seconds per second of audio (< 1 means faster than real time).
+            data["rtf"] = round(self.wall_seconds / float(audio_seconds), 4)
+        return data
+
+
+def file_size(path: Any) -> int:
+    try:
+        return os.path.getsize(str(path)) if path else 0
+    except OSError:
+        return 0
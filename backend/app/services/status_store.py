@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from app.utils.logger import get_logger
+from app.utils.paths import note_output_dir
+
+logger = get_logger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        logger.warning(f"Invalid {name}={raw!r}, fallback to {default}")
+        return default
+
+
+class TaskStatusStore:
+    """
+    Authoritative in-process copy of every task's {task_id}.status.json.
+
+    Reads are served from memory (loaded from disk on first access). Writes update memory right away
+    and are persisted by a background flusher after `debounce_seconds`, so a burst of progress
+    callbacks becomes a single file write. Callers pass `flush=True` at stage boundaries (status
+    transitions, final results) to write through immediately.
+    """
+
+    def __init__(
+        self,
+        path_for: Callable[[str], Path],
+        *,
+        debounce_seconds: float = 1.0,
+        max_cached: int = 2000,
+    ) -> None:
+        self._path_for = path_for
+        self._debounce = max(0.0, float(debounce_seconds))
+        self._max_cached = max(1, int(max_cached))
+        self._cond = threading.Condition()
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._dirty: dict[str, float] = {}  # task_id -> flush deadline (monotonic)
+        self._write_locks: dict[str, threading.Lock] = {}
+        self._flusher: Optional[threading.Thread] = None
+
+    # ---------------- public API ----------------
+
+    def get(self, task_id: str) -> Optional[dict[str, Any]]:
+        """
+        Copy of the task's status, or None when the task has no status yet.
+        """
+        tid = (task_id or "").strip()
+        if not tid:
+            return None
+        with self._cond:
+            entry = self._entries.get(tid)
+            if entry is not None:
+                self._entries.move_to_end(tid)
+                return dict(entry)
+
+        loaded = self._load(tid)
+        if loaded is None:
+            return None
+        with self._cond:
+            # Another thread may have written meanwhile; memory wins.
+            entry = self._entries.setdefault(tid, loaded)
+            self._entries.move_to_end(tid)
+            self._evict_locked()
+            return dict(entry)
+
+    def update(
+        self,
+        task_id: str,
+        patch: dict[str, Any],
+        *,
+        flush: bool = False,
+        flush_on_change: tuple[str, ...] = (),
+        drop: tuple[str, ...] = (),
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """
+        Merge `patch` (and remove `drop` keys); return (previous, current) copies.
+
+        The write goes through to disk when `flush` is set or any `flush_on_change` key changes value;
+        the comparison is made under the same lock as the write, so concurrent updates agree on it.
+        """
+        tid = (task_id or "").strip()
+        if not tid:
+            raise ValueError("Missing task_id")
+
+        loaded = self.get(tid) or {}  # warm the cache outside the lock (may read the file)
+        with self._cond:
+            previous = dict(self._entries.get(tid) or loaded)
+            current = dict(previous)
+            current.update(patch)
+            for key in drop:
+                current.pop(key, None)
+            flush = flush or any(previous.get(key) != current.get(key) for key in flush_on_change)
+            self._entries[tid] = current
+            self._entries.move_to_end(tid)
+            snapshot = dict(current)
+            if not flush:
+                self._dirty.setdefault(tid, time.monotonic() + self._debounce)
+                self._ensure_flusher()
+                self._cond.notify_all()
+
+        if flush:
+            self.flush(tid)
+        return previous, snapshot
+
+    def flush(self, task_id: Optional[str] = None) -> None:
+        """
+        Write one task (or every dirty task when task_id is None) to disk now.
+        """
+        if task_id is None:
+            with self._cond:
+                pending = list(self._dirty.keys())
+            for tid in pending:
+                self.flush(tid)
+            return
+
+        tid = task_id.strip()
+        with self._cond:
+            self._dirty.pop(tid, None)
+            lock = self._write_locks.setdefault(tid, threading.Lock())
+
+        with lock:
+            with self._cond:
+                entry = self._entries.get(tid)
+                data = dict(entry) if entry is not None else None
+            if data is not None:
+                self._write(tid, data)
+
+        with self._cond:
+            self._evict_locked()
+
+    def evict(self, task_id: str) -> None:
+        """
+        Forget a task without writing it (used when its files are being deleted).
+        """
+        tid = (task_id or "").strip()
+        with self._cond:
+            self._entries.pop(tid, None)
+            self._dirty.pop(tid, None)
+            self._write_locks.pop(tid, None)
+
+    # ---------------- internals ----------------
+
+    def _load(self, task_id: str) -> Optional[dict[str, Any]]:
+        path = self._path_for(task_id)
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception as exc:
+            logger.warning(f"读取状态文件失败 (task_id={task_id})：{exc}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, task_id: str, data: dict[str, Any]) -> None:
+        path = self._path_for(task_id)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+            tmp.replace(path)
+        except Exception as exc:
+            logger.error(f"写入状态文件失败 (task_id={task_id})：{exc}")
+
+    def _evict_locked(self) -> None:
+        # Only clean entries can be dropped; dirty ones must reach disk first.
+        while len(self._entries) > self._max_cached:
+            victim = next((tid for tid in self._entries if tid not in self._dirty), None)
+            if victim is None:
+                return
+            self._entries.pop(victim, None)
+            self._write_locks.pop(victim, None)
+
+    def _ensure_flusher(self) -> None:
+        # Called with the condition held.
+        if self._flusher is not None:
+            return
+        self._flusher = threading.Thread(target=self._flush_loop, name="status-flusher", daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._dirty:
+                    self._cond.wait()
+                now = time.monotonic()
+                due = [tid for tid, deadline in self._dirty.items() if deadline <= now]
+                if not due:
+                    self._cond.wait(timeout=max(0.01, min(self._dirty.values()) - now))
+                    continue
+            for tid in due:
+                self.flush(tid)
+
+
+def _status_path(task_id: str) -> Path:
+    return note_output_dir() / task_id / f"{task_id}.status.json"
+
+
+status_store = TaskStatusStore(
+    _status_path,
+    debounce_seconds=_env_float("NOTE_STATUS_FLUSH_INTERVAL", 1.0),
+)
+atexit.register(status_store.flush)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Callable, Optional
+
+from app.gpt.base import GPT
+from app.models.gpt_model import GPTSource
+from app.models.transcriber_model import TranscriptSegment
+from app.services.disk_cache import DiskLRUCache, canonical_key
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# LLM results are reused for identical prompts; TTL bounds how long a model's old answer is served.
+summary_cache = DiskLRUCache.from_env(
+    "summary",
+    "SUMMARY_CACHE",
+    default_max_mb=512,
+    default_ttl_seconds=7 * 24 * 3600,
+)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _hash_images(value: Any) -> Any:
+    # Grid images are inlined as base64 data URLs; hash them so the key stays small.
+    if isinstance(value, dict):
+        if value.get("type") == "image_url":
+            url = str((value.get("image_url") or {}).get("url") or "")
+            return {"type": "image_url", "sha256": _sha256(url)}
+        return {k: _hash_images(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_hash_images(v) for v in value]
+    return value
+
+
+def _prompt_fingerprint(gpt: GPT, source: GPTSource) -> Any:
+    segments = [TranscriptSegment(**seg) if isinstance(seg, dict) else seg for seg in source.segment or []]
+    try:
+        messages = gpt.create_messages(
+            segments,
+            title=source.title,
+            tags=source.tags,
+            video_img_urls=source.video_img_urls or [],
+            _format=source._format,
+            style=source.style,
+            extras=source.extras,
+        )
+    except Exception:
+        messages = None
+    if messages:
+        return _hash_images(messages)
+    # GPT implementations without create_messages: fall back to the raw prompt inputs.
+    return {
+        "segments": [[seg.start, seg.end, seg.text] for seg in segments],
+        "title": source.title,
+        "tags": source.tags,
+        "format": list(source._format or []),
+        "style": source.style,
+        "extras": source.extras,
+        "images": [_sha256(str(url)) for url in source.video_img_urls or []],
+    }
+
+
+def summary_cache_key(gpt: GPT, source: GPTSource, *, provider_id: Optional[str], model_name: Optional[str]) -> str:
+    return canonical_key(
+        "summary",
+        provider_id,
+        model_name or getattr(gpt, "model", None),
+        bool(source.screenshot),
+        bool(source.link),
+        _sha256(canonical_key(_prompt_fingerprint(gpt, source))),
+        gpt.cache_identity(),
+    )
+
+
+def cached_summary(
+    summarize: Callable[[], str],
+    *,
+    gpt: GPT,
+    source: GPTSource,
+    provider_id: Optional[str],
+    model_name: Optional[str],
+    bypass: bool = False,
+) -> tuple[str, bool]:
+    """
+    Return (markdown, cache_hit). With `bypass` the LLM is always called and the fresh result replaces the entry.
+    """
+    try:
+        key = summary_cache_key(gpt, source, provider_id=provider_id, model_name=model_name)
+    except Exception as exc:
+        logger.warning(f"计算总结缓存键失败，跳过缓存：{exc}")
+        return summarize(), False
+
+    with summary_cache.key_lock(key):
+        if not bypass:
+            entry = summary_cache.get(key)
+            if entry is not None:
+                try:
+                    markdown = str(summary_cache.read_data(entry)["markdown"])
+                    logger.info("总结缓存命中，跳过 LLM 调用")
+                    return markdown, True
+                except Exception as exc:
+                    logger.warning(f"总结缓存条目损坏，重新总结：{exc}")
+                    summary_cache.invalidate(key)
+
+        markdown = summarize()
+        if markdown and markdown.strip():
+            try:
+                summary_cache.put(
+                    key,
+                    data={"markdown": markdown},
+                    meta={"provider_id": provider_id, "model_name": model_name},
+                )
+            except Exception as exc:
+                logger.warning(f"写入总结缓存失败（不影响本次任务）：{exc}")
+        return markdown, False
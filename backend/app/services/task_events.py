@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Iterable, Optional
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Status fields pushed to clients; anything else (results, transcripts, Dify payloads) stays pull-only.
+DELTA_FIELDS = ("status", "progress", "message", "transcribed_seconds", "total_seconds")
+
+
+class TaskSubscription:
+    """
+    One streaming client. Deltas published from worker threads are coalesced per task until the
+    client's event loop drains them, so a slow client never builds an unbounded backlog.
+    """
+
+    def __init__(self, task_ids: Optional[Iterable[str]], loop: asyncio.AbstractEventLoop) -> None:
+        ids = {str(t).strip() for t in (task_ids or []) if str(t).strip()}
+        self.task_ids: Optional[set[str]] = ids or None  # None = all tasks
+        self._loop = loop
+        self._lock = threading.Lock()
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._ready = asyncio.Event()
+
+    def wants(self, task_id: str) -> bool:
+        return self.task_ids is None or task_id in self.task_ids
+
+    def push(self, task_id: str, delta: dict[str, Any]) -> None:
+        with self._lock:
+            self._pending.setdefault(task_id, {}).update(delta)
+        try:
+            self._loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:
+            # Event loop already closed: the client is gone, unsubscribe will follow.
+            pass
+
+    async def next_batch(self, timeout: float) -> dict[str, dict[str, Any]]:
+        """
+        Wait up to `timeout` seconds and return {task_id: merged delta}; empty on timeout.
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return {}
+        self._ready.clear()
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        return batch
+
+
+class TaskEventBroker:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscriptions: set[TaskSubscription] = set()
+
+    def subscribe(self, task_ids: Optional[Iterable[str]], loop: asyncio.AbstractEventLoop) -> TaskSubscription:
+        sub = TaskSubscription(task_ids, loop)
+        with self._lock:
+            self._subscriptions.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: TaskSubscription) -> None:
+        with self._lock:
+            self._subscriptions.discard(sub)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscriptions)
+
+    def publish(self, task_id: str, delta: dict[str, Any]) -> None:
+        if not task_id or not delta:
+            return
+        with self._lock:
+            targets = [sub for sub in self._subscriptions if sub.wants(task_id)]
+        for sub in targets:
+            try:
+                sub.push(task_id, delta)
+            except Exception as exc:
+                logger.warning(f"Push task event failed (task_id={task_id}): {exc}")
+
+
+def status_delta(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
+    """
+    Changed DELTA_FIELDS between two status payloads (removed fields are sent as None).
+    """
+    delta: dict[str, Any] = {}
+    for key in DELTA_FIELDS:
+        if previous.get(key) != current.get(key):
+            delta[key] = current.get(key)
+    return delta
+
+
+task_event_broker = TaskEventBroker()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Callable, Optional
+
+from app.models.transcriber_model import TranscriptResult, TranscriptSegment
+from app.services.disk_cache import DiskLRUCache, canonical_key
+from app.transcriber.base import Transcriber
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Global transcript store: any task whose audio bytes and transcriber settings match reuses the result.
+transcript_cache = DiskLRUCache.from_env("transcript", "TRANSCRIPT_CACHE", default_max_mb=2048)
+
+_HASH_CHUNK = 1024 * 1024
+_hash_memo: "OrderedDict[tuple, str]" = OrderedDict()
+_hash_memo_lock = threading.Lock()
+_HASH_MEMO_SIZE = 256
+
+
+def audio_sha256(path: str) -> str:
+    """
+    Content hash of an audio file, memoized by (path, size, mtime) so each file is read at most once.
+    """
+    st = os.stat(path)
+    memo_key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    with _hash_memo_lock:
+        cached = _hash_memo.get(memo_key)
+        if cached is not None:
+            _hash_memo.move_to_end(memo_key)
+            return cached
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+
+    with _hash_memo_lock:
+        _hash_memo[memo_key] = digest
+        while len(_hash_memo) > _HASH_MEMO_SIZE:
+            _hash_memo.popitem(last=False)
+    return digest
+
+
+def transcript_cache_key(audio_hash: str, transcriber: Transcriber) -> str:
+    # The whole identity is keyed: any setting a transcriber reports (chunking, VAD ...) changes segmentation.
+    return canonical_key("transcript", audio_hash, transcriber.cache_identity() or {})
+
+
+def _to_payload(transcript: TranscriptResult) -> dict:
+    # `raw` holds engine-specific objects and is only useful for debugging the original run.
+    return {
+        "language": transcript.language,
+        "full_text": transcript.full_text,
+        "segments": [asdict(seg) for seg in transcript.segments or []],
+    }
+
+
+def _from_payload(data: dict) -> TranscriptResult:
+    return TranscriptResult(
+        language=data.get("language"),
+        full_text=data.get("full_text") or "",
+        segments=[TranscriptSegment(**seg) for seg in data.get("segments") or []],
+    )
+
+
+def cached_transcript(
+    transcribe: Callable[[], TranscriptResult],
+    *,
+    audio_file: str,
+    transcriber: Transcriber,
+    source_file: Optional[str] = None,
+) -> tuple[TranscriptResult, bool]:
+    """
+    Return (transcript, cache_hit) for the audio content + transcriber configuration.
+
+    `source_file` is the original download when `audio_file` was converted for the transcriber; the key is
+    its hash, so the same media hits the cache whatever conversion path produced the transcriber input.
+    Concurrent tasks with the same audio wait for the first transcription instead of running their own.
+    """
+    try:
+        key = transcript_cache_key(audio_sha256(source_file or audio_file), transcriber)
+    except Exception as exc:
+        logger.warning(f"计算转写缓存键失败，跳过全局缓存：{exc}")
+        return transcribe(), False
+
+    with transcript_cache.key_lock(key):
+        entry = transcript_cache.get(key)
+        if entry is not None:
+            try:
+                transcript = _from_payload(transcript_cache.read_data(entry))
+                logger.info(f"全局转写缓存命中 ({os.path.basename(audio_file)})")
+                return transcript, True
+            except Exception as exc:
+                logger.warning(f"转写缓存条目损坏，重新转写：{exc}")
+                transcript_cache.invalidate(key)
+
+        transcript = transcribe()
+        try:
+            transcript_cache.put(key, data=_to_payload(transcript), meta={"identity": transcriber.cache_identity()})
+        except Exception as exc:
+            logger.warning(f"写入转写缓存失败（不影响本次任务）：{exc}")
+        return transcript, False
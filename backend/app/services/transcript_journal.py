@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import List, Optional
+
+from app.models.transcriber_model import TranscriptSegment
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TranscriptJournal:
+    """
+    任务级转写日志（JSONL）：转写过程中每产出一个分段就追加一行，进程崩溃或任务取消后，
+    重试时可从最后一个已落盘分段的结束时间继续转写，再与日志中的分段合并。
+
+    首行为头信息（音频指纹 + 转写器配置），与本次转写不一致时日志作废重来。
+    """
+
+    def __init__(self, path: Path, fingerprint: dict):
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.language: Optional[str] = None
+        self.segments: List[TranscriptSegment] = []
+        self._fh = None
+        self._load()
+
+    @property
+    def resume_from(self) -> float:
+        return float(self.segments[-1].end) if self.segments else 0.0
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        valid_bytes = 0
+        header_ok = False
+        try:
+            with self.path.open("rb") as fh:
+                for raw in fh:
+                    if not raw.endswith(b"\n"):
+                        break  # 崩溃时写了一半的行
+                    try:
+                        record = json.loads(raw.decode("utf-8"))
+                    except Exception:
+                        break
+                    if not header_ok:
+                        if record.get("type") != "header" or record.get("fingerprint") != self.fingerprint:
+                            logger.info(f"转写日志与当前音频/转写器不匹配，重新开始：{self.path}")
+                            self.discard()
+                            return
+                        header_ok = True
+                    elif record.get("type") == "language":
+                        self.language = record.get("language")
+                    else:
+                        self.segments.append(
+                            TranscriptSegment(start=float(record["start"]), end=float(record["end"]), text=record["text"])
+                        )
+                    valid_bytes += len(raw)
+        except Exception as exc:
+            logger.warning(f"读取转写日志失败，重新开始：{exc}")
+            self.discard()
+            return
+
+        if not header_ok:
+            self.discard()
+            return
+        if valid_bytes < self.path.stat().st_size:
+            # 截掉损坏的尾部，保证后续追加的行从完整行之后开始
+            with self.path.open("r+b") as fh:
+                fh.truncate(valid_bytes)
+        if self.segments:
+            logger.info(f"发现转写日志：已完成 {len(self.segments)} 段，将从 {self.resume_from:.1f}s 继续")
+
+    def _write(self, record: dict) -> None:
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fresh = not self.path.exists()
+            self._fh = self.path.open("a", encoding="utf-8")
+            if fresh:
+                self._fh.write(json.dumps({"type": "header", "fingerprint": self.fingerprint}, ensure_ascii=False) + "\n")
+        self._fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._fh.flush()
+
+    def set_language(self, language: Optional[str]) -> None:
+        if language and not self.language:
+            self.language = language
+            self._write({"type": "language", "language": language})
+
+    def append(self, segment: TranscriptSegment) -> None:
+        self.segments.append(segment)
+        self._write({"start": segment.start, "end": segment.end, "text": segment.text})
+
+    def close(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            finally:
+                self._fh = None
+
+    def discard(self) -> None:
+        """
+        转写结果已完整写入 _transcript.json 后删除日志（或日志无效时清空）。
+        """
+        self.close()
+        self.segments = []
+        self.language = None
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -5,6 +5,11 @@ from app.models.transcriber_model import TranscriptResult
 
 
 class Transcriber(ABC):
+    # 是否支持 transcript(..., journal=TranscriptJournal)：逐段落盘，中断后可从断点续传
+    supports_journal: bool = False
+    # 只接受某种音频格式时填扩展名（如 "mp3"），流水线会在转写前转换；None 表示任何 ffmpeg 可解码的音频都可以
+    required_audio_format: str | None = None
+
     @abstractmethod
     def transcript(
         self,
@@ -21,6 +26,13 @@ class Transcriber(ABC):
         '''
         pass
 
+    def cache_identity(self) -> dict:
+        '''
+        影响转写结果的配置（类型、模型、精度、语言），用作全局转写缓存键的一部分
+        :return: 可 JSON 序列化的字典
+        '''
+        return {"type": type(self).__name__, "model": None, "compute_type": None, "language": "auto"}
+
     def on_finish(self,video_path:str,result: TranscriptResult)->None:
         '''
         当音频转录完成时调用
@@ -1,9 +1,12 @@
 import json
 import logging
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Optional, List, Dict, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from app.decorators.timeit import timeit
 from app.models.transcriber_model import TranscriptSegment, TranscriptResult
@@ -14,7 +17,7 @@ from events import transcription_finished
 
 __version__ = "0.0.3"
 
-API_BASE_URL = "https://member.bilibili.com/x/bcut/rubick-interface"
+API_BASE_URL = (os.getenv("BCUT_API_BASE_URL") or "https://member.bilibili.com/x/bcut/rubick-interface").rstrip("/")
 
 # 申请上传
 API_REQ_UPLOAD = API_BASE_URL + "/resource/create"
@@ -30,6 +33,16 @@ API_QUERY_RESULT = API_BASE_URL + "/task/result"
 
 logger = get_logger(__name__)
 
+# 同时上传的分片数
+BCUT_UPLOAD_CONCURRENCY = max(1, int(os.getenv("BCUT_UPLOAD_CONCURRENCY", "4") or 4))
+# 单个分片上传失败时的重试次数
+BCUT_UPLOAD_RETRIES = max(0, int(os.getenv("BCUT_UPLOAD_RETRIES", "2") or 0))
+# 等待识别结果的最长时间（秒）；轮询间隔从 0.5s 起按 1.5 倍递增，最长 10s
+BCUT_POLL_TIMEOUT_SECONDS = float(os.getenv("BCUT_POLL_TIMEOUT_SECONDS", "1800") or 1800)
+_POLL_INITIAL_INTERVAL = 0.5
+_POLL_MAX_INTERVAL = 10.0
+_POLL_BACKOFF = 1.5
+
 class BcutTranscriber(Transcriber):
     """必剪 语音识别接口"""
     headers = {
@@ -37,37 +50,29 @@ class BcutTranscriber(Transcriber):
         'Content-Type': 'application/json'
     }
 
+    # 上传接口按 mp3 申请资源
+    required_audio_format = "mp3"
+
+    def cache_identity(self) -> dict:
+        return {"type": "bcut", "model": None, "compute_type": None, "language": "auto"}
+
     def __init__(self):
+        # 单例会被多个任务并发使用：会话（连接池）共享，上传/任务状态都只放在局部变量里
         self.session = requests.Session()
-        self.task_id = None
-        self.__etags = []
-
-        self.__in_boss_key: Optional[str] = None
-        self.__resource_id: Optional[str] = None
-        self.__upload_id: Optional[str] = None
-        self.__upload_urls: List[str] = []
-        self.__per_size: Optional[int] = None
-        self.__clips: Optional[int] = None
-
-        self.__etags: List[str] = []
-        self.__download_url: Optional[str] = None
-        self.task_id: Optional[str] = None
-        
-    def _load_file(self, file_path: str) -> bytes:
-        """读取文件内容"""
-        with open(file_path, 'rb') as f:
-            return f.read()
-
-    def _upload(self, file_path: str) -> None:
-        """申请上传"""
-        file_binary = self._load_file(file_path)
-        if not file_binary:
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=BCUT_UPLOAD_CONCURRENCY * 4)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _upload(self, file_path: str) -> str:
+        """申请上传、并发上传分片并提交，返回资源下载链接"""
+        size = os.path.getsize(file_path)
+        if not size:
             raise ValueError("无法读取文件数据")
-            
+
         payload = json.dumps({
             "type": 2,
             "name": "audio.mp3",
-            "size": len(file_binary),
+            "size": size,
             "ResourceFileType": "mp3",
             "model_id": "8",
         })
@@ -81,42 +86,52 @@ class BcutTranscriber(Transcriber):
         resp = resp.json()
         resp_data = resp["data"]
 
-        self.__in_boss_key = resp_data["in_boss_key"]
-        self.__resource_id = resp_data["resource_id"]
-        self.__upload_id = resp_data["upload_id"]
-        self.__upload_urls = resp_data["upload_urls"]
-        self.__per_size = resp_data["per_size"]
-        self.__clips = len(resp_data["upload_urls"])
-
+        upload_urls = resp_data["upload_urls"]
+        per_size = resp_data["per_size"]
         logger.info(
-            f"申请上传成功, 总计大小{resp_data['size'] // 1024}KB, {self.__clips}分片, 分片大小{resp_data['per_size'] // 1024}KB: {self.__in_boss_key}"
+            f"申请上传成功, 总计大小{resp_data['size'] // 1024}KB, {len(upload_urls)}分片, 分片大小{per_size // 1024}KB: {resp_data['in_boss_key']}"
         )
-        self.__upload_part(file_binary)
-        self.__commit_upload()
-
-    def __upload_part(self, file_binary: bytes) -> None:
-        """上传音频数据"""
-        for clip in range(self.__clips):
-            start_range = clip * self.__per_size
-            end_range = min((clip + 1) * self.__per_size, len(file_binary))
-            logger.info(f"开始上传分片{clip}: {start_range}-{end_range}")
-            resp = self.session.put(
-                self.__upload_urls[clip],
-                data=file_binary[start_range:end_range],
-                headers={'Content-Type': 'application/octet-stream'}
-            )
-            resp.raise_for_status()
+        etags = self._upload_parts(file_path, size, upload_urls, per_size)
+        return self._commit_upload(resp_data, etags)
+
+    def _upload_parts(self, file_path: str, size: int, upload_urls: List[str], per_size: int) -> List[str]:
+        """并发上传分片，每个分片上传时才从磁盘读取对应区间；返回按分片顺序排列的 etag"""
+
+        def _put(clip: int) -> str:
+            start_range = clip * per_size
+            end_range = min((clip + 1) * per_size, size)
+            with open(file_path, "rb") as f:
+                f.seek(start_range)
+                data = f.read(end_range - start_range)
+            for attempt in range(BCUT_UPLOAD_RETRIES + 1):
+                try:
+                    resp = self.session.put(
+                        upload_urls[clip],
+                        data=data,
+                        headers={'Content-Type': 'application/octet-stream'}
+                    )
+                    resp.raise_for_status()
+                    break
+                except requests.RequestException as e:
+                    if attempt >= BCUT_UPLOAD_RETRIES:
+                        raise
+                    logger.warning(f"分片{clip}上传失败，重试({attempt + 1}/{BCUT_UPLOAD_RETRIES}): {e}")
+                    time.sleep(2 ** attempt)
             etag = resp.headers.get("Etag", "").strip('"')
-            self.__etags.append(etag)
-            logger.info(f"分片{clip}上传成功: {etag}")
+            logger.info(f"分片{clip}上传成功: {start_range}-{end_range} {etag}")
+            return etag
 
-    def __commit_upload(self) -> None:
+        workers = min(BCUT_UPLOAD_CONCURRENCY, len(upload_urls)) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcut-upload") as pool:
+            return list(pool.map(_put, range(len(upload_urls))))
+
+    def _commit_upload(self, upload: dict, etags: List[str]) -> str:
         """提交上传数据"""
         data = json.dumps({
-            "InBossKey": self.__in_boss_key,
-            "ResourceId": self.__resource_id,
-            "Etags": ",".join(self.__etags),
-            "UploadId": self.__upload_id,
+            "InBossKey": upload["in_boss_key"],
+            "ResourceId": upload["resource_id"],
+            "Etags": ",".join(etags),
+            "UploadId": upload["upload_id"],
             "model_id": "8",
         })
         resp = self.session.post(
@@ -126,19 +141,19 @@ class BcutTranscriber(Transcriber):
         )
         resp.raise_for_status()
         resp = resp.json()
-        print('Bili',resp)
         if resp.get("code") != 0:
             error_msg = f"上传提交失败: {resp.get('message', '未知错误')}"
             logger.error(error_msg)
             raise Exception(error_msg)
-            
-        self.__download_url = resp["data"]["download_url"]
-        logger.info(f"提交成功，下载链接: {self.__download_url}")
 
-    def _create_task(self) -> str:
+        download_url = resp["data"]["download_url"]
+        logger.info(f"提交成功，下载链接: {download_url}")
+        return download_url
+
+    def _create_task(self, download_url: str) -> str:
         """开始创建转换任务"""
         resp = self.session.post(
-            API_CREATE_TASK, json={"resource": self.__download_url, "model_id": "8"}, headers=self.headers
+            API_CREATE_TASK, json={"resource": download_url, "model_id": "8"}, headers=self.headers
         )
         resp.raise_for_status()
         resp = resp.json()
@@ -146,16 +161,16 @@ class BcutTranscriber(Transcriber):
             error_msg = f"创建任务失败: {resp.get('message', '未知错误')}"
             logger.error(error_msg)
             raise Exception(error_msg)
-            
-        self.task_id = resp["data"]["task_id"]
-        logger.info(f"任务已创建: {self.task_id}")
-        return self.task_id
 
-    def _query_result(self) -> dict:
+        task_id = resp["data"]["task_id"]
+        logger.info(f"任务已创建: {task_id}")
+        return task_id
+
+    def _query_result(self, task_id: str) -> dict:
         """查询转换结果"""
         resp = self.session.get(
-            API_QUERY_RESULT, 
-            params={"model_id": 7, "task_id": self.task_id}, 
+            API_QUERY_RESULT,
+            params={"model_id": 7, "task_id": task_id},
             headers=self.headers
         )
         resp.raise_for_status()
@@ -164,9 +179,43 @@ class BcutTranscriber(Transcriber):
             error_msg = f"查询结果失败: {resp.get('message', '未知错误')}"
             logger.error(error_msg)
             raise Exception(error_msg)
-            
+
         return resp["data"]
 
+    def _wait_result(self, task_id: str, should_cancel: Callable[[], bool] | None = None) -> dict:
+        """轮询任务状态：间隔指数递增（有上限），超过 BCUT_POLL_TIMEOUT_SECONDS 仍未完成则报错"""
+        deadline = time.monotonic() + BCUT_POLL_TIMEOUT_SECONDS
+        interval = _POLL_INITIAL_INTERVAL
+        polls = 0
+        while True:
+            if should_cancel and should_cancel():
+                raise TaskCancelledError("Task cancelled")
+
+            task_resp = self._query_result(task_id)
+            polls += 1
+            if task_resp["state"] == 4:  # 完成状态
+                return task_resp
+            if task_resp["state"] == 3:  # 失败状态
+                error_msg = f"B站ASR任务失败，状态码: {task_resp['state']}"
+                logger.error(error_msg)
+                raise Exception(error_msg)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                error_msg = f"B站ASR任务未能在 {BCUT_POLL_TIMEOUT_SECONDS:.0f}s 内完成，状态: {task_resp.get('state')}"
+                logger.error(error_msg)
+                raise Exception(error_msg)
+            if polls % 10 == 0:
+                logger.info(f"转录进行中... 已查询 {polls} 次，剩余等待 {remaining:.0f}s")
+
+            # 分小段睡眠，便于及时响应取消
+            wake_at = time.monotonic() + min(interval, remaining)
+            while time.monotonic() < wake_at:
+                if should_cancel and should_cancel():
+                    raise TaskCancelledError("Task cancelled")
+                time.sleep(min(0.5, max(0.0, wake_at - time.monotonic())))
+            interval = min(interval * _POLL_BACKOFF, _POLL_MAX_INTERVAL)
+
     @timeit
     def transcript(
         self,
@@ -182,43 +231,19 @@ class BcutTranscriber(Transcriber):
 
             if should_cancel and should_cancel():
                 raise TaskCancelledError("Task cancelled")
-            
+
             # 上传文件
             logger.info("正在上传文件...")
-            self._upload(file_path)
-            
+            download_url = self._upload(file_path)
+
             # 创建任务
             logger.info("提交转录任务...")
-            self._create_task()
-            
+            task_id = self._create_task(download_url)
+
             # 轮询检查任务状态
             logger.info("等待转录结果...")
-            task_resp = None
-            max_retries = 500
-            for i in range(max_retries):
-                if should_cancel and should_cancel():
-                    raise TaskCancelledError("Task cancelled")
+            task_resp = self._wait_result(task_id, should_cancel)
 
-                task_resp = self._query_result()
-                
-                if task_resp["state"] == 4:  # 完成状态
-                    break
-                elif task_resp["state"] == 3:  # 失败状态
-                    error_msg = f"B站ASR任务失败，状态码: {task_resp['state']}"
-                    logger.error(error_msg)
-                    raise Exception(error_msg)
-                    
-                # 每隔一段时间打印进度
-                if i % 10 == 0:
-                    logger.info(f"转录进行中... {i}/{max_retries}")
-                    
-                time.sleep(1)
-                
-            if not task_resp or task_resp["state"] != 4:
-                error_msg = f"B站ASR任务未能完成，状态: {task_resp.get('state') if task_resp else 'Unknown'}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
-                
             # 解析结果
             logger.info("转录成功，处理结果...")
             result_json = json.loads(task_resp["result"])
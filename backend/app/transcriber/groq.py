@@ -1,27 +1,185 @@
 from abc import ABC
 import os
-from typing import Callable, Optional
+import shutil
+import subprocess
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, List, Optional, Tuple
 
 from app.decorators.timeit import timeit
 from app.models.transcriber_model import TranscriptResult, TranscriptSegment
+from app.services.pcm_cache import PCM_SAMPLE_RATE, open_pcm, pcm_lease
 from app.services.provider import ProviderService
 from app.services.task_manager import TaskCancelledError
 from app.transcriber.base import Transcriber
+from app.utils.audio_chunker import AudioChunk, detect_silences, detect_silences_pcm, plan_chunks
+from app.utils.logger import get_logger
 from openai import OpenAI
 import ffmpeg
 import tempfile
 from dotenv import load_dotenv
 load_dotenv()
+
+logger = get_logger(__name__)
+
 MAX_SIZE_MB = 18
 MAX_SIZE_BYTES = MAX_SIZE_MB * 1024 * 1024
+# 超过大小上限的音频按静音切块（流复制，不重新编码）并发提交；单块时长上限（秒）
+GROQ_CHUNK_MAX_SECONDS = float(os.getenv("GROQ_CHUNK_MAX_SECONDS", "600") or 600)
+# 相邻块重叠（秒），合并时按分段中点去重
+GROQ_CHUNK_OVERLAP_SECONDS = float(os.getenv("GROQ_CHUNK_OVERLAP_SECONDS", "1.0") or 0)
+# 每个供应商（按 base_url 区分）同时进行的转写请求上限，跨任务共享
+GROQ_CONCURRENCY = max(1, int(os.getenv("GROQ_CONCURRENCY", "4") or 1))
+
+_provider_slots: dict[str, threading.BoundedSemaphore] = {}
+_provider_slots_lock = threading.Lock()
+
+
+def _provider_slot(key: str) -> threading.BoundedSemaphore:
+    with _provider_slots_lock:
+        slot = _provider_slots.get(key)
+        if slot is None:
+            slot = threading.BoundedSemaphore(GROQ_CONCURRENCY)
+            _provider_slots[key] = slot
+        return slot
+
+
 def compress_audio(input_path: str, target_bitrate='64k') -> str:
     output_fd, output_path = tempfile.mkstemp(suffix=".mp3")  # 临时输出文件
     os.close(output_fd)  # 关闭文件描述符，ffmpeg 会用路径操作
     ffmpeg.input(input_path).output(output_path, audio_bitrate=target_bitrate).run(quiet=True, overwrite_output=True)
     return output_path
 
+
+def _probe_duration(path: str) -> Optional[float]:
+    try:
+        return float(ffmpeg.probe(path)["format"]["duration"])
+    except Exception:
+        return None
+
+
+def _cut_chunk(path: str, chunk: AudioChunk, output_dir: str) -> str:
+    """
+    流复制截取一块（保留原编码与音质）；容器不支持时退回 mka
+    """
+    ext = os.path.splitext(path)[1] or ".mka"
+    for suffix in (ext, ".mka"):
+        output_path = os.path.join(output_dir, f"chunk_{chunk.index:04d}{suffix}")
+        command = [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-ss", f"{chunk.start:.3f}",
+            "-t", f"{chunk.end - chunk.start:.3f}",
+            "-i", str(path),
+            "-vn", "-c:a", "copy",
+            "-y", output_path,
+        ]
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if result.returncode == 0 and os.path.getsize(output_path) > 0:
+            return output_path
+    raise RuntimeError(f"音频切块失败：{result.stderr.decode(errors='ignore')[-500:]}")
+
+
 class GroqTranscriber(Transcriber, ABC):
 
+    def cache_identity(self) -> dict:
+        return {"type": "groq", "model": os.getenv('GROQ_TRANSCRIBER_MODEL'), "compute_type": None, "language": "auto"}
+
+    def _client(self) -> OpenAI:
+        provider = ProviderService.get_provider_by_id('groq')
+        if not provider:
+            raise Exception("Groq 供应商未配置,请配置以后使用。")
+        return OpenAI(
+            api_key=provider.get('api_key'),
+            base_url=provider.get('base_url')
+        )
+
+    def _request(self, client: OpenAI, file_path: str):
+        with _provider_slot(str(client.base_url)):
+            with open(file_path, "rb") as file:
+                return client.audio.transcriptions.create(
+                    file=(os.path.basename(file_path), file),
+                    model=os.getenv('GROQ_TRANSCRIBER_MODEL'),
+                    response_format="verbose_json",
+                )
+
+    def _plan(self, file_path: str, file_size: int, duration: float) -> List[AudioChunk]:
+        # 按平均码率估算不超过大小上限的块长，留 10% 余量给 VBR 波动
+        bytes_per_second = file_size / duration
+        target = min(GROQ_CHUNK_MAX_SECONDS, MAX_SIZE_BYTES * 0.9 / bytes_per_second)
+        # plan_chunks 允许块长到目标的 1.25 倍，这里预先缩小
+        target = max(30.0, target / 1.25 - GROQ_CHUNK_OVERLAP_SECONDS)
+        with pcm_lease(file_path) as pcm_file:
+            if pcm_file:
+                silences = detect_silences_pcm(open_pcm(pcm_file), PCM_SAMPLE_RATE)
+            else:
+                silences = detect_silences(file_path)
+        return plan_chunks(duration, silences, target, GROQ_CHUNK_OVERLAP_SECONDS)
+
+    def _transcribe_chunk(self, client: OpenAI, file_path: str, chunk: AudioChunk, work_dir: str):
+        path = _cut_chunk(file_path, chunk, work_dir)
+        compressed = None
+        if os.path.getsize(path) > MAX_SIZE_BYTES:
+            # 码率波动导致仍超限时，仅对这一块压缩
+            logger.warning(f"分块 {chunk.index} 仍超过 {MAX_SIZE_MB}MB，压缩后提交")
+            path = compressed = compress_audio(path)
+        try:
+            transcription = self._request(client, path)
+        finally:
+            if compressed:
+                os.remove(compressed)
+        segments = []
+        for seg in transcription.segments:
+            start = float(seg.start) + chunk.start
+            end = float(seg.end) + chunk.start
+            # 重叠区去重：中点落在本块负责范围之前的分段已由上一块产出
+            if (start + end) / 2 < chunk.keep_from:
+                continue
+            text = seg.text.strip()
+            if text:
+                segments.append(TranscriptSegment(start=start, end=end, text=text))
+        return transcription, segments
+
+    def _transcript_chunked(
+        self,
+        client: OpenAI,
+        file_path: str,
+        chunks: List[AudioChunk],
+        on_progress: Optional[Callable[[float], None]],
+        should_cancel: Optional[Callable[[], bool]],
+    ) -> Tuple[Optional[str], List[TranscriptSegment], list]:
+        work_dir = tempfile.mkdtemp(prefix="groq_chunks_")
+        try:
+            with ThreadPoolExecutor(max_workers=GROQ_CONCURRENCY, thread_name_prefix="groq") as pool:
+                futures = {pool.submit(self._transcribe_chunk, client, file_path, c, work_dir): c for c in chunks}
+                pending = set(futures)
+                results = {}
+                done_seconds = 0.0
+                try:
+                    while pending:
+                        if should_cancel and should_cancel():
+                            raise TaskCancelledError("Task cancelled")
+                        done, pending = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+                        for fut in done:
+                            chunk = futures[fut]
+                            results[chunk.index] = fut.result()
+                            done_seconds += chunk.end - chunk.keep_from
+                            if on_progress:
+                                on_progress(done_seconds)
+                finally:
+                    for fut in pending:
+                        fut.cancel()
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        language = None
+        segments: List[TranscriptSegment] = []
+        raw = []
+        for index in sorted(results):
+            transcription, chunk_segments = results[index]
+            language = language or transcription.language
+            segments.extend(chunk_segments)
+            raw.append(transcription.to_dict())
+        return language, segments, raw
 
     @timeit
     def transcript(
@@ -35,34 +193,33 @@ class GroqTranscriber(Transcriber, ABC):
         if should_cancel and should_cancel():
             raise TaskCancelledError("Task cancelled")
 
+        client = self._client()
         file_size = os.path.getsize(file_path)
+        duration = total_duration or _probe_duration(file_path)
+
+        if file_size > MAX_SIZE_BYTES and duration:
+            chunks = self._plan(file_path, file_size, float(duration))
+            logger.info(
+                f"文件超过 {MAX_SIZE_MB}MB（当前 {round(file_size / (1024 * 1024), 2)}MB），"
+                f"切为 {len(chunks)} 块并发转写（并发上限 {GROQ_CONCURRENCY}）"
+            )
+            language, segments, raw = self._transcript_chunked(client, file_path, chunks, on_progress, should_cancel)
+            return TranscriptResult(
+                language=language,
+                full_text=" ".join(seg.text for seg in segments),
+                segments=segments,
+                raw={"chunks": raw},
+            )
+
         if file_size > MAX_SIZE_BYTES:
-            print(f"文件超过 {MAX_SIZE_MB}MB，开始压缩（当前 {round(file_size / (1024 * 1024), 2)}MB）...")
+            # 拿不到时长无法切块，退回整体压缩
+            logger.info(f"文件超过 {MAX_SIZE_MB}MB 且无法获取时长，开始压缩...")
             file_path = compress_audio(file_path)
-            print(f"压缩完成，临时路径：{file_path}")
 
         if should_cancel and should_cancel():
             raise TaskCancelledError("Task cancelled")
 
-        provider = ProviderService.get_provider_by_id('groq')
-
-
-        if not provider:
-            raise Exception("Groq 供应商未配置,请配置以后使用。")
-        client = OpenAI(
-            api_key=provider.get('api_key'),
-            base_url=provider.get('base_url')
-        )
-        filename = file_path
-
-        with open(filename, "rb") as file:
-            transcription = client.audio.transcriptions.create(
-                file=(filename, file.read()),
-                model=os.getenv('GROQ_TRANSCRIBER_MODEL'),
-                response_format="verbose_json",
-            )
-            print(transcription.text)
-        print(transcription)
+        transcription = self._request(client, file_path)
         segments = []
         full_text = ""
 
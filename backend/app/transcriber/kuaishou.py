@@ -14,9 +14,14 @@ logger = get_logger(__name__)
 
 class KuaishouTranscriber(Transcriber):
     """快手语音识别实现"""
+    # 以 audio/mpeg 提交
+    required_audio_format = "mp3"
     
     API_URL = "https://ai.kuaishou.com/api/effects/subtitle_generate"
     
+    def cache_identity(self) -> dict:
+        return {"type": "kuaishou", "model": None, "compute_type": None, "language": "auto"}
+
     def __init__(self):
         pass
 
@@ -47,6 +47,9 @@ class MLXWhisperTranscriber(Transcriber):
         
         logger.info(f"初始化 MLX Whisper 转录器，模型：{self.model_name}")
 
+    def cache_identity(self) -> dict:
+        return {"type": "mlx-whisper", "model": self.model_size, "compute_type": None, "language": "auto"}
+
     @timeit
     def transcript(
         self,
@@ -3,15 +3,17 @@ import platform
 from enum import Enum
 
 from app.transcriber.groq import GroqTranscriber
-from app.transcriber.whisper import WhisperTranscriber
+from app.transcriber.whisper_pool import PooledWhisperTranscriber
 from app.transcriber.bcut import BcutTranscriber
 from app.transcriber.kuaishou import KuaishouTranscriber
+from app.transcriber.vad import with_vad
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 class TranscriberType(str, Enum):
     FAST_WHISPER = "fast-whisper"
+    FAST_WHISPER_BATCHED = "fast-whisper-batched"
     MLX_WHISPER = "mlx-whisper"
     BCUT = "bcut"
     KUAISHOU = "kuaishou"
@@ -32,6 +34,7 @@ logger.info('初始化转录服务提供器')
 # 转录器单例缓存
 _transcribers = {
     TranscriberType.FAST_WHISPER: None,
+    TranscriberType.FAST_WHISPER_BATCHED: None,
     TranscriberType.MLX_WHISPER: None,
     TranscriberType.BCUT: None,
     TranscriberType.KUAISHOU: None,
@@ -55,7 +58,11 @@ def get_groq_transcriber():
     return _init_transcriber(TranscriberType.GROQ, GroqTranscriber)
 
 def get_whisper_transcriber(model_size="base", device="cuda"):
-    return _init_transcriber(TranscriberType.FAST_WHISPER, WhisperTranscriber, model_size=model_size, device=device)
+    # 实际模型由 whisper_model_pool 按需加载/卸载，这里的单例只是默认模型大小的入口
+    return _init_transcriber(TranscriberType.FAST_WHISPER, PooledWhisperTranscriber, model_size=model_size, device=device)
+
+def get_batched_whisper_transcriber(model_size="base", device="cuda"):
+    return _init_transcriber(TranscriberType.FAST_WHISPER_BATCHED, PooledWhisperTranscriber, model_size=model_size, device=device, batched=True)
 
 def get_bcut_transcriber():
     return _init_transcriber(TranscriberType.BCUT, BcutTranscriber)
@@ -75,14 +82,18 @@ def get_transcriber(transcriber_type="fast-whisper", model_size="base", device="
     获取指定类型的转录器实例
 
     参数:
-        transcriber_type: 支持 "fast-whisper", "mlx-whisper", "bcut", "kuaishou", "groq"
+        transcriber_type: 支持 "fast-whisper", "fast-whisper-batched", "mlx-whisper", "bcut", "kuaishou", "groq"
         model_size: 模型大小，适用于 whisper 类
         device: 设备类型（如 cuda / cpu），仅 whisper 使用
 
     返回:
-        对应类型的转录器实例
+        对应类型的转录器实例；开启 TRANSCRIBE_VAD 时外面包一层 VAD（只转写语音区间）
     """
     logger.info(f'请求转录器类型: {transcriber_type}')
+    return with_vad(_get_transcriber(transcriber_type, model_size, device))
+
+
+def _get_transcriber(transcriber_type: str, model_size: str, device: str):
 
     try:
         transcriber_enum = TranscriberType(transcriber_type)
@@ -95,6 +106,9 @@ def get_transcriber(transcriber_type="fast-whisper", model_size="base", device="
     if transcriber_enum == TranscriberType.FAST_WHISPER:
         return get_whisper_transcriber(whisper_model_size, device=device)
 
+    elif transcriber_enum == TranscriberType.FAST_WHISPER_BATCHED:
+        return get_batched_whisper_transcriber(whisper_model_size, device=device)
+
     elif transcriber_enum == TranscriberType.MLX_WHISPER:
         if not MLX_WHISPER_AVAILABLE:
             logger.warning("MLX Whisper 不可用，回退到 fast-whisper")
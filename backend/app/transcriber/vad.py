@@ -0,0 +1,231 @@
+"""
+语音活动检测（VAD）前置：先找出音频中的语音区间，只把这些区间交给实际的转写器，
+再把时间戳映射回原始时间轴。适用于任意 Transcriber（包装器形式）。
+"""
+import os
+import tempfile
+import wave
+from bisect import bisect_right
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.models.transcriber_model import TranscriptResult, TranscriptSegment
+from app.services.pcm_cache import PCM_SAMPLE_RATE, open_pcm, pcm_lease
+from app.transcriber.base import Transcriber
+from app.utils.audio_chunker import detect_silences_pcm, merge_regions, speech_regions
+from app.utils.audio_format import ensure_audio_format
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 是否在转写前做 VAD，只转写语音区间（跳过片头、休息、纯音乐等）
+TRANSCRIBE_VAD = os.getenv("TRANSCRIBE_VAD", "false").strip().lower() in ("1", "true", "yes", "on")
+# silero：faster-whisper 自带的 Silero 模型（CPU，能区分语音与音乐）；energy：按音量阈值
+TRANSCRIBE_VAD_METHOD = (os.getenv("TRANSCRIBE_VAD_METHOD", "silero") or "silero").strip().lower()
+# 短于该时长（秒）的停顿不切开
+TRANSCRIBE_VAD_MIN_SILENCE = float(os.getenv("TRANSCRIBE_VAD_MIN_SILENCE", "2.0") or 2.0)
+# 语音区间两端外扩（秒），避免截掉首尾音节
+TRANSCRIBE_VAD_PAD = float(os.getenv("TRANSCRIBE_VAD_PAD", "0.4") or 0)
+# 可跳过的总时长低于该值（秒）时不做拼接，直接转写原音频
+TRANSCRIBE_VAD_MIN_SKIP = float(os.getenv("TRANSCRIBE_VAD_MIN_SKIP", "30") or 0)
+# energy 方式的静音阈值（dBFS）
+TRANSCRIBE_VAD_NOISE_DB = float(os.getenv("TRANSCRIBE_VAD_NOISE_DB", "-40") or -40)
+
+# 拼接时区间之间插入的静音（秒），让转写器在区间边界处断句
+_GAP_SECONDS = 0.5
+# Silero 按块处理，避免一次性把数小时的音频读入内存
+_SILERO_BLOCK_SECONDS = 600
+
+_current_stats: ContextVar[Optional[dict]] = ContextVar("vad_stats", default=None)
+
+
+@contextmanager
+def collect_vad_stats() -> Iterator[dict]:
+    """
+    在此上下文内执行的 VAD 转写会把统计（语音/跳过时长、区间数）写入返回的字典。
+    """
+    stats: dict = {}
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _silero_regions(samples: np.ndarray) -> List[Tuple[float, float]]:
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    options = VadOptions(
+        min_silence_duration_ms=int(TRANSCRIBE_VAD_MIN_SILENCE * 1000),
+        speech_pad_ms=0,
+    )
+    block = _SILERO_BLOCK_SECONDS * PCM_SAMPLE_RATE
+    regions: List[Tuple[float, float]] = []
+    for offset in range(0, len(samples), block):
+        part = np.array(samples[offset:offset + block], dtype=np.float32)
+        for ts in get_speech_timestamps(part, options):
+            regions.append(((offset + ts["start"]) / PCM_SAMPLE_RATE, (offset + ts["end"]) / PCM_SAMPLE_RATE))
+    return regions
+
+
+def detect_speech(samples: np.ndarray) -> Tuple[str, List[Tuple[float, float]]]:
+    """
+    返回 (实际使用的方法, [(start, end), ...])；Silero 不可用时回退为按能量检测。
+    """
+    duration = len(samples) / PCM_SAMPLE_RATE
+    if TRANSCRIBE_VAD_METHOD == "silero":
+        try:
+            return "silero", merge_regions(_silero_regions(samples), duration, TRANSCRIBE_VAD_PAD)
+        except Exception as exc:
+            logger.warning(f"Silero VAD 不可用，改用能量检测：{exc}")
+    silences = detect_silences_pcm(
+        samples, PCM_SAMPLE_RATE, noise_db=TRANSCRIBE_VAD_NOISE_DB, min_silence=TRANSCRIBE_VAD_MIN_SILENCE
+    )
+    return "energy", speech_regions(silences, duration, pad=TRANSCRIBE_VAD_PAD)
+
+
+class _Timeline:
+    """
+    拼接后时间轴与原始时间轴之间的映射。
+    """
+
+    def __init__(self, regions: List[Tuple[float, float]]):
+        self.regions = regions
+        self.starts: List[float] = []
+        cursor = 0.0
+        for start, end in regions:
+            self.starts.append(cursor)
+            cursor += (end - start) + _GAP_SECONDS
+        self.duration = max(0.0, cursor - _GAP_SECONDS)
+
+    def to_original(self, t: float, prefer_next: bool = False) -> float:
+        idx = max(0, bisect_right(self.starts, t) - 1)
+        start, end = self.regions[idx]
+        local = t - self.starts[idx]
+        if local <= end - start:
+            return start + max(0.0, local)
+        # 落在插入的间隔里：起点归到下一区间开头，终点归到本区间结尾
+        if prefer_next and idx + 1 < len(self.regions):
+            return self.regions[idx + 1][0]
+        return end
+
+
+def _write_regions_wav(samples: np.ndarray, regions: List[Tuple[float, float]], path: str) -> None:
+    gap = np.zeros(int(_GAP_SECONDS * PCM_SAMPLE_RATE), dtype=np.int16)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(PCM_SAMPLE_RATE)
+        for i, (start, end) in enumerate(regions):
+            if i:
+                wav.writeframes(gap.tobytes())
+            part = np.asarray(samples[int(start * PCM_SAMPLE_RATE):int(end * PCM_SAMPLE_RATE)], dtype=np.float32)
+            wav.writeframes((np.clip(part, -1.0, 1.0) * 32767).astype(np.int16).tobytes())
+
+
+class VadTranscriber(Transcriber):
+    """
+    包装任意转写器：只转写语音区间（拼接为一段临时 wav），结果时间戳映射回原音频。
+    """
+
+    def __init__(self, inner: Transcriber):
+        self.inner = inner
+        self.supports_journal = inner.supports_journal
+        self.required_audio_format = inner.required_audio_format
+
+    def for_model_size(self, model_size: Optional[str]) -> "VadTranscriber":
+        if not hasattr(self.inner, "for_model_size"):
+            return self
+        inner = self.inner.for_model_size(model_size)
+        return self if inner is self.inner else VadTranscriber(inner)
+
+    def cache_identity(self) -> dict:
+        identity = dict(self.inner.cache_identity())
+        identity["vad"] = {
+            "method": TRANSCRIBE_VAD_METHOD,
+            "min_silence": TRANSCRIBE_VAD_MIN_SILENCE,
+            "pad": TRANSCRIBE_VAD_PAD,
+            "min_skip": TRANSCRIBE_VAD_MIN_SKIP,
+            "noise_db": TRANSCRIBE_VAD_NOISE_DB if TRANSCRIBE_VAD_METHOD == "energy" else None,
+        }
+        return identity
+
+    def transcript(
+        self,
+        file_path: str,
+        *,
+        total_duration: float | None = None,
+        on_progress: Callable[[float], None] | None = None,
+        should_cancel: Callable[[], bool] | None = None,
+        **kwargs,
+    ) -> TranscriptResult:
+        stats = _current_stats.get()
+        with pcm_lease(file_path) as pcm_file:
+            if pcm_file is None:
+                return self.inner.transcript(
+                    file_path, total_duration=total_duration, on_progress=on_progress, should_cancel=should_cancel, **kwargs
+                )
+
+            samples = open_pcm(pcm_file)
+            duration = len(samples) / PCM_SAMPLE_RATE
+            method, regions = detect_speech(samples)
+            speech_seconds = sum(end - start for start, end in regions)
+            skipped = duration - speech_seconds
+            if stats is not None:
+                stats.update({
+                    "method": method,
+                    "regions": len(regions),
+                    "speech_seconds": round(speech_seconds, 3),
+                    # 跳过量不足 TRANSCRIBE_VAD_MIN_SKIP 时仍转写原音频，记为 0
+                    "skipped_seconds": round(skipped, 3) if not regions or skipped >= TRANSCRIBE_VAD_MIN_SKIP else 0.0,
+                })
+
+            if not regions:
+                logger.info("VAD 未检测到语音，跳过转写")
+                return TranscriptResult(language=None, full_text="", segments=[], raw=None)
+            if skipped < TRANSCRIBE_VAD_MIN_SKIP:
+                return self.inner.transcript(
+                    file_path, total_duration=total_duration, on_progress=on_progress, should_cancel=should_cancel, **kwargs
+                )
+
+            logger.info(
+                f"VAD({method})：{len(regions)} 个语音区间，共 {speech_seconds:.0f}s，跳过 {skipped:.0f}s / {duration:.0f}s"
+            )
+            timeline = _Timeline(regions)
+            fd, speech_file = tempfile.mkstemp(prefix="vad_", suffix=".wav")
+            os.close(fd)
+            inner_file = speech_file
+            try:
+                _write_regions_wav(samples, regions, speech_file)
+                inner_file = ensure_audio_format(speech_file, self.required_audio_format)
+
+                def _on_progress(processed_seconds: float) -> None:
+                    if on_progress:
+                        on_progress(timeline.to_original(processed_seconds))
+
+                result = self.inner.transcript(
+                    inner_file,
+                    total_duration=timeline.duration,
+                    on_progress=_on_progress,
+                    should_cancel=should_cancel,
+                    **kwargs,
+                )
+            finally:
+                for path in {speech_file, inner_file}:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+            segments = []
+            for seg in result.segments:
+                start = timeline.to_original(seg.start, prefer_next=True)
+                segments.append(TranscriptSegment(start=start, end=max(start, timeline.to_original(seg.end)), text=seg.text))
+            return TranscriptResult(language=result.language, full_text=result.full_text, segments=segments, raw=result.raw)
+
+
+def with_vad(transcriber: Transcriber) -> Transcriber:
+    return VadTranscriber(transcriber) if TRANSCRIBE_VAD else transcriber
@@ -1,10 +1,16 @@
 from faster_whisper import WhisperModel
+from faster_whisper.audio import decode_audio
 from typing import Callable, Optional
 
 from app.decorators.timeit import timeit
 from app.models.transcriber_model import TranscriptSegment, TranscriptResult
+from app.services.cpu_budget import cpu_budget, current_threads
+from app.services.pcm_cache import PCM_SAMPLE_RATE, open_pcm, pcm_lease
+from app.services.prometheus_metrics import set_whisper_model_loaded
 from app.services.task_manager import TaskCancelledError
+from app.services.transcript_journal import TranscriptJournal
 from app.transcriber.base import Transcriber
+from app.transcriber.whisper_chunked import ChunkedWhisperRunner
 from app.utils.env_checker import is_cuda_available
 from app.utils.logger import get_logger
 from app.utils.path_helper import get_model_dir
@@ -21,6 +27,26 @@ from modelscope import snapshot_download
 '''
 logger=get_logger(__name__)
 
+# 长音频分块并行转写：子进程数（每个子进程持有一份模型），<=1 关闭；仅 CPU 推理时生效
+WHISPER_CHUNK_WORKERS = int(os.getenv("WHISPER_CHUNK_WORKERS", "0") or 0)
+# 目标块长（秒），切点会对齐到附近的静音处；音频短于 1.5 倍块长时不分块
+WHISPER_CHUNK_SECONDS = float(os.getenv("WHISPER_CHUNK_SECONDS", "300") or 300)
+# 相邻块的重叠（秒），拼接时按分段中点去重
+WHISPER_CHUNK_OVERLAP_SECONDS = float(os.getenv("WHISPER_CHUNK_OVERLAP_SECONDS", "1.0") or 0)
+
+def chunked_identity(device: str) -> Optional[dict]:
+    """
+    分块并行转写的切分参数（切点不同，分段边界也不同），不分块时为 None；用作转写缓存键的一部分
+    """
+    if device != "cpu" or WHISPER_CHUNK_WORKERS <= 1:
+        return None
+    return {
+        "workers": WHISPER_CHUNK_WORKERS,
+        "seconds": WHISPER_CHUNK_SECONDS,
+        "overlap": WHISPER_CHUNK_OVERLAP_SECONDS,
+    }
+
+
 MODEL_MAP={
     "tiny": "pengzhendong/faster-whisper-tiny",
     'base':'pengzhendong/faster-whisper-base',
@@ -33,13 +59,14 @@ MODEL_MAP={
 }
 
 class WhisperTranscriber(Transcriber):
-    # TODO:修改为可配置
+    supports_journal = True
+
     def __init__(
             self,
             model_size: str = "base",
             device: str = 'cpu',
             compute_type: str = None,
-            cpu_threads: int = 1,
+            cpu_threads: Optional[int] = None,
     ):
         if device == 'cpu' or device is None:
             self.device = 'cpu'
@@ -51,6 +78,7 @@ class WhisperTranscriber(Transcriber):
                 logger.info('检测到可用 CUDA，使用 GPU 进行计算')
 
         self.compute_type = compute_type or ("float16" if self.device == "cuda" else "int8")
+        self.model_size = model_size
 
         model_dir = get_model_dir("whisper")
         model_path = os.path.join(model_dir, f"whisper-{model_size}")
@@ -64,16 +92,97 @@ class WhisperTranscriber(Transcriber):
             )
             logger.info("模型下载完成")
 
+        self.model_path = model_path
+        # CTranslate2 的线程数在加载时固定；默认取当前 CPU 线程预算中的份额
+        self.cpu_threads = max(1, int(cpu_threads or current_threads()))
         self.model = WhisperModel(
             model_size_or_path=model_path,
             device=self.device,
             compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads,
             download_root=model_dir
         )
+        self._chunk_runner: Optional[ChunkedWhisperRunner] = None
+        set_whisper_model_loaded(model_size, self.device, self.compute_type)
+
+    def cache_identity(self) -> dict:
+        return {
+            "type": "fast-whisper",
+            "model": self.model_size,
+            "compute_type": self.compute_type,
+            "language": "auto",
+            "chunked": chunked_identity(self.device),
+        }
+
     @staticmethod
     def is_cuda() -> bool:
         return is_cuda_available()
 
+    def _use_chunked(self, total_duration: Optional[float]) -> bool:
+        return (
+            self.device == "cpu"
+            and WHISPER_CHUNK_WORKERS > 1
+            and isinstance(total_duration, (int, float))
+            and total_duration > WHISPER_CHUNK_SECONDS * 1.5
+        )
+
+    def _get_chunk_runner(self) -> ChunkedWhisperRunner:
+        if self._chunk_runner is None:
+            self._chunk_runner = ChunkedWhisperRunner(
+                model_path=self.model_path,
+                device=self.device,
+                compute_type=self.compute_type,
+                workers=WHISPER_CHUNK_WORKERS,
+                cpu_threads=max(1, cpu_budget.total_threads // WHISPER_CHUNK_WORKERS),
+            )
+        return self._chunk_runner
+
+    def _transcript_chunked(
+        self,
+        file_path: str,
+        total_duration: float,
+        on_progress: Optional[Callable[[float], None]],
+        should_cancel: Optional[Callable[[], bool]],
+        pcm_file: Optional[str] = None,
+        journal: Optional[TranscriptJournal] = None,
+    ) -> TranscriptResult:
+        logger.info(f"音频时长 {total_duration:.0f}s，使用 {WHISPER_CHUNK_WORKERS} 个进程分块并行转写")
+        runner = self._get_chunk_runner()
+
+        def _on_segments(language: Optional[str], chunk_segments: list) -> None:
+            # 按块顺序落盘：只有前面的块都完成后才写入，保证日志是连续的前缀
+            journal.set_language(language)
+            for start, end, text in chunk_segments:
+                journal.append(TranscriptSegment(start=start, end=end, text=text))
+
+        language, raw_segments = runner.run(
+            file_path,
+            float(total_duration),
+            chunk_seconds=WHISPER_CHUNK_SECONDS,
+            overlap_seconds=WHISPER_CHUNK_OVERLAP_SECONDS,
+            on_progress=on_progress,
+            should_cancel=should_cancel,
+            # 同时在跑的块数随本任务的线程份额变化（其他任务开始/结束时自动收缩/扩张）
+            parallelism=lambda: current_threads() // runner.cpu_threads,
+            pcm_file=pcm_file,
+            start_offset=journal.resume_from if journal else 0.0,
+            on_segments=_on_segments if journal else None,
+        )
+        segments = [TranscriptSegment(start=start, end=end, text=text) for start, end, text in raw_segments]
+        if journal:
+            segments = journal.segments
+            language = journal.language or language
+        return TranscriptResult(
+            language=language,
+            full_text=" ".join(seg.text for seg in segments),
+            segments=segments,
+            raw=None,
+        )
+
+    def _transcribe_raw(self, file_path: str, audio=None):
+        # 返回 (分段迭代器, info)；子类可替换推理方式。audio 为已解码的 16kHz PCM，提供时不再重复解码
+        return self.model.transcribe(audio if audio is not None else file_path)
+
     @timeit
     def transcript(
         self,
@@ -82,53 +191,89 @@ class WhisperTranscriber(Transcriber):
         total_duration: Optional[float] = None,
         on_progress: Optional[Callable[[float], None]] = None,
         should_cancel: Optional[Callable[[], bool]] = None,
+        journal: Optional[TranscriptJournal] = None,
     ) -> TranscriptResult:
+        """
+        传入 journal 时每个分段产出即追加到日志；日志中已有分段则从其最后结束时间处继续转写并合并。
+        """
         try:
+            with pcm_lease(file_path) as pcm_file:
+                audio = open_pcm(pcm_file) if pcm_file else None
+                if audio is not None and not total_duration:
+                    # 本地上传等来源拿不到时长，直接由采样点数得出
+                    total_duration = len(audio) / PCM_SAMPLE_RATE
 
-            segments_raw, info = self.model.transcribe(file_path)
+                offset = journal.resume_from if journal else 0.0
+                segments = list(journal.segments) if journal else []
+                if offset > 0:
+                    logger.info(f"从转写日志续传：跳过已完成的 {offset:.1f}s（{len(segments)} 段）")
+                    if isinstance(total_duration, (int, float)) and total_duration - offset < 0.5:
+                        # 剩余不足半秒，日志已覆盖全部内容
+                        return TranscriptResult(
+                            language=journal.language,
+                            full_text=" ".join(seg.text for seg in segments),
+                            segments=segments,
+                            raw=None,
+                        )
 
-            segments = []
-            full_text = ""
+                if self._use_chunked(total_duration - offset if total_duration else total_duration):
+                    return self._transcript_chunked(
+                        file_path, total_duration, on_progress, should_cancel, pcm_file=pcm_file, journal=journal
+                    )
 
-            if should_cancel and should_cancel():
-                raise TaskCancelledError("Task cancelled")
+                if offset > 0:
+                    if audio is None:
+                        audio = decode_audio(file_path, sampling_rate=PCM_SAMPLE_RATE)
+                    audio = audio[int(offset * PCM_SAMPLE_RATE):]
 
-            if on_progress:
-                try:
-                    on_progress(0.0)
-                except TaskCancelledError:
-                    raise
-                except Exception:
-                    pass
+                segments_raw, info = self._transcribe_raw(file_path, audio=audio)
+                if journal:
+                    journal.set_language(info.language)
+
+                full_text = "".join(seg.text + " " for seg in segments)
 
-            for seg in segments_raw:
                 if should_cancel and should_cancel():
                     raise TaskCancelledError("Task cancelled")
 
-                text = seg.text.strip()
-                full_text += text + " "
-                segments.append(TranscriptSegment(
-                    start=seg.start,
-                    end=seg.end,
-                    text=text
-                ))
-
                 if on_progress:
                     try:
-                        on_progress(float(seg.end))
+                        on_progress(offset)
                     except TaskCancelledError:
                         raise
                     except Exception:
                         pass
 
-            result= TranscriptResult(
-                language=info.language,
-                full_text=full_text.strip(),
-                segments=segments,
-                raw=info
-            )
-            # self.on_finish(file_path, result)
-            return result
+                for seg in segments_raw:
+                    if should_cancel and should_cancel():
+                        raise TaskCancelledError("Task cancelled")
+
+                    text = seg.text.strip()
+                    full_text += text + " "
+                    segment = TranscriptSegment(
+                        start=seg.start + offset,
+                        end=seg.end + offset,
+                        text=text
+                    )
+                    segments.append(segment)
+                    if journal:
+                        journal.append(segment)
+
+                    if on_progress:
+                        try:
+                            on_progress(float(segment.end))
+                        except TaskCancelledError:
+                            raise
+                        except Exception:
+                            pass
+
+                result= TranscriptResult(
+                    language=(journal.language if journal else None) or info.language,
+                    full_text=full_text.strip(),
+                    segments=segments,
+                    raw=info
+                )
+                # self.on_finish(file_path, result)
+                return result
         except TaskCancelledError:
             raise
         except Exception as e:
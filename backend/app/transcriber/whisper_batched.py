@@ -0,0 +1,77 @@
+import os
+from typing import Optional
+
+from faster_whisper import BatchedInferencePipeline
+from faster_whisper.audio import decode_audio
+
+from app.transcriber.whisper import WhisperTranscriber
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 每批送入模型的片段数；CPU 上 8~16 通常收益最大，显存/内存不足时调小
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8") or 8)
+# 是否用 VAD 切分语音片段（关闭时按固定 30 秒窗口切分）
+WHISPER_BATCH_VAD = os.getenv("WHISPER_BATCH_VAD", "true").strip().lower() not in ("0", "false", "no", "off")
+# 词级时间戳（更慢，默认关闭）
+WHISPER_WORD_TIMESTAMPS = os.getenv("WHISPER_WORD_TIMESTAMPS", "false").strip().lower() in ("1", "true", "yes", "on")
+
+_SAMPLE_RATE = 16000
+_WINDOW_SECONDS = 30
+
+
+class BatchedWhisperTranscriber(WhisperTranscriber):
+    """
+    faster-whisper 批量推理：先把音频切成片段（VAD 或固定窗口），再按 batch 并行解码。
+    输出与 WhisperTranscriber 相同的 TranscriptResult。
+    """
+
+    def __init__(
+            self,
+            model_size: str = "base",
+            device: str = 'cpu',
+            compute_type: str = None,
+            cpu_threads: Optional[int] = None,
+            batch_size: Optional[int] = None,
+    ):
+        super().__init__(model_size=model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+        self.batch_size = max(1, int(batch_size or WHISPER_BATCH_SIZE))
+        self.pipeline = BatchedInferencePipeline(model=self.model)
+        logger.info(f"批量推理已启用 (batch_size={self.batch_size}, vad={WHISPER_BATCH_VAD})")
+
+    def cache_identity(self) -> dict:
+        return {
+            "type": "fast-whisper-batched" if WHISPER_BATCH_VAD else "fast-whisper-batched-novad",
+            "model": self.model_size,
+            "compute_type": self.compute_type,
+            "language": "auto",
+        }
+
+    def _use_chunked(self, total_duration: Optional[float]) -> bool:
+        # 批量推理已在单模型内并行，不再叠加多进程分块
+        return False
+
+    def _transcribe_raw(self, file_path: str, audio=None):
+        if WHISPER_BATCH_VAD:
+            return self.pipeline.transcribe(
+                audio if audio is not None else file_path,
+                batch_size=self.batch_size,
+                vad_filter=True,
+                word_timestamps=WHISPER_WORD_TIMESTAMPS,
+            )
+
+        if audio is None:
+            audio = decode_audio(file_path, sampling_rate=_SAMPLE_RATE)
+        duration = len(audio) / _SAMPLE_RATE
+        clip_timestamps = [
+            {"start": start, "end": min(start + _WINDOW_SECONDS, duration)}
+            for start in range(0, int(duration) + 1, _WINDOW_SECONDS)
+            if start < duration
+        ]
+        return self.pipeline.transcribe(
+            audio,
+            batch_size=self.batch_size,
+            vad_filter=False,
+            clip_timestamps=clip_timestamps,
+            word_timestamps=WHISPER_WORD_TIMESTAMPS,
+        )
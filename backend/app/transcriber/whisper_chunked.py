@@ -0,0 +1,162 @@
+"""
+分块并行转写：长音频按静音切块，由进程池中各自持有模型的子进程并发转写，再按时间偏移拼接。
+
+本模块会在子进程中导入（spawn），只依赖 faster_whisper / numpy，避免拉起整个应用。
+"""
+import multiprocessing
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, List, Optional, Tuple
+
+_worker_model = None
+
+
+def _init_worker(model_path: str, device: str, compute_type: str, cpu_threads: int) -> None:
+    global _worker_model
+    from faster_whisper import WhisperModel
+
+    _worker_model = WhisperModel(
+        model_size_or_path=model_path,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+    )
+
+
+def _transcribe_chunk(
+    path: str,
+    offset: float,
+    keep_from: float,
+    pcm_range: Optional[Tuple[int, int]] = None,
+) -> Tuple[Optional[str], List[Tuple[float, float, str]]]:
+    if pcm_range is not None:
+        # 直接从共享的 PCM 内存映射中切片，省去 ffmpeg 截取与再次解码
+        import numpy as np
+
+        audio = np.array(np.memmap(path, dtype=np.float32, mode="r")[pcm_range[0]:pcm_range[1]])
+        segments_raw, info = _worker_model.transcribe(audio)
+    else:
+        segments_raw, info = _worker_model.transcribe(path)
+    segments = []
+    for seg in segments_raw:
+        start = float(seg.start) + offset
+        end = float(seg.end) + offset
+        # 重叠区去重：中点落在本块负责范围之前的分段已由上一块产出
+        if (start + end) / 2 < keep_from:
+            continue
+        text = seg.text.strip()
+        if text:
+            segments.append((start, end, text))
+    return info.language, segments
+
+
+class ChunkedWhisperRunner:
+    """
+    持有一个常驻进程池（每个子进程加载一份模型），供同一转写器的所有任务复用。
+    """
+
+    def __init__(self, model_path: str, device: str, compute_type: str, workers: int, cpu_threads: int):
+        self.model_path = model_path
+        self.device = device
+        self.compute_type = compute_type
+        self.workers = max(1, int(workers))
+        self.cpu_threads = max(1, int(cpu_threads))
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.model_path, self.device, self.compute_type, self.cpu_threads),
+            )
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def run(
+        self,
+        file_path: str,
+        duration: float,
+        *,
+        chunk_seconds: float,
+        overlap_seconds: float,
+        on_progress: Optional[Callable[[float], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        parallelism: Optional[Callable[[], int]] = None,
+        pcm_file: Optional[str] = None,
+        start_offset: float = 0.0,
+        on_segments: Optional[Callable[[Optional[str], List[Tuple[float, float, str]]], None]] = None,
+    ) -> Tuple[Optional[str], List[Tuple[float, float, str]]]:
+        """
+        返回 (language, [(start, end, text), ...])；进度按已完成块的音频时长累计上报。
+
+        `parallelism` 每次提交前重新读取，用于按 CPU 线程预算动态调整同时在跑的块数。
+        给出 `pcm_file`（16kHz float32）时，静音检测与各块音频都直接取自该文件。
+        `start_offset` 之前的音频跳过（续传）；`on_segments` 按块顺序回调，前面的块未完成时后面的块先暂存。
+        """
+        from app.services.pcm_cache import PCM_SAMPLE_RATE, open_pcm
+        from app.services.task_manager import TaskCancelledError
+        from app.utils.audio_chunker import AudioChunk, detect_silences, detect_silences_pcm, extract_chunk, plan_chunks
+
+        if pcm_file:
+            silences = detect_silences_pcm(open_pcm(pcm_file), PCM_SAMPLE_RATE)
+        else:
+            silences = detect_silences(file_path)
+        start_offset = max(0.0, min(float(start_offset), duration))
+        shifted = [(s - start_offset, e - start_offset) for s, e in silences if e > start_offset]
+        chunks = [
+            AudioChunk(index=c.index, start=c.start + start_offset, end=c.end + start_offset, keep_from=c.keep_from + start_offset)
+            for c in plan_chunks(duration - start_offset, shifted, chunk_seconds, overlap_seconds)
+        ]
+        work_dir = tempfile.mkdtemp(prefix="whisper_chunks_")
+        futures: dict[Future, object] = {}
+        try:
+            pool = self._get_pool()
+            todo = list(chunks)
+            pending: set = set()
+            results = {}
+            flushed = 0
+            done_seconds = start_offset
+            while todo or pending:
+                if should_cancel and should_cancel():
+                    raise TaskCancelledError("Task cancelled")
+                limit = max(1, min(self.workers, parallelism() if parallelism else self.workers))
+                while todo and len(pending) < limit:
+                    chunk = todo.pop(0)
+                    if pcm_file:
+                        pcm_range = (int(chunk.start * PCM_SAMPLE_RATE), int(chunk.end * PCM_SAMPLE_RATE))
+                        fut = pool.submit(_transcribe_chunk, pcm_file, chunk.start, chunk.keep_from, pcm_range)
+                    else:
+                        path = extract_chunk(file_path, chunk, work_dir)
+                        fut = pool.submit(_transcribe_chunk, path, chunk.start, chunk.keep_from)
+                    futures[fut] = chunk
+                    pending.add(fut)
+
+                done, pending = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    chunk = futures[fut]
+                    results[chunk.index] = fut.result()
+                    done_seconds += chunk.end - chunk.keep_from
+                    if on_progress:
+                        on_progress(min(done_seconds, duration))
+                while on_segments and flushed in results:
+                    on_segments(*results[flushed])
+                    flushed += 1
+
+            language = None
+            segments: List[Tuple[float, float, str]] = []
+            for index in sorted(results):
+                chunk_language, chunk_segments = results[index]
+                language = language or chunk_language
+                segments.extend(chunk_segments)
+            return language, segments
+        finally:
+            for fut in futures:
+                fut.cancel()
+            shutil.rmtree(work_dir, ignore_errors=True)
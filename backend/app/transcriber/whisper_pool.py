@@ -0,0 +1,283 @@
+import gc
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+from app.models.transcriber_model import TranscriptResult
+from app.services.cpu_budget import current_threads
+from app.services.prometheus_metrics import set_whisper_model_loaded
+from app.services.stage_metrics import current_rss_bytes
+from app.services.transcript_journal import TranscriptJournal
+from app.transcriber.base import Transcriber
+from app.transcriber.whisper import MODEL_MAP, WhisperTranscriber, chunked_identity
+from app.transcriber.whisper_batched import WHISPER_BATCH_VAD, BatchedWhisperTranscriber
+from app.utils.env_checker import is_cuda_available
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 每个 (模型大小, 精度) 最多同时加载的实例数；同一实例同一时间只服务一个任务
+WHISPER_POOL_INSTANCES = max(1, int(os.getenv("WHISPER_POOL_INSTANCES", "1") or 1))
+# 已加载模型的内存预算（MB），超出时按 LRU 卸载空闲模型；<=0 不限制
+WHISPER_POOL_RAM_MB = float(os.getenv("WHISPER_POOL_RAM_MB", "4096") or 0)
+
+# int8 量化下的大致常驻内存（MB），未实测前用于预算估算
+_MODEL_RAM_MB = {
+    "tiny": 150,
+    "base": 250,
+    "small": 600,
+    "medium": 1500,
+    "large-v1": 3000,
+    "large-v2": 3000,
+    "large-v3": 3000,
+    "large-v3-turbo": 1700,
+}
+_COMPUTE_FACTOR = {"int8": 1.0, "int8_float16": 1.0, "int8_float32": 1.0, "float16": 2.0, "bfloat16": 2.0, "float32": 4.0}
+
+
+def resolve_device(device: Optional[str]) -> str:
+    # 与 WhisperTranscriber 的设备选择保持一致
+    if device == "cpu" or device is None:
+        return "cpu"
+    return "cuda" if is_cuda_available() else "cpu"
+
+
+def default_compute_type(device: str) -> str:
+    return "float16" if device == "cuda" else "int8"
+
+
+@dataclass
+class _PoolSlot:
+    key: tuple
+    transcriber: WhisperTranscriber
+    size_bytes: int
+    busy: bool = True
+
+
+class WhisperModelPool:
+    """
+    按 (变体, 模型大小, 设备, 精度) 管理已加载的 Whisper 模型：任务签出独占实例，用完归还；
+    新模型需要空间时按 LRU 卸载空闲实例，使总内存不超过预算。
+    """
+
+    def __init__(self, *, instances_per_key: int, budget_bytes: Optional[int]):
+        self.instances_per_key = max(1, int(instances_per_key))
+        self.budget_bytes = int(budget_bytes) if budget_bytes else None
+        self._cond = threading.Condition()
+        self._slots: dict[tuple, list[_PoolSlot]] = {}
+        self._idle: "OrderedDict[int, _PoolSlot]" = OrderedDict()  # LRU：最久未用在前
+        self._loading: dict[tuple, int] = {}
+        self._used_bytes = 0
+        self._measured: dict[tuple, int] = {}
+        self.loads = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "WhisperModelPool":
+        budget = int(WHISPER_POOL_RAM_MB * 1024 * 1024) if WHISPER_POOL_RAM_MB > 0 else None
+        return cls(instances_per_key=WHISPER_POOL_INSTANCES, budget_bytes=budget)
+
+    # ---------------- public API ----------------
+
+    @contextmanager
+    def checkout(self, model_size: str, *, device: str, compute_type: str, batched: bool = False) -> Iterator[WhisperTranscriber]:
+        key = ("batched" if batched else "sequential", model_size, device, compute_type)
+        slot = self._acquire(key)
+        try:
+            yield slot.transcriber
+        finally:
+            self._release(slot)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "loaded": [
+                    {
+                        "variant": key[0],
+                        "model_size": key[1],
+                        "device": key[2],
+                        "compute_type": key[3],
+                        "instances": len(slots),
+                        "busy": sum(1 for s in slots if s.busy),
+                    }
+                    for key, slots in self._slots.items()
+                    if slots
+                ],
+                "used_bytes": self._used_bytes,
+                "budget_bytes": self.budget_bytes,
+                "loads": self.loads,
+                "evictions": self.evictions,
+            }
+
+    # ---------------- internals ----------------
+
+    def _estimate(self, key: tuple) -> int:
+        if key in self._measured:
+            return self._measured[key]
+        _, model_size, _, compute_type = key
+        mb = _MODEL_RAM_MB.get(model_size, 1500) * _COMPUTE_FACTOR.get(compute_type, 2.0)
+        return int(mb * 1024 * 1024)
+
+    @staticmethod
+    def _threads_mismatch(slot: _PoolSlot, want: int) -> bool:
+        # 线程数在模型加载时固定：与当前份额相差一倍以上时重新加载，否则直接复用
+        have = int(getattr(slot.transcriber, "cpu_threads", want) or want)
+        return slot.key[2] == "cpu" and (have >= want * 2 or want >= have * 2)
+
+    def _acquire(self, key: tuple) -> _PoolSlot:
+        want_threads = current_threads()
+        with self._cond:
+            while True:
+                for slot in self._slots.get(key, []):
+                    if not slot.busy:
+                        if self._threads_mismatch(slot, want_threads):
+                            logger.info(f"CPU 线程份额已变为 {want_threads}，重新加载 {key[1]} 模型")
+                            self._idle.pop(id(slot), None)
+                            self._drop_slot_locked(slot)
+                            break
+                        slot.busy = True
+                        self._idle.pop(id(slot), None)
+                        return slot
+
+                count = len(self._slots.get(key, [])) + self._loading.get(key, 0)
+                if count < self.instances_per_key:
+                    need = self._estimate(key)
+                    self._evict_idle_locked(need)
+                    fits = self.budget_bytes is None or self._used_bytes + need <= self.budget_bytes
+                    if fits or count == 0:
+                        if not fits:
+                            logger.warning(f"Whisper 模型内存预算不足，仍加载 {key[1]}（其余模型均在使用中）")
+                        self._loading[key] = self._loading.get(key, 0) + 1
+                        self._used_bytes += need
+                        break
+                self._cond.wait()
+
+        rss_before = current_rss_bytes()
+        try:
+            transcriber = self._load(key, want_threads)
+        except Exception:
+            with self._cond:
+                self._loading[key] -= 1
+                self._used_bytes -= need
+                self._cond.notify_all()
+            raise
+        rss_after = current_rss_bytes()
+
+        with self._cond:
+            self._loading[key] -= 1
+            size = need
+            if rss_before is not None and rss_after is not None and rss_after - rss_before > 0:
+                size = rss_after - rss_before
+                self._measured[key] = size
+            self._used_bytes += size - need
+            slot = _PoolSlot(key=key, transcriber=transcriber, size_bytes=size)
+            self._slots.setdefault(key, []).append(slot)
+            self.loads += 1
+            return slot
+
+    def _load(self, key: tuple, cpu_threads: int) -> WhisperTranscriber:
+        variant, model_size, device, compute_type = key
+        logger.info(
+            f"加载 Whisper 模型 (variant={variant}, size={model_size}, device={device}, "
+            f"compute_type={compute_type}, cpu_threads={cpu_threads})"
+        )
+        cls = BatchedWhisperTranscriber if variant == "batched" else WhisperTranscriber
+        return cls(model_size=model_size, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+
+    def _release(self, slot: _PoolSlot) -> None:
+        with self._cond:
+            slot.busy = False
+            self._idle[id(slot)] = slot
+            if self.budget_bytes is not None and self._used_bytes > self.budget_bytes:
+                self._evict_idle_locked(0)
+            self._cond.notify_all()
+
+    def _evict_idle_locked(self, need: int) -> None:
+        if self.budget_bytes is None:
+            return
+        while self._idle and self._used_bytes + need > self.budget_bytes:
+            _, slot = self._idle.popitem(last=False)
+            logger.info(f"卸载空闲 Whisper 模型 {slot.key[1]} ({slot.key[3]})，释放约 {slot.size_bytes // (1024 * 1024)}MB")
+            self._drop_slot_locked(slot)
+
+    def _drop_slot_locked(self, slot: _PoolSlot) -> None:
+        self._slots[slot.key].remove(slot)
+        self._used_bytes = max(0, self._used_bytes - slot.size_bytes)
+        self.evictions += 1
+        _, model_size, device, compute_type = slot.key
+        runner = getattr(slot.transcriber, "_chunk_runner", None)
+        if runner is not None:
+            runner.shutdown()
+        if not self._slots[slot.key]:
+            set_whisper_model_loaded(model_size, device, compute_type, loaded=False)
+        slot.transcriber = None
+        gc.collect()
+
+
+whisper_model_pool = WhisperModelPool.from_env()
+
+
+class PooledWhisperTranscriber(Transcriber):
+    """
+    转写器入口：每次转写从模型池签出一个实例，可按请求切换模型大小（tiny / large-v3 等）而无需重启。
+    """
+
+    supports_journal = True
+
+    def __init__(self, model_size: str = "base", device: str = "cpu", compute_type: str = None, batched: bool = False, preload: bool = True):
+        if model_size not in MODEL_MAP:
+            raise ValueError(f"不支持的 Whisper 模型：{model_size}")
+        self.model_size = model_size
+        self.device = resolve_device(device)
+        self.compute_type = compute_type or default_compute_type(self.device)
+        self.batched = batched
+        self.pool = whisper_model_pool
+        if preload:
+            # 启动时预热默认模型（与原先单例在创建时加载模型的行为一致）
+            with self._checkout():
+                pass
+
+    def for_model_size(self, model_size: Optional[str]) -> "PooledWhisperTranscriber":
+        if not model_size or model_size == self.model_size:
+            return self
+        return PooledWhisperTranscriber(
+            model_size=model_size,
+            device=self.device,
+            compute_type=self.compute_type,
+            batched=self.batched,
+            preload=False,
+        )
+
+    def cache_identity(self) -> dict:
+        return {
+            "type": ("fast-whisper-batched" if WHISPER_BATCH_VAD else "fast-whisper-batched-novad") if self.batched else "fast-whisper",
+            "model": self.model_size,
+            "compute_type": self.compute_type,
+            "language": "auto",
+            # 批量推理不走多进程分块
+            "chunked": None if self.batched else chunked_identity(self.device),
+        }
+
+    def _checkout(self):
+        return self.pool.checkout(self.model_size, device=self.device, compute_type=self.compute_type, batched=self.batched)
+
+    def transcript(
+        self,
+        file_path: str,
+        *,
+        total_duration: float | None = None,
+        on_progress: Callable[[float], None] | None = None,
+        should_cancel: Callable[[], bool] | None = None,
+        journal: TranscriptJournal | None = None,
+    ) -> TranscriptResult:
+        with self._checkout() as transcriber:
+            return transcriber.transcript(
+                file_path,
+                total_duration=total_duration,
+                on_progress=on_progress,
+                should_cancel=should_cancel,
+                journal=journal,
+            )
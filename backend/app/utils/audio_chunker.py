@@ -0,0 +1,162 @@
+import os
+import re
+import subprocess
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SILENCE_START = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END = re.compile(r"silence_end:\s*(-?[\d.]+)")
+
+
+@dataclass
+class AudioChunk:
+    index: int
+    start: float      # 实际截取的起点（含与上一块的重叠）
+    end: float        # 截取终点
+    keep_from: float  # 该块负责的起点：早于此时间的分段属于上一块（用于重叠去重）
+
+
+def detect_silences(path: str, noise_db: float = -35.0, min_silence: float = 0.5) -> List[Tuple[float, float]]:
+    """
+    使用 ffmpeg silencedetect 找出静音区间 [(start, end), ...]
+    """
+    command = [
+        "ffmpeg", "-hide_banner", "-nostats",
+        "-i", str(path),
+        "-af", f"silencedetect=noise={noise_db}dB:d={min_silence}",
+        "-f", "null", "-",
+    ]
+    result = subprocess.run(command, capture_output=True, text=True, errors="ignore")
+    silences: List[Tuple[float, float]] = []
+    start: Optional[float] = None
+    for line in (result.stderr or "").splitlines():
+        m = _SILENCE_START.search(line)
+        if m:
+            start = max(0.0, float(m.group(1)))
+            continue
+        m = _SILENCE_END.search(line)
+        if m and start is not None:
+            silences.append((start, float(m.group(1))))
+            start = None
+    return silences
+
+
+def frame_levels_db(samples: np.ndarray, sample_rate: int, frame_seconds: float = 0.03) -> np.ndarray:
+    """
+    逐帧 RMS 电平（dBFS），分块计算以免一次性读入整段内存映射音频
+    """
+    frame = max(1, int(sample_rate * frame_seconds))
+    n_frames = len(samples) // frame
+    levels = np.empty(n_frames, dtype=np.float32)
+    block = frame * 2000
+    for offset in range(0, n_frames * frame, block):
+        part = np.asarray(samples[offset:min(offset + block, n_frames * frame)], dtype=np.float32).reshape(-1, frame)
+        rms = np.sqrt(np.mean(part * part, axis=1))
+        start = offset // frame
+        levels[start:start + len(rms)] = 20 * np.log10(np.maximum(rms, 1e-10))
+    return levels
+
+
+def detect_silences_pcm(
+    samples: np.ndarray,
+    sample_rate: int,
+    noise_db: float = -35.0,
+    min_silence: float = 0.5,
+    frame_seconds: float = 0.03,
+) -> List[Tuple[float, float]]:
+    """
+    与 detect_silences 相同的语义，但直接在已解码的 PCM 上按能量计算（无需再启动 ffmpeg 解码）
+    """
+    levels = frame_levels_db(samples, sample_rate, frame_seconds)
+    step = max(1, int(sample_rate * frame_seconds)) / float(sample_rate)
+    quiet = np.concatenate(([False], levels < noise_db, [False]))
+    edges = np.flatnonzero(np.diff(quiet.astype(np.int8)))
+    silences = []
+    for start, end in zip(edges[::2], edges[1::2]):
+        if (end - start) * step >= min_silence:
+            silences.append((float(start * step), float(end * step)))
+    return silences
+
+
+def speech_regions(
+    silences: List[Tuple[float, float]],
+    duration: float,
+    pad: float = 0.3,
+    min_speech: float = 0.2,
+) -> List[Tuple[float, float]]:
+    """
+    由静音区间取补集得到语音区间，两端各外扩 pad 秒并合并重叠部分，丢弃短于 min_speech 的碎片
+    """
+    regions: List[Tuple[float, float]] = []
+    cursor = 0.0
+    for start, end in sorted(silences) + [(duration, duration)]:
+        if start - cursor >= min_speech:
+            regions.append((cursor, start))
+        cursor = max(cursor, end)
+    return merge_regions(regions, duration, pad)
+
+
+def merge_regions(regions: List[Tuple[float, float]], duration: float, pad: float = 0.0) -> List[Tuple[float, float]]:
+    merged: List[Tuple[float, float]] = []
+    for start, end in sorted(regions):
+        start, end = max(0.0, start - pad), min(duration, end + pad)
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        elif end > start:
+            merged.append((start, end))
+    return merged
+
+
+def plan_chunks(
+    duration: float,
+    silences: List[Tuple[float, float]],
+    target_seconds: float,
+    overlap_seconds: float = 1.0,
+) -> List[AudioChunk]:
+    """
+    按目标时长切块，切点优先落在目标边界附近（±25%）最近的静音中点，找不到则硬切
+    """
+    if duration <= 0 or target_seconds <= 0:
+        return [AudioChunk(index=0, start=0.0, end=duration, keep_from=0.0)]
+
+    window = target_seconds * 0.25
+    midpoints = [(s + e) / 2 for s, e in silences]
+    cuts: List[float] = []
+    last = 0.0
+    while duration - last > target_seconds * 1.25:
+        target = last + target_seconds
+        candidates = [m for m in midpoints if target - window <= m <= target + window and m > last]
+        cut = min(candidates, key=lambda m: abs(m - target)) if candidates else target
+        cuts.append(cut)
+        last = cut
+
+    bounds = [0.0] + cuts + [duration]
+    chunks = []
+    for i in range(len(bounds) - 1):
+        keep_from = bounds[i]
+        start = max(0.0, keep_from - overlap_seconds) if i > 0 else 0.0
+        chunks.append(AudioChunk(index=i, start=start, end=bounds[i + 1], keep_from=keep_from))
+    return chunks
+
+
+def extract_chunk(path: str, chunk: AudioChunk, output_dir: str) -> str:
+    """
+    截取一块音频为 16kHz 单声道 wav（Whisper 的原生输入格式，免去子进程再次重采样）
+    """
+    output_path = os.path.join(output_dir, f"chunk_{chunk.index:04d}.wav")
+    command = [
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-ss", f"{chunk.start:.3f}",
+        "-t", f"{chunk.end - chunk.start:.3f}",
+        "-i", str(path),
+        "-ac", "1", "-ar", "16000",
+        "-y", output_path,
+    ]
+    subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    return output_path
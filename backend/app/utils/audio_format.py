@@ -0,0 +1,100 @@
+import os
+import subprocess
+from typing import Optional
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 可直接流复制（不重新编码）的音频编码 -> 容器扩展名
+_NATIVE_EXT = {
+    "aac": "m4a",
+    "alac": "m4a",
+    "mp3": "mp3",
+    "opus": "ogg",
+    "vorbis": "ogg",
+    "flac": "flac",
+}
+
+
+def probe_audio_codec(path: str) -> Optional[str]:
+    """
+    返回第一条音轨的编码名（aac / mp3 / opus ...），无法识别时返回 None
+    """
+    command = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "a:0",
+        "-show_entries", "stream=codec_name",
+        "-of", "csv=p=0",
+        str(path),
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    codec = (result.stdout or "").strip().splitlines()
+    return codec[0].strip() if codec and codec[0].strip() else None
+
+
+def _transcode(input_path: str, output_path: str, bitrate: Optional[str] = None) -> str:
+    command = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-i", input_path, "-vn"]
+    if output_path.endswith(".mp3"):
+        command += ["-acodec", "libmp3lame"]
+    if bitrate:
+        command += ["-b:a", bitrate]
+    command += ["-y", output_path]
+    subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    if not os.path.exists(output_path):
+        raise RuntimeError(f"音频转换失败: {output_path}")
+    return output_path
+
+
+def extract_audio(input_path: str, output_base: Optional[str] = None) -> str:
+    """
+    从音视频文件中取出音轨：编码可直接封装时流复制到原生容器（不重新编码），否则转为 mp3。
+    :param output_base: 输出路径（不含扩展名），默认与输入同目录同名
+    :return: 音频文件路径；输入本身就是对应容器的纯音频时原样返回
+    """
+    if output_base is None:
+        output_base = os.path.splitext(input_path)[0]
+
+    ext = _NATIVE_EXT.get(probe_audio_codec(input_path) or "")
+    if ext:
+        output_path = f"{output_base}.{ext}"
+        if os.path.abspath(output_path) == os.path.abspath(input_path):
+            return input_path
+        command = [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-i", input_path,
+            "-vn", "-map", "0:a:0", "-c:a", "copy",
+            "-y", output_path,
+        ]
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if result.returncode == 0 and os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            return output_path
+        logger.warning(f"音轨流复制失败，改为转码 mp3：{result.stderr.decode(errors='ignore')[-300:]}")
+
+    output_path = f"{output_base}.mp3"
+    if os.path.abspath(output_path) == os.path.abspath(input_path):
+        return input_path
+    return _transcode(input_path, output_path)
+
+
+def ensure_audio_format(path: str, audio_format: Optional[str], output_dir: Optional[str] = None, bitrate: str = "64k") -> str:
+    """
+    转写器声明了必须的格式（如 mp3）且文件不是该格式时转换一次，否则原样返回。
+    转换结果写入 output_dir（默认与源文件同目录），已存在则直接复用。
+    """
+    if not audio_format:
+        return path
+    audio_format = audio_format.lower().lstrip(".")
+    if os.path.splitext(path)[1].lower().lstrip(".") == audio_format:
+        return path
+
+    output_dir = output_dir or os.path.dirname(path)
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, f"{os.path.splitext(os.path.basename(path))[0]}.{audio_format}")
+    if os.path.exists(output_path) and os.path.getmtime(output_path) >= os.path.getmtime(path):
+        return output_path
+    logger.info(f"转写器需要 {audio_format} 格式，转换音频：{os.path.basename(path)}")
+    return _transcode(path, output_path, bitrate)
@@ -0,0 +1,333 @@
+"""
+Transcription throughput benchmark.
+
+Runs every locally available CPU transcriber configuration (fast-whisper at each downloaded model size,
+int8 / float32, sequential / batched / chunked) over fixture audio of several lengths and prints JSON with
+real-time factor, load time, peak RSS and segment counts.
+
+    cd backend
+    python -m benchmarks.transcribe_bench --lengths 30,120,600 --output bench.json
+    python -m benchmarks.transcribe_bench --source talk.m4a --sizes tiny,base --compare bench.json
+
+Each configuration runs in its own subprocess with an empty cache directory, so model load time and peak RSS
+are not skewed by earlier runs and the PCM / transcript caches never serve a result. Fixtures are identified by
+sha256, so `--compare` only pairs runs over identical audio; it exits with status 1 when any RTF regressed by
+more than `--tolerance`.
+
+Without `--source` / `--fixture` the fixtures are synthetic (tone + noise): absolute RTF then differs from real
+speech, but numbers stay comparable between commits. Peak RSS covers the benchmark process only; chunked mode's
+worker processes are not included.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+_RESULT_MARKER = "BENCH_RESULT "
+
+MODES = ("sequential", "batched", "chunked")
+COMPUTE_TYPES = ("int8", "float32")
+
+
+# ---------------- fixtures ----------------
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _ffmpeg(args: list[str]) -> None:
+    subprocess.run(["ffmpeg", "-hide_banner", "-loglevel", "error", "-y", *args], check=True)
+
+
+def _make_fixture(seconds: int, source: Optional[str], out_dir: Path) -> Path:
+    if source:
+        out = out_dir / f"{Path(source).stem}_{seconds}s.wav"
+        if not out.exists():
+            # Loop the source clip until the requested length.
+            _ffmpeg(["-stream_loop", "-1", "-i", source, "-t", str(seconds), "-ac", "1", "-ar", "16000", str(out)])
+        return out
+
+    out = out_dir / f"synthetic_{seconds}s.wav"
+    if not out.exists():
+        _ffmpeg([
+            "-f", "lavfi", "-i", f"sine=frequency=220:sample_rate=16000:duration={seconds}",
+            "-f", "lavfi", "-i", f"anoisesrc=color=pink:amplitude=0.05:sample_rate=16000:duration={seconds}",
+            "-filter_complex", "amix=inputs=2:duration=shortest",
+            "-ac", "1", "-ar", "16000", str(out),
+        ])
+    return out
+
+
+def _probe_seconds(path: Path) -> Optional[float]:
+    try:
+        out = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", str(path)],
+            capture_output=True, text=True, check=True,
+        )
+        return float(out.stdout.strip())
+    except Exception:
+        return None
+
+
+def build_fixtures(args: argparse.Namespace, out_dir: Path) -> list[dict[str, Any]]:
+    paths = [Path(p) for p in args.fixture]
+    if not paths:
+        lengths = [int(x) for x in args.lengths.split(",") if x.strip()]
+        paths = [_make_fixture(seconds, args.source, out_dir) for seconds in lengths]
+    return [
+        {
+            "name": p.name,
+            "path": str(p.resolve()),
+            "sha256": _sha256(p),
+            "audio_seconds": _probe_seconds(p),
+            "synthetic": not args.fixture and not args.source,
+        }
+        for p in paths
+    ]
+
+
+# ---------------- configurations ----------------
+
+def available_sizes() -> list[str]:
+    from app.transcriber.whisper import MODEL_MAP
+    from app.utils.path_helper import get_model_dir
+
+    model_dir = get_model_dir("whisper")
+    return [size for size in MODEL_MAP if os.path.isdir(os.path.join(model_dir, f"whisper-{size}"))]
+
+
+def build_configs(args: argparse.Namespace) -> list[dict[str, Any]]:
+    sizes = [s for s in args.sizes.split(",") if s.strip()] if args.sizes else available_sizes()
+    compute_types = [c for c in args.compute_types.split(",") if c.strip()]
+    modes = [m for m in args.modes.split(",") if m.strip()]
+    try:
+        from faster_whisper import BatchedInferencePipeline  # noqa: F401
+    except ImportError:
+        modes = [m for m in modes if m != "batched"]
+    if args.chunk_workers <= 1:
+        modes = [m for m in modes if m != "chunked"]
+    return [
+        {"name": f"{mode}/{size}/{compute_type}", "mode": mode, "model_size": size, "compute_type": compute_type}
+        for size in sizes
+        for compute_type in compute_types
+        for mode in modes
+    ]
+
+
+# ---------------- worker (one configuration per process) ----------------
+
+def run_worker(spec: dict[str, Any]) -> dict[str, Any]:
+    import app.transcriber.whisper as whisper_module
+    from app.services.stage_metrics import StageMeter, current_rss_bytes
+
+    config = spec["config"]
+    mode = config["mode"]
+    whisper_module.WHISPER_CHUNK_WORKERS = spec["chunk_workers"] if mode == "chunked" else 0
+    whisper_module.WHISPER_CHUNK_SECONDS = spec["chunk_seconds"]
+
+    rss_before = current_rss_bytes()
+    started = time.perf_counter()
+    if mode == "batched":
+        from app.transcriber.whisper_batched import BatchedWhisperTranscriber as cls
+    else:
+        cls = whisper_module.WhisperTranscriber
+    transcriber = cls(model_size=config["model_size"], device="cpu", compute_type=config["compute_type"])
+    load_seconds = time.perf_counter() - started
+    rss_after = current_rss_bytes()
+
+    runs = []
+    for fixture in spec["fixtures"]:
+        seconds = fixture["audio_seconds"]
+        if mode == "chunked" and not transcriber._use_chunked(seconds):
+            runs.append({"fixture": fixture["sha256"], "skipped": "shorter than 1.5x chunk length"})
+            continue
+        meter = StageMeter("transcribe")
+        try:
+            with meter:
+                result = transcriber.transcript(fixture["path"], total_duration=seconds)
+        except Exception as exc:
+            runs.append({"fixture": fixture["sha256"], "error": f"{type(exc).__name__}: {exc}"})
+            continue
+        data = meter.result(audio_seconds=seconds)
+        runs.append({
+            "fixture": fixture["sha256"],
+            "wall_seconds": data["wall_seconds"],
+            "rtf": data.get("rtf"),
+            "process_cpu_seconds": data["process_cpu_seconds"],
+            "cores_used": data["cores_used"],
+            "peak_rss_bytes": data["peak_rss_bytes"],
+            "segments": len(result.segments),
+            "chars": len(result.full_text),
+            "language": result.language,
+        })
+
+    runner = getattr(transcriber, "_chunk_runner", None)
+    if runner is not None:
+        runner.shutdown()
+    return {
+        "load_seconds": round(load_seconds, 3),
+        "model_rss_bytes": (rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+        "cpu_threads": transcriber.cpu_threads,
+        "runs": runs,
+    }
+
+
+def _spawn_worker(spec: dict[str, Any], args: argparse.Namespace) -> dict[str, Any]:
+    cache_dir = tempfile.mkdtemp(prefix="bench_cache_")
+    env = dict(os.environ)
+    env.update({
+        "CACHE_DIR": cache_dir,
+        "TRANSCRIBE_VAD": "false",
+        "TRANSCRIBE_CPU_THREADS": str(args.threads or os.cpu_count() or 1),
+    })
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.transcribe_bench", "--worker", json.dumps(spec)],
+            cwd=str(BACKEND_DIR), env=env, capture_output=True, text=True,
+        )
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith(_RESULT_MARKER):
+            return json.loads(line[len(_RESULT_MARKER):])
+    tail = (proc.stderr or proc.stdout or "").strip().splitlines()[-5:]
+    return {"error": f"worker exited with {proc.returncode}", "log_tail": tail}
+
+
+# ---------------- report ----------------
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=str(BACKEND_DIR), capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _versions() -> dict[str, Optional[str]]:
+    versions: dict[str, Optional[str]] = {}
+    for name in ("faster_whisper", "ctranslate2", "av", "numpy"):
+        try:
+            versions[name] = getattr(__import__(name), "__version__", None)
+        except Exception:
+            versions[name] = None
+    return versions
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[dict[str, Any]]:
+    def _index(report: dict[str, Any]) -> dict[tuple, float]:
+        out = {}
+        for entry in report.get("results", []):
+            for run in entry.get("runs", []):
+                if run.get("rtf") is not None:
+                    out[(entry["config"]["name"], run["fixture"])] = run["rtf"]
+        return out
+
+    before, after = _index(baseline), _index(current)
+    rows = []
+    for key in sorted(set(before) & set(after)):
+        old, new = before[key], after[key]
+        change = (new - old) / old if old else 0.0
+        rows.append({
+            "config": key[0],
+            "fixture": key[1][:12],
+            "rtf_before": old,
+            "rtf_after": new,
+            "change": round(change, 4),
+            "regressed": change > tolerance,
+        })
+    return rows
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark local transcribers (RTF, load time, peak RSS).")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--fixture", action="append", default=[], help="audio file to benchmark (repeatable)")
+    parser.add_argument("--source", help="clip looped/trimmed to --lengths (default: synthetic tone + noise)")
+    parser.add_argument("--lengths", default="30,120,600", help="fixture lengths in seconds")
+    parser.add_argument("--fixtures-dir", help="keep generated fixtures here (default: temp dir)")
+    parser.add_argument("--sizes", help="model sizes (default: sizes already downloaded)")
+    parser.add_argument("--compute-types", default=",".join(COMPUTE_TYPES))
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--chunk-workers", type=int, default=2, help="processes for chunked mode (<=1 skips it)")
+    parser.add_argument("--chunk-seconds", type=float, default=60.0, help="chunk length for chunked mode")
+    parser.add_argument("--threads", type=int, default=0, help="TRANSCRIBE_CPU_THREADS for every run")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--compare", help="previous JSON report to compare RTF against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative RTF increase")
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(_RESULT_MARKER + json.dumps(run_worker(json.loads(args.worker))), flush=True)
+        return 0
+
+    fixtures_dir = Path(args.fixtures_dir or tempfile.mkdtemp(prefix="bench_fixtures_"))
+    fixtures_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        fixtures = build_fixtures(args, fixtures_dir)
+        configs = build_configs(args)
+        if not configs:
+            print("No local Whisper models found; pass --sizes to download some.", file=sys.stderr)
+            return 2
+
+        results = []
+        for config in configs:
+            print(f"[bench] {config['name']}", file=sys.stderr, flush=True)
+            spec = {
+                "config": config,
+                "fixtures": fixtures,
+                "chunk_workers": args.chunk_workers,
+                "chunk_seconds": args.chunk_seconds,
+            }
+            results.append({"config": config, **_spawn_worker(spec, args)})
+    finally:
+        if not args.fixtures_dir:
+            shutil.rmtree(fixtures_dir, ignore_errors=True)
+
+    report: dict[str, Any] = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "threads": args.threads or os.cpu_count(),
+            "versions": _versions(),
+        },
+        "fixtures": [{k: v for k, v in f.items() if k != "path"} for f in fixtures],
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        rows = compare(report, baseline, args.tolerance)
+        report["comparison"] = {"baseline_commit": baseline.get("meta", {}).get("commit"), "rows": rows}
+        if any(row["regressed"] for row in rows):
+            exit_code = 1
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,6 +17,7 @@ from app.exceptions.exception_handlers import register_exception_handlers
 # from app.db.provider_dao import init_provider_table
 from app.utils.logger import get_logger
 from app import create_app
+from app.routers.note import recover_note_jobs
 from app.transcriber.transcriber_provider import get_transcriber
 from app.utils.paths import ensure_dir, screenshots_root_dir, static_dir as get_static_dir, static_mount_path, uploads_dir as get_uploads_dir
 from events import register_handler
@@ -36,6 +37,9 @@ async def lifespan(app: FastAPI):
     init_db()
     get_transcriber(transcriber_type=os.getenv("TRANSCRIBER_TYPE", "fast-whisper"))
     seed_default_providers()
+    recovered = recover_note_jobs()
+    if recovered:
+        logger.info(f"已恢复 {recovered} 个未完成的笔记任务")
     yield
 
 app = create_app(lifespan=lifespan)
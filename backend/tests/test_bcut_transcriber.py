@@ -0,0 +1,229 @@
+"""
+BcutTranscriber against a local stub of the rubick-interface API (BCUT_API_BASE_URL points at it).
+"""
+import importlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+import app.transcriber.bcut as bcut_module
+from app.services.task_manager import TaskCancelledError
+
+PART_SIZE = 4
+
+
+class StubBcut:
+    """
+    In-memory rubick-interface: upload parts can be delayed / failed per index, task state is scripted.
+    """
+
+    def __init__(self, parts: int):
+        self.parts = parts
+        self.part_delays: dict[int, float] = {}
+        self.part_failures: dict[int, int] = {}  # index -> number of PUTs to reject (-1: always)
+        self.put_attempts: dict[int, int] = {}
+        self.finished_parts: list[int] = []
+        self.committed_etags: str | None = None
+        self.task_states: list[int] = [4]
+        self.polls = 0
+        self.utterances = [
+            {"transcript": "你好", "start_time": 0, "end_time": 1200},
+            {"transcript": "世界", "start_time": 1200, "end_time": 2500},
+        ]
+        self.lock = threading.Lock()
+        self.release = threading.Event()  # lets delayed parts finish early on teardown
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/rubick-interface"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _json(self, payload: dict, status: int = 200, headers: dict | None = None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+            def do_POST(self):
+                path = urlparse(self.path).path
+                body = self._body()
+                if path.endswith("/resource/create"):
+                    size = json.loads(body)["size"]
+                    self._json({"code": 0, "data": {
+                        "size": size,
+                        "per_size": PART_SIZE,
+                        "upload_urls": [f"{stub.base_url}/upload/{i}" for i in range(stub.parts)],
+                        "in_boss_key": "boss-key",
+                        "resource_id": "resource-1",
+                        "upload_id": "upload-1",
+                    }})
+                elif path.endswith("/resource/create/complete"):
+                    stub.committed_etags = json.loads(body)["Etags"]
+                    self._json({"code": 0, "data": {"download_url": "https://stub/resource-1"}})
+                elif path.endswith("/task"):
+                    self._json({"code": 0, "data": {"task_id": "task-1"}})
+                else:
+                    self._json({"code": -1, "message": "not found"}, status=404)
+
+            def do_PUT(self):
+                index = int(urlparse(self.path).path.rsplit("/", 1)[1])
+                self._body()
+                with stub.lock:
+                    stub.put_attempts[index] = stub.put_attempts.get(index, 0) + 1
+                    failures = stub.part_failures.get(index, 0)
+                    fail = failures == -1 or stub.put_attempts[index] <= failures
+                if fail:
+                    self._json({"code": -1}, status=500)
+                    return
+                stub.release.wait(stub.part_delays.get(index, 0))
+                with stub.lock:
+                    stub.finished_parts.append(index)
+                self._json({}, headers={"Etag": f'"etag-{index}"'})
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                assert query["task_id"] == ["task-1"]
+                with stub.lock:
+                    state = stub.task_states[min(stub.polls, len(stub.task_states) - 1)]
+                    stub.polls += 1
+                data = {"task_id": "task-1", "state": state}
+                if state == 4:
+                    data["result"] = json.dumps({"language": "zh", "utterances": stub.utterances})
+                self._json({"code": 0, "data": data})
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    server = StubBcut(parts=4)
+    server.start()
+    monkeypatch.setenv("BCUT_API_BASE_URL", server.base_url)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def bcut(stub, monkeypatch):
+    # API_* are derived from BCUT_API_BASE_URL at import time
+    module = importlib.reload(bcut_module)
+    monkeypatch.setattr(module, "BCUT_UPLOAD_CONCURRENCY", 4)
+    monkeypatch.setattr(module, "BCUT_UPLOAD_RETRIES", 2)
+    return module
+
+
+@pytest.fixture
+def transcriber(bcut):
+    instance = bcut.BcutTranscriber()
+    instance.session.trust_env = False  # never route the stub through a proxy
+    yield instance
+    instance.session.close()
+
+
+@pytest.fixture
+def audio_file(tmp_path, stub):
+    path = tmp_path / "audio.mp3"
+    path.write_bytes(bytes(range(PART_SIZE * stub.parts - 1)))
+    return path
+
+
+def test_transcript_against_stub_server(transcriber, stub, audio_file):
+    result = transcriber.transcript(str(audio_file))
+
+    assert stub.committed_etags == "etag-0,etag-1,etag-2,etag-3"
+    assert [(s.start, s.end, s.text) for s in result.segments] == [(0.0, 1.2, "你好"), (1.2, 2.5, "世界")]
+    assert result.full_text == "你好 世界"
+
+
+def test_etags_keep_part_order_when_parts_finish_out_of_order(transcriber, stub, audio_file):
+    stub.part_delays = {0: 0.6, 1: 0.4, 2: 0.2}
+
+    download_url = transcriber._upload(str(audio_file))
+
+    assert download_url == "https://stub/resource-1"
+    assert stub.finished_parts == [3, 2, 1, 0]
+    assert stub.committed_etags == "etag-0,etag-1,etag-2,etag-3"
+
+
+def test_failed_put_is_retried(transcriber, bcut, stub, audio_file, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(bcut.time, "sleep", sleeps.append)
+    stub.part_failures = {1: 1}
+
+    transcriber._upload(str(audio_file))
+
+    assert stub.put_attempts[1] == 2
+    assert sleeps == [1]
+    assert stub.committed_etags == "etag-0,etag-1,etag-2,etag-3"
+
+
+def test_failed_put_gives_up_after_retries(transcriber, bcut, stub, audio_file, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(bcut.time, "sleep", sleeps.append)
+    stub.part_failures = {2: -1}
+
+    with pytest.raises(requests.HTTPError):
+        transcriber._upload(str(audio_file))
+
+    assert stub.put_attempts[2] == bcut.BCUT_UPLOAD_RETRIES + 1
+    assert sleeps == [1, 2]
+    assert stub.committed_etags is None
+
+
+def test_cancel_during_poll_backoff(transcriber, bcut, stub, monkeypatch):
+    monkeypatch.setattr(bcut, "_POLL_INITIAL_INTERVAL", 30.0)
+    stub.task_states = [1]
+    cancelled = threading.Event()
+    threading.Timer(0.3, cancelled.set).start()
+
+    started = time.monotonic()
+    with pytest.raises(TaskCancelledError):
+        transcriber._wait_result("task-1", cancelled.is_set)
+
+    assert stub.polls == 1
+    assert time.monotonic() - started < 2.0
+
+
+def test_poll_timeout_raises(transcriber, bcut, stub, monkeypatch):
+    monkeypatch.setattr(bcut, "BCUT_POLL_TIMEOUT_SECONDS", 0.3)
+    monkeypatch.setattr(bcut, "_POLL_INITIAL_INTERVAL", 0.05)
+    stub.task_states = [1]
+
+    started = time.monotonic()
+    with pytest.raises(Exception, match="未能在"):
+        transcriber._wait_result("task-1")
+
+    assert stub.polls >= 2
+    assert time.monotonic() - started < 2.0
+
+
+def test_failed_task_state_raises(transcriber, stub):
+    stub.task_states = [1, 3]
+
+    with pytest.raises(Exception, match="状态码: 3"):
+        transcriber._wait_result("task-1")
@@ -0,0 +1,116 @@
+"""
+DiskLRUCache: LRU eviction, pinned entries, TTL expiry and rebuilding the index after a restart.
+"""
+import pytest
+
+from app.services.disk_cache import DiskLRUCache
+
+PAYLOAD = 10_000
+# Room for two entries (payload + meta.json), not three.
+MAX_BYTES = 25_000
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "payload.bin"
+    path.write_bytes(b"\0" * PAYLOAD)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskLRUCache("test", tmp_path / "cache", max_bytes=MAX_BYTES)
+
+
+def _put(cache, key, source):
+    return cache.put(key, files={"payload.bin": source}, meta={"key": key})
+
+
+def _expire(cache, key):
+    cache._index[cache.digest(key)].created_at -= 3600
+
+
+def test_least_recently_used_entry_is_evicted(cache, source):
+    _put(cache, "a", source)
+    _put(cache, "b", source)
+    assert cache.get("a") is not None
+
+    _put(cache, "c", source)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.evictions == 1
+
+
+def test_pinned_entry_is_never_evicted(cache, source):
+    entry = _put(cache, "a", source)
+    cache.pin("a")
+
+    _put(cache, "b", source)
+    _put(cache, "c", source)
+
+    # "a" is the oldest but pinned: "b" goes instead.
+    assert entry.file("payload.bin").exists()
+    assert cache.get("b") is None
+
+    cache.unpin("a")
+    _put(cache, "d", source)
+    assert cache.get("a") is None
+
+
+def test_unpin_evicts_when_over_budget(cache, source):
+    _put(cache, "a", source)
+    _put(cache, "b", source)
+    cache.pin("a")
+    cache.pin("b")
+    _put(cache, "c", source)
+
+    # Nothing unpinned to evict but the new entry itself (which is kept).
+    assert all(cache.get(key) is not None for key in ("a", "b", "c"))
+
+    cache.unpin("a")
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+
+def test_expired_entry_is_dropped_unless_pinned(tmp_path, source):
+    cache = DiskLRUCache("test-ttl", tmp_path / "cache", max_bytes=None, ttl_seconds=60)
+    expired = _put(cache, "a", source)
+    pinned = _put(cache, "b", source)
+    cache.pin("b")
+    _expire(cache, "a")
+    _expire(cache, "b")
+
+    assert cache.get("a") is None
+    assert not expired.path.exists()
+    assert cache.get("b") is not None
+    assert pinned.file("payload.bin").exists()
+
+    cache.unpin("b")
+    assert not pinned.path.exists()
+
+
+def test_key_lock_protects_entry_being_produced(cache, source):
+    _put(cache, "a", source)
+    _put(cache, "b", source)
+
+    with cache.key_lock("a"):
+        _put(cache, "c", source)
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+
+
+def test_index_is_rebuilt_from_disk_in_lru_order(tmp_path, source):
+    first = DiskLRUCache("test-restart", tmp_path / "cache", max_bytes=MAX_BYTES)
+    _put(first, "a", source)
+    _put(first, "b", source)
+    first.put("doc", data={"answer": 42})
+    assert first.get("a") is not None  # "b" is now the least recently used file entry
+
+    second = DiskLRUCache("test-restart", tmp_path / "cache", max_bytes=MAX_BYTES)
+    assert second.read_data(second.get("doc")) == {"answer": 42}
+    _put(second, "c", source)
+
+    assert second.get("b") is None
+    assert second.get("a") is not None
@@ -0,0 +1,199 @@
+"""
+GroqTranscriber chunked path against a local stub of the OpenAI-compatible /audio/transcriptions endpoint.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from openai import OpenAI
+
+import app.transcriber.groq as groq_module
+from app.services.task_manager import TaskCancelledError
+from app.transcriber.groq import GroqTranscriber
+from app.utils.audio_chunker import plan_chunks
+
+DURATION = 36.0
+# Cuts land in these silences (12s / 24s); chunks overlap the previous one by 1s.
+CHUNKS = plan_chunks(DURATION, [(11.8, 12.2), (23.8, 24.2)], target_seconds=12, overlap_seconds=1.0)
+# Ground truth on the original timeline; s3 / s6 lie partly inside the next chunk's overlap.
+SPEECH = [
+    (0.5, 4.0, "s1"), (4.2, 8.0, "s2"), (8.3, 11.8, "s3"),
+    (12.2, 15.0, "s4"), (15.2, 19.0, "s5"), (19.5, 23.8, "s6"),
+    (24.2, 28.0, "s7"), (28.5, 32.0, "s8"), (32.2, 35.5, "s9"),
+]
+
+
+class StubTranscriptions:
+    """
+    Answers each uploaded chunk with the speech that overlaps its window (clipped, chunk-local timestamps),
+    like a real ASR endpoint would for a cut of the original audio.
+    """
+
+    def __init__(self):
+        self.delays: dict[int, float] = {}
+        self.requested: list[int] = []
+        self.completed: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.on_response = None
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/openai/v1"
+
+    def response_for(self, index: int) -> dict:
+        chunk = CHUNKS[index]
+        segments = []
+        for start, end, text in SPEECH:
+            if end <= chunk.start or start >= chunk.end:
+                continue
+            local_start = max(start, chunk.start) - chunk.start
+            local_end = min(end, chunk.end) - chunk.start
+            segments.append({
+                "id": len(segments), "seek": 0, "start": local_start, "end": local_end, "text": f" {text}",
+                "tokens": [], "temperature": 0.0, "avg_logprob": -0.1, "compression_ratio": 1.0,
+                "no_speech_prob": 0.0,
+            })
+        return {
+            "task": "transcribe",
+            "language": "english",
+            "duration": chunk.end - chunk.start,
+            "text": " ".join(seg["text"].strip() for seg in segments),
+            "segments": segments,
+        }
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                assert self.path.endswith("/audio/transcriptions")
+                index = int(re.search(rb'filename="chunk_(\d+)', body).group(1))
+                with stub.lock:
+                    stub.requested.append(index)
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                time.sleep(stub.delays.get(index, 0.05))
+                with stub.lock:
+                    stub.in_flight -= 1
+                    stub.completed.append(index)
+                if stub.on_response:
+                    stub.on_response(index)
+                payload = json.dumps(stub.response_for(index)).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+@pytest.fixture
+def stub():
+    server = StubTranscriptions()
+    threading.Thread(target=server.server.serve_forever, daemon=True).start()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+
+@pytest.fixture
+def client(stub):
+    return OpenAI(api_key="test", base_url=stub.base_url, max_retries=0)
+
+
+@pytest.fixture(autouse=True)
+def fake_cut(monkeypatch):
+    # Stands in for the ffmpeg stream copy: the stub only needs to know which chunk it receives.
+    def _cut(path, chunk, output_dir):
+        output = f"{output_dir}/chunk_{chunk.index:04d}.mp3"
+        with open(output, "wb") as f:
+            f.write(b"\0" * 64)
+        return output
+
+    monkeypatch.setattr(groq_module, "_cut_chunk", _cut)
+    monkeypatch.setattr(groq_module, "_provider_slots", {})
+    monkeypatch.setenv("GROQ_TRANSCRIBER_MODEL", "whisper-stub")
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    path = tmp_path / "audio.m4a"
+    path.write_bytes(b"\0" * 1024)
+    return path
+
+
+def _assert_matches_speech(segments):
+    assert [seg.text for seg in segments] == [text for _, _, text in SPEECH]
+    for seg, (start, end, _) in zip(segments, SPEECH):
+        assert seg.start == pytest.approx(start)
+        assert seg.end == pytest.approx(end)
+
+
+def test_chunks_are_merged_in_order_without_duplicates(stub, client, audio_file):
+    # The first chunk finishes last.
+    stub.delays = {0: 0.4, 1: 0.2}
+    progress = []
+
+    language, segments, raw = GroqTranscriber()._transcript_chunked(
+        client, str(audio_file), CHUNKS, progress.append, None
+    )
+
+    assert stub.completed[-1] == 0
+    _assert_matches_speech(segments)
+    assert language == "english"
+    assert len(raw) == len(CHUNKS)
+    assert progress[-1] == pytest.approx(DURATION)
+
+
+def test_transcript_splits_oversized_file(stub, client, audio_file, monkeypatch):
+    monkeypatch.setattr(groq_module, "MAX_SIZE_BYTES", 100)
+    monkeypatch.setattr(GroqTranscriber, "_client", lambda self: client)
+    monkeypatch.setattr(GroqTranscriber, "_plan", lambda self, *args: CHUNKS)
+
+    result = GroqTranscriber().transcript(str(audio_file), total_duration=DURATION)
+
+    _assert_matches_speech(result.segments)
+    assert result.full_text == " ".join(text for _, _, text in SPEECH)
+    assert len(result.raw["chunks"]) == len(CHUNKS)
+
+
+def test_provider_slot_caps_concurrency_across_tasks(stub, client, audio_file, monkeypatch):
+    monkeypatch.setattr(groq_module, "GROQ_CONCURRENCY", 2)
+    stub.delays = {0: 0.2, 1: 0.2, 2: 0.2}
+    results = []
+
+    def _task():
+        results.append(GroqTranscriber()._transcript_chunked(client, str(audio_file), CHUNKS, None, None))
+
+    # Two tasks on the same provider: each pool has 2 workers, the shared slot still allows only 2 requests.
+    threads = [threading.Thread(target=_task) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 2
+    assert len(stub.requested) == 2 * len(CHUNKS)
+    assert stub.max_in_flight == 2
+
+
+def test_cancel_drops_pending_chunks(stub, client, audio_file, monkeypatch):
+    monkeypatch.setattr(groq_module, "GROQ_CONCURRENCY", 1)
+    cancelled = threading.Event()
+    stub.on_response = lambda index: cancelled.set()
+
+    with pytest.raises(TaskCancelledError):
+        GroqTranscriber()._transcript_chunked(client, str(audio_file), CHUNKS, None, cancelled.is_set)
+
+    # Chunk 0 completes and chunk 1 may already be running; chunk 2 is never sent.
+    assert 0 in stub.requested
+    assert 2 not in stub.requested
@@ -0,0 +1,151 @@
+"""
+JobScheduler: stage pipelining, hand-off back-pressure and cancellation of queued jobs.
+"""
+import threading
+import time
+
+import pytest
+
+from app.services.job_scheduler import JobScheduler
+
+WAIT = 5.0
+
+
+def _wait_until(predicate, timeout: float = WAIT) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached in time")
+        time.sleep(0.01)
+
+
+class Pipeline:
+    """
+    Records which job ran which stage; `gates[stage]` (when set) blocks that stage until released.
+    """
+
+    def __init__(self):
+        self.ran: list[tuple[str, str]] = []
+        self.finished: list[str] = []
+        self.gates: dict[str, threading.Event] = {}
+        self.fail: set[tuple[str, str]] = set()
+        self.lock = threading.Lock()
+        self.done = threading.Condition(self.lock)
+
+    def handler(self, stage: str):
+        def _run(task_id: str) -> bool:
+            with self.lock:
+                self.ran.append((task_id, stage))
+            gate = self.gates.get(stage)
+            if gate is not None:
+                assert gate.wait(WAIT)
+            return (task_id, stage) not in self.fail
+
+        return (stage, _run)
+
+    def handlers(self, *stages: str):
+        return [self.handler(stage) for stage in stages]
+
+    def on_finish(self, task_id: str) -> None:
+        with self.done:
+            self.finished.append(task_id)
+            self.done.notify_all()
+
+    def wait_finished(self, count: int) -> None:
+        with self.done:
+            assert self.done.wait_for(lambda: len(self.finished) >= count, WAIT)
+
+    def stages_of(self, task_id: str) -> list[str]:
+        with self.lock:
+            return [stage for tid, stage in self.ran if tid == task_id]
+
+
+@pytest.fixture
+def pipeline():
+    return Pipeline()
+
+
+def _scheduler(handoff_size: int = 1) -> JobScheduler:
+    return JobScheduler(stage_limits={"download": 1, "transcribe": 1, "summarize": 1, "ingest": 1}, handoff_size=handoff_size)
+
+
+def test_stages_run_in_order_and_finish_hook_fires(pipeline):
+    scheduler = _scheduler()
+    stages = ("download", "transcribe", "summarize", "ingest")
+
+    for tid in ("a", "b"):
+        scheduler.submit(tid, tid, pipeline.handlers(*stages), on_finish=pipeline.on_finish)
+    pipeline.wait_finished(2)
+
+    assert pipeline.stages_of("a") == list(stages)
+    assert pipeline.stages_of("b") == list(stages)
+    assert scheduler.snapshot()["in_flight"] == 0
+
+
+def test_failed_stage_stops_the_job(pipeline):
+    scheduler = _scheduler()
+    pipeline.fail = {("a", "transcribe")}
+
+    scheduler.submit("a", "a", pipeline.handlers("download", "transcribe", "summarize"), on_finish=pipeline.on_finish)
+    pipeline.wait_finished(1)
+
+    assert pipeline.stages_of("a") == ["download", "transcribe"]
+
+
+def test_full_handoff_queue_holds_back_the_previous_stage(pipeline):
+    scheduler = _scheduler(handoff_size=1)
+    pipeline.gates["transcribe"] = gate = threading.Event()
+    handlers = pipeline.handlers("download", "transcribe")
+
+    for tid in ("a", "b", "c", "d"):
+        scheduler.submit(tid, tid, handlers, on_finish=pipeline.on_finish)
+
+    # a transcribes (blocked), b waits in the transcribe queue (size 1), c finished downloading but
+    # its download worker is stuck handing it off, so d is not started.
+    _wait_until(lambda: pipeline.stages_of("c") == ["download"])
+    time.sleep(0.1)
+    snapshot = scheduler.snapshot()
+    assert snapshot["stages"]["transcribe"] == {"workers": 1, "active": 1, "queued": 1}
+    assert snapshot["stages"]["download"]["active"] == 1
+    assert scheduler.waiting_stage("b") == ("transcribe", 1)
+    assert scheduler.waiting_stage("c") == (None, None)
+    assert scheduler.queue_position("d") == 1
+    assert pipeline.stages_of("d") == []
+
+    gate.set()
+    pipeline.wait_finished(4)
+    assert pipeline.finished == ["a", "b", "c", "d"]
+
+
+def test_cancel_drops_queued_job(pipeline):
+    scheduler = _scheduler()
+    pipeline.gates["download"] = gate = threading.Event()
+    handlers = pipeline.handlers("download", "transcribe")
+
+    scheduler.submit("a", "a", handlers, on_finish=pipeline.on_finish)
+    _wait_until(lambda: pipeline.stages_of("a") == ["download"])
+    assert scheduler.submit("b", "b", handlers, on_finish=pipeline.on_finish) == 1
+
+    assert scheduler.cancel("b") is True
+    assert scheduler.cancel("a") is False  # already running: cancelled cooperatively elsewhere
+    gate.set()
+    pipeline.wait_finished(2)
+
+    assert pipeline.stages_of("b") == []
+    assert pipeline.stages_of("a") == ["download", "transcribe"]
+
+
+def test_resubmitting_an_in_flight_task_is_ignored(pipeline):
+    scheduler = _scheduler()
+    pipeline.gates["download"] = gate = threading.Event()
+    handlers = pipeline.handlers("download")
+
+    scheduler.submit("a", "a", handlers, on_finish=pipeline.on_finish)
+    _wait_until(lambda: pipeline.stages_of("a") == ["download"])
+    scheduler.submit("b", "b", handlers, on_finish=pipeline.on_finish)
+    assert scheduler.submit("b", "b", handlers, on_finish=pipeline.on_finish) == 1
+
+    gate.set()
+    pipeline.wait_finished(2)
+    time.sleep(0.1)
+    assert pipeline.finished == ["a", "b"]
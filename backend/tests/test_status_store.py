@@ -0,0 +1,103 @@
+"""
+TaskStatusStore: debounced writes, write-through on status changes, eviction of clean entries.
+"""
+import json
+import threading
+import time
+
+import pytest
+
+from app.services.status_store import TaskStatusStore
+
+
+@pytest.fixture
+def status_dir(tmp_path):
+    return tmp_path
+
+
+def _store(status_dir, **kwargs) -> TaskStatusStore:
+    return TaskStatusStore(lambda tid: status_dir / tid / f"{tid}.status.json", **kwargs)
+
+
+def _on_disk(status_dir, task_id: str):
+    path = status_dir / task_id / f"{task_id}.status.json"
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+
+def test_progress_updates_are_debounced_into_one_write(status_dir):
+    store = _store(status_dir, debounce_seconds=0.3)
+
+    for progress in range(10):
+        store.update("t1", {"status": "TRANSCRIBING", "progress": progress})
+
+    assert store.get("t1")["progress"] == 9
+    assert _on_disk(status_dir, "t1") is None
+
+    deadline = time.monotonic() + 5
+    while _on_disk(status_dir, "t1") is None and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert _on_disk(status_dir, "t1") == {"status": "TRANSCRIBING", "progress": 9}
+
+
+def test_flush_on_change_writes_through_only_when_the_value_changes(status_dir):
+    store = _store(status_dir, debounce_seconds=60)
+
+    store.update("t1", {"status": "DOWNLOADING", "progress": 1}, flush_on_change=("status",))
+    assert _on_disk(status_dir, "t1") == {"status": "DOWNLOADING", "progress": 1}
+
+    store.update("t1", {"status": "DOWNLOADING", "progress": 5}, flush_on_change=("status",))
+    assert _on_disk(status_dir, "t1")["progress"] == 1
+
+    previous, current = store.update("t1", {"status": "TRANSCRIBING"}, flush_on_change=("status",))
+    assert previous == {"status": "DOWNLOADING", "progress": 5}
+    assert current == {"status": "TRANSCRIBING", "progress": 5}
+    assert _on_disk(status_dir, "t1") == current
+
+
+def test_concurrent_transitions_flush_exactly_once(status_dir, monkeypatch):
+    store = _store(status_dir, debounce_seconds=60)
+    store.update("t1", {"status": "DOWNLOADING"}, flush=True)
+    writes = []
+    real_write = store._write
+    monkeypatch.setattr(store, "_write", lambda tid, data: (writes.append(data), real_write(tid, data)))
+
+    barrier = threading.Barrier(8)
+
+    def _transition():
+        barrier.wait()
+        store.update("t1", {"status": "TRANSCRIBING"}, flush_on_change=("status",))
+
+    threads = [threading.Thread(target=_transition) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Only the update that actually changed the status writes through.
+    assert writes == [{"status": "TRANSCRIBING"}]
+
+
+def test_get_loads_from_disk_and_drop_removes_keys(status_dir):
+    path = status_dir / "t1" / "t1.status.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps({"status": "FAILED", "message": "boom"}), encoding="utf-8")
+    store = _store(status_dir)
+
+    assert store.get("t1") == {"status": "FAILED", "message": "boom"}
+    assert store.get("missing") is None
+
+    store.update("t1", {"status": "PENDING"}, drop=("message",), flush=True)
+    assert _on_disk(status_dir, "t1") == {"status": "PENDING"}
+
+
+def test_only_clean_entries_are_evicted(status_dir):
+    store = _store(status_dir, debounce_seconds=60, max_cached=1)
+
+    store.update("dirty", {"progress": 1})
+    store.update("clean", {"progress": 2}, flush=True)
+
+    # "dirty" has not reached disk yet, so it must stay in memory even over the limit.
+    assert store.get("dirty") == {"progress": 1}
+    store.flush()
+    assert _on_disk(status_dir, "dirty") == {"progress": 1}
+    assert len(store._entries) == 1
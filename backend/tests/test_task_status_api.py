@@ -0,0 +1,117 @@
+"""
+GET /api/task_status/{task_id}: ETag / If-None-Match and `fields` / segment projection.
+"""
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.routers.note as note_router
+
+RESULT = {
+    "markdown": "# 笔记",
+    "transcript": {
+        "language": "zh",
+        "full_text": "一 二 三",
+        "segments": [{"start": float(i), "end": float(i + 1), "text": t} for i, t in enumerate("一二三")],
+    },
+    "audio_meta": {"title": "视频", "duration": 3},
+}
+
+
+@pytest.fixture
+def statuses(tmp_path, monkeypatch):
+    statuses: dict[str, dict] = {}
+    monkeypatch.setattr(note_router, "_read_task_status", lambda tid: statuses.get(tid))
+    monkeypatch.setattr(note_router, "_task_result_path", lambda tid: tmp_path / f"{tid}.json")
+    monkeypatch.setattr(note_router, "_legacy_result_path", lambda tid: tmp_path / "legacy" / f"{tid}.json")
+    monkeypatch.setattr(note_router, "_etag_memo", type(note_router._etag_memo)())
+    monkeypatch.setattr(note_router, "_result_cache", type(note_router._result_cache)())
+    return statuses
+
+
+@pytest.fixture
+def result_file(tmp_path, statuses):
+    statuses["t1"] = {"status": "SUCCESS", "progress": 100}
+    path = tmp_path / "t1.json"
+    path.write_text(json.dumps(RESULT, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(note_router.router, prefix="/api")
+    return TestClient(app)
+
+
+def test_matching_if_none_match_returns_304(client, result_file):
+    first = client.get("/api/task_status/t1")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert first.json()["data"]["result"] == RESULT
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    again = client.get("/api/task_status/t1", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == etag
+
+    weak = client.get("/api/task_status/t1", headers={"If-None-Match": f'"other", W/{etag}'})
+    assert weak.status_code == 304
+
+
+def test_finished_task_304_does_not_read_the_result(client, result_file, monkeypatch):
+    etag = client.get("/api/task_status/t1").headers["ETag"]
+
+    def _unexpected(path):
+        raise AssertionError("result file read for a conditional GET")
+
+    monkeypatch.setattr(note_router, "_load_result_json", _unexpected)
+    assert client.get("/api/task_status/t1", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_changed_result_gets_a_new_etag(client, result_file):
+    etag = client.get("/api/task_status/t1").headers["ETag"]
+    result_file.write_text(json.dumps({**RESULT, "markdown": "# 新笔记"}, ensure_ascii=False), encoding="utf-8")
+
+    response = client.get("/api/task_status/t1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["data"]["result"]["markdown"] == "# 新笔记"
+
+
+def test_running_task_etag_follows_progress(client, statuses):
+    statuses["t2"] = {"status": "TRANSCRIBING", "progress": 40}
+    etag = client.get("/api/task_status/t2").headers["ETag"]
+    assert client.get("/api/task_status/t2", headers={"If-None-Match": etag}).status_code == 304
+
+    statuses["t2"] = {"status": "TRANSCRIBING", "progress": 55}
+    response = client.get("/api/task_status/t2", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["data"]["progress"] == 55
+
+
+def test_fields_projection_and_segment_paging(client, result_file):
+    data = client.get("/api/task_status/t1", params={"fields": "progress,markdown"}).json()["data"]
+    assert data == {"task_id": "t1", "status": "SUCCESS", "progress": 100, "result": {"markdown": "# 笔记"}}
+
+    data = client.get(
+        "/api/task_status/t1", params={"fields": "transcript", "segment_offset": 1, "segment_limit": 1}
+    ).json()["data"]
+    transcript = data["result"]["transcript"]
+    assert [seg["text"] for seg in transcript["segments"]] == ["二"]
+    assert transcript["segments_total"] == 3
+    assert transcript["segment_offset"] == 1
+
+
+def test_projections_have_distinct_etags(client, result_file):
+    full = client.get("/api/task_status/t1").headers["ETag"]
+    status_only = client.get("/api/task_status/t1", params={"fields": "status"})
+
+    assert status_only.headers["ETag"] != full
+    assert client.get(
+        "/api/task_status/t1", params={"fields": "status"}, headers={"If-None-Match": full}
+    ).status_code == 200
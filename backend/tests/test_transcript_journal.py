@@ -0,0 +1,122 @@
+"""
+TranscriptJournal (resume after a crash / cancel) and WhisperTranscriber continuing from it.
+"""
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import app.transcriber.whisper as whisper_module
+from app.models.transcriber_model import TranscriptSegment
+from app.services.pcm_cache import PCM_SAMPLE_RATE
+from app.services.transcript_journal import TranscriptJournal
+from app.transcriber.whisper import WhisperTranscriber
+
+FINGERPRINT = {"audio": "sha-1", "transcriber": {"type": "fast-whisper", "model": "base"}}
+DURATION = 10.0
+
+
+@pytest.fixture
+def journal_path(tmp_path):
+    return tmp_path / "task_transcript.journal.jsonl"
+
+
+def _journal_with(path, *segments, language="zh") -> TranscriptJournal:
+    journal = TranscriptJournal(path, FINGERPRINT)
+    journal.set_language(language)
+    for start, end, text in segments:
+        journal.append(TranscriptSegment(start=start, end=end, text=text))
+    journal.close()
+    return journal
+
+
+def test_reopened_journal_resumes_after_last_segment(journal_path):
+    _journal_with(journal_path, (0.0, 2.0, "一"), (2.0, 4.0, "二"))
+
+    journal = TranscriptJournal(journal_path, FINGERPRINT)
+
+    assert [seg.text for seg in journal.segments] == ["一", "二"]
+    assert journal.language == "zh"
+    assert journal.resume_from == 4.0
+
+
+def test_torn_last_line_is_truncated_before_appending(journal_path):
+    _journal_with(journal_path, (0.0, 2.0, "一"))
+    with journal_path.open("ab") as fh:
+        fh.write(b'{"start": 2.0, "end": 4.0, "te')
+
+    journal = TranscriptJournal(journal_path, FINGERPRINT)
+    assert journal.resume_from == 2.0
+    journal.append(TranscriptSegment(start=2.0, end=3.5, text="二"))
+    journal.close()
+
+    reopened = TranscriptJournal(journal_path, FINGERPRINT)
+    assert [(seg.end, seg.text) for seg in reopened.segments] == [(2.0, "一"), (3.5, "二")]
+
+
+def test_fingerprint_mismatch_starts_over(journal_path):
+    _journal_with(journal_path, (0.0, 2.0, "一"))
+
+    journal = TranscriptJournal(journal_path, {**FINGERPRINT, "audio": "sha-2"})
+
+    assert journal.segments == []
+    assert journal.resume_from == 0.0
+    assert not journal_path.exists()
+
+
+@pytest.fixture
+def pcm_file(tmp_path, monkeypatch):
+    path = tmp_path / "audio.f32"
+    np.zeros(int(DURATION * PCM_SAMPLE_RATE), dtype=np.float32).tofile(path)
+
+    @contextmanager
+    def _lease(audio_file):
+        yield str(path)
+
+    monkeypatch.setattr(whisper_module, "pcm_lease", _lease)
+    return path
+
+
+class FakeModel(WhisperTranscriber):
+    """
+    WhisperTranscriber without a model: records the audio it is asked to decode and answers with
+    one segment per second of it (timestamps relative to that audio, like faster-whisper).
+    """
+
+    def __init__(self):
+        self.device = "cpu"
+        self.calls = []
+
+    def _transcribe_raw(self, file_path, audio=None):
+        self.calls.append(len(audio))
+        seconds = int(len(audio) / PCM_SAMPLE_RATE)
+        segments = (SimpleNamespace(start=float(i), end=float(i + 1), text=f" s{i}") for i in range(seconds))
+        return segments, SimpleNamespace(language="en")
+
+
+def test_whisper_resume_transcribes_only_the_rest(journal_path, pcm_file):
+    _journal_with(journal_path, (0.0, 2.0, "一"), (2.0, 4.0, "二"))
+    journal = TranscriptJournal(journal_path, FINGERPRINT)
+    transcriber = FakeModel()
+
+    result = transcriber.transcript("audio.m4a", total_duration=DURATION, journal=journal)
+    journal.close()
+
+    assert transcriber.calls == [int((DURATION - 4.0) * PCM_SAMPLE_RATE)]
+    assert [(seg.start, seg.end) for seg in result.segments][:3] == [(0.0, 2.0), (2.0, 4.0), (4.0, 5.0)]
+    assert result.segments[-1].end == DURATION
+    assert result.language == "zh"  # the journal's language wins
+    reopened = TranscriptJournal(journal_path, FINGERPRINT)
+    assert reopened.segments == result.segments
+
+
+def test_whisper_resume_with_complete_journal_skips_the_model(journal_path, pcm_file):
+    _journal_with(journal_path, (0.0, 5.0, "一"), (5.0, 9.8, "二"))
+    journal = TranscriptJournal(journal_path, FINGERPRINT)
+    transcriber = FakeModel()
+
+    result = transcriber.transcript("audio.m4a", total_duration=DURATION, journal=journal)
+
+    assert transcriber.calls == []
+    assert result.full_text == "一 二"